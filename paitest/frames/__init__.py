@@ -1,4 +1,10 @@
+from .container import ContainerReader as ContainerReader
+from .container import ContainerWriter as ContainerWriter
 from .coord import Coord as Coord
+from .coord import CoordArray as CoordArray
+from .core_demux import CoreDemux as CoreDemux
+from .core_mask import CoreMask as CoreMask
+from .expected import CompactTestOut as CompactTestOut
 from .frame import Addr2Coord as Addr2Coord
 from .frame import Coord2Addr as Coord2Addr
 from .frame import Direction as Direction
@@ -6,3 +12,7 @@ from .frame import FrameDecoder as FrameDecoder
 from .frame import FrameGen as FrameGen
 from .frame import FrameMask as FrameMask
 from .frame import FrameSubType as FrameSubType
+from .frame_io import FrameWriter as FrameWriter
+from .verifier import StreamVerifier as StreamVerifier
+from .verifier import VerifyReport as VerifyReport
+from .verifier import verify as verify
@@ -0,0 +1,555 @@
+"""Indexed & compressed container of frames.
+
+Layout of a container file:
+
+- magic, 8 bytes.
+- blocks of frames, each one compressed independently. A block holds up to \
+    'block_frames' consecutive frames of the stream.
+- footer, JSON in UTF-8: the metadata, the offset, size & number of frames of every \
+    block, and the index of the blocks holding each (sub-type, core address).
+    A block also records the data frames at its head, of a package started in the \
+    previous blocks, and the key of the package.
+- size of the footer, 8 bytes in little-endian.
+- magic, 8 bytes.
+
+A query of some cores or sub-types only reads & decompresses the blocks in the index.
+
+The index is built from the headers & core addresses of the frames. The data frames of \
+    the data packages of type III/IV have no header, and are indexed & queried by the \
+    sub-type & core address of the startup frame of their package.
+"""
+
+import json
+import lzma
+import zlib
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .coord import Coord
+from .frame import (
+    FrameArray,
+    _PackageDataOwners,
+    _PackageHeaders,
+    as_frames,
+    concat_frames,
+)
+from .frame_io import frames_to_bytes
+from .frame_params import FrameMask as FM
+from .frame_params import FrameSubType as FST
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+CONTAINER_MAGIC = b"PAIFRMC1"
+CONTAINER_VERSION = 2
+
+# Default number of frames in a block, 512KiB before compression.
+DEFAULT_BLOCK_FRAMES = 1 << 16
+
+_COMPRESSORS = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+    "none": (bytes, bytes),
+}
+
+_TRAILER_SIZE = 8 + len(CONTAINER_MAGIC)
+
+_CoreType = Union[Coord, Tuple[int, int], int]
+_SubTypeType = Union[FST, int]
+
+
+def _ensure_compression(compression: str) -> None:
+    if compression not in _COMPRESSORS:
+        raise ValueError(
+            f"Compression {compression} is not supported, "
+            f"use one of {list(_COMPRESSORS)}"
+        )
+
+
+def _core_addr(core: _CoreType) -> int:
+    if isinstance(core, Coord):
+        return core.address
+
+    if isinstance(core, tuple):
+        return Coord(core).address
+
+    return core
+
+
+def _coord_list(coord: Optional[Union[Coord, Tuple[int, int]]]) -> Optional[List[int]]:
+    if coord is None:
+        return None
+
+    _coord = coord if isinstance(coord, Coord) else Coord(coord)
+
+    return [_coord.x, _coord.y]
+
+
+def _sub_type_value(sub_type: _SubTypeType) -> int:
+    return sub_type.value if isinstance(sub_type, FST) else sub_type
+
+
+def _index_key(sub_type: int, core_addr: int) -> str:
+    return f"{sub_type}:{core_addr}"
+
+
+def _keys(frames: FrameArray) -> Any:
+    """(sub-type << 10) | core address of every frame."""
+    header_offset = FM.GENERAL_HEADER_OFFSET
+    core_offset, core_mask = FM.GENERAL_CORE_ADDR_OFFSET, FM.GENERAL_CORE_ADDR_MASK
+
+    if np is not None:
+        return ((frames >> np.uint64(header_offset)) << np.uint64(10)) | (
+            (frames >> np.uint64(core_offset)) & np.uint64(core_mask)
+        )
+
+    return [
+        ((frame >> header_offset) << 10) | ((frame >> core_offset) & core_mask)
+        for frame in frames
+    ]
+
+
+def _owner_keys(
+    frames: FrameArray, package_headers: Set[int], n_lead: int = 0, lead_key: int = -1
+) -> Tuple[Any, int, int]:
+    """Keys of the frames, see `_keys`. The data frames of a package take the key of \
+        the startup frame.
+
+    Arguments:
+        - package_headers: the headers of the startup frames, see `_PackageHeaders`.
+        - n_lead: the number of the data frames at the head, of a package started in \
+            the previous blocks.
+        - lead_key: the key of the package of the data frames at the head.
+
+    Returns:
+        - the keys.
+        - the number of the data frames of the last package in the next blocks, & \
+            its key.
+    """
+    n_head = min(n_lead, len(frames))
+    keys = _keys(frames)
+    rest = frames[n_head:]
+
+    if np is not None:
+        rest_keys = keys[n_head:]
+        headers = (rest_keys >> np.uint64(10)).astype(np.uint8)
+        owners = _PackageDataOwners(rest, headers, package_headers, partial=True)
+
+        is_data = owners >= 0
+        # Index of the startup frame of every data frame.
+        starts = np.maximum.accumulate(
+            np.where(is_data, 0, np.arange(len(rest), dtype=np.intp))
+        )
+        rest_keys[is_data] = rest_keys[starts[is_data]]
+        if n_head:
+            keys[:n_head] = lead_key
+        last = int(starts[-1]) if len(rest) else -1
+    else:
+        rest_keys = keys[n_head:]
+        headers = [key >> 10 for key in rest_keys]
+        owners = _PackageDataOwners(rest, headers, package_headers, partial=True)
+
+        last = -1
+        for i, owner in enumerate(owners):
+            if owner < 0:
+                last = i
+            else:
+                rest_keys[i] = rest_keys[last]
+
+        keys = [lead_key] * n_head + rest_keys
+
+    if len(rest) == 0:
+        return (keys, n_lead - n_head, lead_key) if n_lead > n_head else (keys, 0, -1)
+
+    if int(headers[last]) in package_headers:
+        end = last + 1 + (int(rest[last]) & FM.GENERAL_PACKAGE_COUNT_MASK)
+        if end > len(rest):
+            return keys, end - len(rest), int(rest_keys[last])
+
+    return keys, 0, -1
+
+
+def _unique_keys(keys: Any) -> List[int]:
+    if np is not None:
+        return np.unique(keys).tolist()
+
+    return sorted(set(keys))
+
+
+class ContainerWriter:
+    """Write frames into a container, block by block.
+
+    Example:
+    >>> with ContainerWriter("suite.pfc", seed=42, chip_coord=(0, 0)) as writer:
+    ...     writer.write(config_frames)
+    ...     writer.write(testout_frames)
+    """
+
+    def __init__(
+        self,
+        save_path: Union[str, Path],
+        *,
+        compression: str = "zlib",
+        level: Optional[int] = None,
+        block_frames: int = DEFAULT_BLOCK_FRAMES,
+        byteorder: str = "big",
+        seed: Optional[int] = None,
+        chip_coord: Optional[Union[Coord, Tuple[int, int]]] = None,
+        test_chip_coord: Optional[Union[Coord, Tuple[int, int]]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        testin: bool = False,
+    ) -> None:
+        """
+        Arguments:
+            - save_path: the path of the container.
+            - compression: 'zlib', 'lzma' or 'none'.
+            - level: the compression level. Default is the one of the compressor.
+            - block_frames: the max number of frames in a block.
+            - byteorder: the byte order of the frames in the blocks.
+            - seed, chip_coord, test_chip_coord: the suite, recorded in the footer.
+            - metadata: other JSON-serializable metadata recorded in the footer.
+            - testin: whether the test frames are test-in frames instead of test-out \
+                frames, see `FrameDecoder.decode_stream`. The test-in type III/IV \
+                frames are startup frames without data.
+        """
+        _ensure_compression(compression)
+        assert byteorder in ["little", "big"]
+
+        if block_frames < 1:
+            raise ValueError("block_frames must be positive")
+
+        self._compress = _COMPRESSORS[compression][0]
+        self._level = level
+        self._block_frames = block_frames
+        self._byteorder = byteorder
+
+        self._meta: Dict[str, Any] = {
+            "version": CONTAINER_VERSION,
+            "compression": compression,
+            "byteorder": byteorder,
+            "block_frames": block_frames,
+            "seed": seed,
+            "chip_coord": _coord_list(chip_coord),
+            "test_chip_coord": _coord_list(test_chip_coord),
+            "metadata": metadata or {},
+            "testin": testin,
+        }
+
+        self._package_headers = _PackageHeaders(testin)
+        # Data frames of the last package in the next blocks, & its key.
+        self._lead: Tuple[int, int] = (0, -1)
+
+        self._blocks: List[Tuple[int, int, int, int, int]] = []
+        self._index: Dict[str, List[int]] = {}
+        self._pending: List[FrameArray] = []
+        self._n_pending = 0
+        self._closed = False
+
+        self._path = Path(save_path)
+        self._f = open(self._path, "wb")
+        self._f.write(CONTAINER_MAGIC)
+
+    def write(self, frames: Union[int, Sequence[int], FrameArray]) -> None:
+        """Append frames. Full blocks are compressed & written at once."""
+        if self._closed:
+            raise ValueError("Write to a closed container")
+
+        _frames = as_frames([frames] if isinstance(frames, int) else frames)
+        start = 0
+
+        while start < len(_frames):
+            n = min(self._block_frames - self._n_pending, len(_frames) - start)
+            self._pending.append(_frames[start : start + n])
+            self._n_pending += n
+            start += n
+
+            if self._n_pending == self._block_frames:
+                self._write_block()
+
+    def _write_block(self) -> None:
+        if self._n_pending == 0:
+            return
+
+        frames = concat_frames(self._pending)
+        self._pending, self._n_pending = [], 0
+
+        n_lead, lead_key = self._lead
+        keys, n_next, next_key = _owner_keys(
+            frames, self._package_headers, n_lead, lead_key
+        )
+        self._lead = (n_next, next_key)
+
+        data = frames_to_bytes(frames, self._byteorder)
+        if self._level is None or self._compress is bytes:
+            compressed = self._compress(data)
+        elif self._compress is lzma.compress:
+            compressed = lzma.compress(data, preset=self._level)
+        else:
+            compressed = self._compress(data, self._level)
+
+        n_head = min(n_lead, len(frames))
+        block_id = len(self._blocks)
+        self._blocks.append(
+            (
+                self._f.tell(),
+                len(compressed),
+                len(frames),
+                n_head,
+                lead_key if n_head else -1,
+            )
+        )
+        self._f.write(compressed)
+
+        for key in _unique_keys(keys):
+            index_key = _index_key(key >> 10, key & FM.GENERAL_CORE_ADDR_MASK)
+            self._index.setdefault(index_key, []).append(block_id)
+
+    def close(self) -> None:
+        """Write the last block & the footer."""
+        if self._closed:
+            return
+
+        try:
+            self._write_block()
+
+            footer = dict(self._meta, blocks=self._blocks, index=self._index)
+            data = json.dumps(footer, separators=(",", ":")).encode("utf-8")
+
+            self._f.write(data)
+            self._f.write(len(data).to_bytes(8, "little"))
+            self._f.write(CONTAINER_MAGIC)
+        finally:
+            self._closed = True
+            self._f.close()
+
+    def abort(self) -> None:
+        """Close & remove the container without writing the footer, e.g. on error."""
+        if self._closed:
+            return
+
+        self._closed = True
+        self._f.close()
+        self._path.unlink()
+
+    def __enter__(self) -> "ContainerWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # A stream cut by an error must not look like a complete container.
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class ContainerReader:
+    """Read frames from a container, only the blocks needed by a query.
+
+    Example:
+    >>> with ContainerReader("suite.pfc") as reader:
+    ...     frames = reader.query(core=(9, 9), sub_type=FrameSubType.TEST_TYPE2)
+    """
+
+    def __init__(self, load_path: Union[str, Path]) -> None:
+        self._f = open(load_path, "rb")
+
+        try:
+            self._footer = self._read_footer(Path(load_path))
+        except BaseException:
+            self._f.close()
+            raise
+
+        self._decompress = _COMPRESSORS[self._footer["compression"]][1]
+        self._blocks: List[List[int]] = self._footer["blocks"]
+        self._index: Dict[str, List[int]] = self._footer["index"]
+        self._package_headers = _PackageHeaders(self._footer.get("testin", False))
+
+    def _read_footer(self, path: Path) -> Dict[str, Any]:
+        if self._f.read(len(CONTAINER_MAGIC)) != CONTAINER_MAGIC:
+            raise ValueError(f"{path} is not a frames container")
+
+        size = self._f.seek(0, 2)
+        if size < len(CONTAINER_MAGIC) + _TRAILER_SIZE:
+            raise ValueError(f"{path} is truncated")
+
+        self._f.seek(size - _TRAILER_SIZE)
+        trailer = self._f.read(_TRAILER_SIZE)
+        if trailer[8:] != CONTAINER_MAGIC:
+            raise ValueError(f"{path} is truncated or not closed")
+
+        footer_size = int.from_bytes(trailer[:8], "little")
+        self._f.seek(size - _TRAILER_SIZE - footer_size)
+        footer = json.loads(self._f.read(footer_size).decode("utf-8"))
+
+        if footer["version"] > CONTAINER_VERSION:
+            raise ValueError(f"Container version {footer['version']} is not supported")
+
+        return footer
+
+    @property
+    def byteorder(self) -> str:
+        return self._footer["byteorder"]
+
+    @property
+    def seed(self) -> Optional[int]:
+        return self._footer["seed"]
+
+    @property
+    def chip_coord(self) -> Optional[Coord]:
+        coord = self._footer["chip_coord"]
+        return None if coord is None else Coord(*coord)
+
+    @property
+    def test_chip_coord(self) -> Optional[Coord]:
+        coord = self._footer["test_chip_coord"]
+        return None if coord is None else Coord(*coord)
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self._footer["metadata"]
+
+    @property
+    def n_blocks(self) -> int:
+        return len(self._blocks)
+
+    def __len__(self) -> int:
+        """Number of frames."""
+        return sum(block[2] for block in self._blocks)
+
+    def keys(self) -> List[Tuple[FST, Coord]]:
+        """(sub-type, core coordinate) of the frames in the container."""
+        keys = []
+        for index_key in self._index:
+            sub_type, core_addr = (int(v) for v in index_key.split(":"))
+            if sub_type <= FST.WORK_TYPE4.value:
+                keys.append((FST(sub_type), Coord.from_address(core_addr)))
+
+        return keys
+
+    def read_block(self, block_id: int) -> FrameArray:
+        offset, size = self._blocks[block_id][:2]
+
+        self._f.seek(offset)
+        data = self._decompress(self._f.read(size))
+
+        return as_frames(data, self.byteorder)
+
+    def _block_keys(self, block_id: int, frames: FrameArray) -> Any:
+        """Keys of the frames of the block, see `_owner_keys`."""
+        block = self._blocks[block_id]
+        # Version 1 doesn't record the data frames at the head.
+        n_lead, lead_key = block[3:5] if len(block) > 3 else (0, -1)
+
+        return _owner_keys(frames, self._package_headers, n_lead, lead_key)[0]
+
+    def __iter__(self) -> Iterator[FrameArray]:
+        """Iterate over the blocks."""
+        for block_id in range(len(self._blocks)):
+            yield self.read_block(block_id)
+
+    def read_all(self) -> FrameArray:
+        return concat_frames(list(self))
+
+    def _query_blocks(
+        self, core_addrs: Optional[Set[int]], sub_types: Optional[Set[int]]
+    ) -> List[int]:
+        block_ids: Set[int] = set()
+
+        for index_key, _block_ids in self._index.items():
+            sub_type, core_addr = (int(v) for v in index_key.split(":"))
+
+            if (core_addrs is None or core_addr in core_addrs) and (
+                sub_types is None or sub_type in sub_types
+            ):
+                block_ids.update(_block_ids)
+
+        return sorted(block_ids)
+
+    def query(
+        self,
+        core: Optional[Union[_CoreType, Iterable[_CoreType]]] = None,
+        sub_type: Optional[Union[_SubTypeType, Iterable[_SubTypeType]]] = None,
+    ) -> FrameArray:
+        """Frames of some cores and/or sub-types in order. Only read the blocks \
+            in the index.
+
+        Arguments:
+            - core: a core or cores, as `Coord`, (x, y) or address. All if not specified.
+            - sub_type: a sub-type or sub-types. All if not specified.
+        """
+        if core is None:
+            core_addrs = None
+        elif isinstance(core, (Coord, int)) or (
+            isinstance(core, tuple) and all(isinstance(v, int) for v in core)
+        ):
+            core_addrs = {_core_addr(core)}  # type: ignore
+        else:
+            core_addrs = {_core_addr(c) for c in core}  # type: ignore
+
+        if sub_type is None:
+            sub_types = None
+        elif isinstance(sub_type, (FST, int)):
+            sub_types = {_sub_type_value(sub_type)}
+        else:
+            sub_types = {_sub_type_value(t) for t in sub_type}
+
+        selected = []
+        for block_id in self._query_blocks(core_addrs, sub_types):
+            frames = self.read_block(block_id)
+            keys = self._block_keys(block_id, frames)
+            selected.append(self._select(frames, keys, core_addrs, sub_types))
+
+        return concat_frames(selected)
+
+    @staticmethod
+    def _select(
+        frames: FrameArray,
+        keys: Any,
+        core_addrs: Optional[Set[int]],
+        sub_types: Optional[Set[int]],
+    ) -> FrameArray:
+        if np is not None:
+            selected = np.ones(len(frames), dtype=np.bool_)
+            if core_addrs is not None:
+                core_lut = np.zeros(FM.GENERAL_CORE_ADDR_MASK + 1, dtype=np.bool_)
+                core_lut[list(core_addrs)] = True
+                selected &= core_lut[keys & np.uint64(FM.GENERAL_CORE_ADDR_MASK)]
+
+            if sub_types is not None:
+                sub_type_lut = np.zeros(FM.GENERAL_HEADER_MASK + 1, dtype=np.bool_)
+                sub_type_lut[list(sub_types)] = True
+                selected &= sub_type_lut[keys >> np.uint64(10)]
+
+            return frames[selected]
+
+        return as_frames(
+            [
+                frame
+                for frame, key in zip(frames, keys)
+                if (core_addrs is None or key & FM.GENERAL_CORE_ADDR_MASK in core_addrs)
+                and (sub_types is None or key >> 10 in sub_types)
+            ]
+        )
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> "ContainerReader":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
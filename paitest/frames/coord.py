@@ -1,35 +1,80 @@
-from typing import Optional, Tuple, Union, overload
+from array import array
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class Coord:
     """Coordinates of the cores. Set coordinates (x, y) for every cores.
 
     Left to right, +X, up to down, +Y.
+
+    Coordinates are immutable & interned: the 1024 instances are created once, \
+        and `Coord(x, y)` returns the one at address (x << 5) | y.
     """
 
+    __slots__ = ("x", "y", "address")
+
     _COORD_MAX_LIMIT = (1 << 5) - 1
     _COORD_LOW_LIMIT = 0
 
-    def __init__(
-        self, _x: Union[Tuple[int, int], int], _y: Optional[int] = None
-    ) -> None:
-        if isinstance(_x, Tuple):
-            x, y = _x[0], _x[1]
-            if isinstance(_y, int):
-                raise ValueError(f"Wrong Argument: {_y}")
-        elif isinstance(_x, int):
+    x: int
+    y: int
+    address: int
+
+    def __new__(
+        cls, _x: Union[Tuple[int, int], int], _y: Optional[int] = None
+    ) -> "Coord":
+        if isinstance(_x, int):
             if isinstance(_y, int):
                 x, y = _x, _y
             else:
                 raise ValueError("Missing Argument: y")
+        elif isinstance(_x, Tuple):
+            x, y = _x[0], _x[1]
+            if isinstance(_y, int):
+                raise ValueError(f"Wrong Argument: {_y}")
         else:
             raise ValueError("Wrong Argument")
 
-        if not (self._COORD_LOW_LIMIT <= x <= self._COORD_MAX_LIMIT and self._COORD_LOW_LIMIT <= y <= self._COORD_MAX_LIMIT):
-            raise ValueError(f"{self._COORD_LOW_LIMIT} <= x <= {self._COORD_MAX_LIMIT}, {self._COORD_LOW_LIMIT} <= y <= {self._COORD_MAX_LIMIT}: ({x}, {y})")
+        if not (cls._COORD_LOW_LIMIT <= x <= cls._COORD_MAX_LIMIT and cls._COORD_LOW_LIMIT <= y <= cls._COORD_MAX_LIMIT):
+            raise ValueError(f"{cls._COORD_LOW_LIMIT} <= x <= {cls._COORD_MAX_LIMIT}, {cls._COORD_LOW_LIMIT} <= y <= {cls._COORD_MAX_LIMIT}: ({x}, {y})")
+
+        return _COORD_POOL[(x << 5) | y]
+
+    @classmethod
+    def _new_interned(cls, address: int) -> "Coord":
+        """Create the interned instance of the address. Only used to build the pool."""
+        coord = object.__new__(cls)
+        object.__setattr__(coord, "x", address >> 5)
+        object.__setattr__(coord, "y", address & cls._COORD_MAX_LIMIT)
+        object.__setattr__(coord, "address", address)
+
+        return coord
+
+    @classmethod
+    def from_address(cls, address: int) -> "Coord":
+        """Get the coordinate of the address, 10 bits."""
+        if not 0 <= address < len(_COORD_POOL):
+            raise ValueError(f"0 <= address < {len(_COORD_POOL)}: {address}")
+
+        return _COORD_POOL[address]
+
+    def __setattr__(self, __name: str, __value) -> None:
+        raise AttributeError("Coord is immutable")
+
+    def __delattr__(self, __name: str) -> None:
+        raise AttributeError("Coord is immutable")
+
+    def __reduce__(self):
+        # Unpickle into the interned instance
+        return (self.__class__, (self.x, self.y))
 
-        self.x: int = x
-        self.y: int = y
+    def __hash__(self) -> int:
+        return self.address
 
     @classmethod
     def from_tuple(cls, pos) -> "Coord":
@@ -82,18 +127,18 @@ class Coord:
 
     """Operations below are used only when comparing with a Cooord."""
 
-    def __eq__(self, __other: "Coord") -> bool:
+    def __eq__(self, __other: object) -> bool:
         """
         Example:
         >>> Coord(4, 5) == Coord(4, 6)
         False
         """
         if not isinstance(__other, Coord):
-            raise TypeError(f"Unsupported type: {type(__other)}")
+            return NotImplemented
 
-        return self.x == __other.x and self.y == __other.y
+        return self.address == __other.address
 
-    def __ne__(self, __other: "Coord") -> bool:
+    def __ne__(self, __other: object) -> bool:
         """
         Examples:
         >>> Coord(4, 5) != Coord(4, 6)
@@ -103,9 +148,9 @@ class Coord:
         True
         """
         if not isinstance(__other, Coord):
-            raise TypeError(f"Unsupported type: {type(__other)}")
+            return NotImplemented
 
-        return self.x != __other.x or self.y != __other.y
+        return self.address != __other.address
 
     def __lt__(self, __other: "Coord") -> bool:
         """Whether the coord is on the left OR below of __other.
@@ -166,25 +211,47 @@ class Coord:
 
     def _to_address(self) -> int:
         """Convert to address, 10 bits"""
-        return (self.x << 5) | self.y
+        return self.address
 
-    @property
-    def address(self) -> int:
-        return self._to_address()
+
+# The interned coordinates, indexed by address
+_COORD_POOL: Tuple[Coord, ...] = tuple(
+    Coord._new_interned(addr) for addr in range(1 << 10)
+)
 
 
 class CoordOffset:
-    """Offset of coordinates"""
+    """Offset of coordinates. Immutable."""
+
+    __slots__ = ("delta_x", "delta_y")
 
     _COORDOFFSET_MAX_LIMIT = (1 << 5) - 1
     _COORDOFFSET_LOW_LIMIT = -(1 << 5)
 
+    delta_x: int
+    delta_y: int
+
     def __init__(self, _delta_x: int, _delta_y: int) -> None:
         if not (self._COORDOFFSET_LOW_LIMIT < _delta_x <= self._COORDOFFSET_MAX_LIMIT and self._COORDOFFSET_LOW_LIMIT < _delta_y <= self._COORDOFFSET_MAX_LIMIT):
             raise ValueError(f"{self._COORDOFFSET_LOW_LIMIT} < delta_x <= {self._COORDOFFSET_MAX_LIMIT}, {self._COORDOFFSET_LOW_LIMIT} < delta_y <= {self._COORDOFFSET_MAX_LIMIT}: ({_delta_x}, {_delta_y})")
 
-        self.delta_x: int = _delta_x
-        self.delta_y: int = _delta_y
+        object.__setattr__(self, "delta_x", _delta_x)
+        object.__setattr__(self, "delta_y", _delta_y)
+
+    def __setattr__(self, __name: str, __value) -> None:
+        raise AttributeError("CoordOffset is immutable")
+
+    def __delattr__(self, __name: str) -> None:
+        raise AttributeError("CoordOffset is immutable")
+
+    def __reduce__(self):
+        return (self.__class__, (self.delta_x, self.delta_y))
+
+    def __hash__(self) -> int:
+        return hash((self.delta_x, self.delta_y))
+
+    def __repr__(self) -> str:
+        return f"CoordOffset({self.delta_x}, {self.delta_y})"
 
     @overload
     def __add__(self, __other: Coord) -> Coord:
@@ -225,14 +292,15 @@ class CoordOffset:
         >>> delta_c = CoordOffset(1, 1)
         >>> delta_c += CoordOffset(1, 1)
         delta_c: CoordOffset(2, 2)
+
+        NOTE: Immutable, `delta_c` is bound to a new offset.
         """
         if not isinstance(__other, CoordOffset):
             raise TypeError(f"Unsupported type: {type(__other)}")
 
-        self.delta_x += __other.delta_x
-        self.delta_y += __other.delta_y
-
-        return self
+        return CoordOffset(
+            self.delta_x + __other.delta_x, self.delta_y + __other.delta_y
+        )
 
     def __sub__(self, __other: "CoordOffset") -> "CoordOffset":
         """
@@ -259,29 +327,243 @@ class CoordOffset:
         if not isinstance(__other, CoordOffset):
             raise TypeError(f"Unsupported type: {type(__other)}")
 
-        self.delta_x -= __other.delta_x
-        self.delta_y -= __other.delta_y
-
-        return self
+        return CoordOffset(
+            self.delta_x - __other.delta_x, self.delta_y - __other.delta_y
+        )
 
-    def __eq__(self, __other: "CoordOffset") -> bool:
+    def __eq__(self, __other: object) -> bool:
         """
         Example:
         >>> CoordOffset(4, 5) == CoordOffset(4, 6)
         False
         """
         if not isinstance(__other, CoordOffset):
-            raise TypeError(f"Unsupported type: {type(__other)}")
+            return NotImplemented
 
         return self.delta_x == __other.delta_x and self.delta_y == __other.delta_y
 
-    def __ne__(self, __other: "CoordOffset") -> bool:
+    def __ne__(self, __other: object) -> bool:
         """
         Example:
         >>> CoordOffset(4, 5) != CoordOffset(4, 6)
         True
         """
         if not isinstance(__other, CoordOffset):
-            raise TypeError(f"Unsupported type: {type(__other)}")
+            return NotImplemented
 
         return self.delta_x != __other.delta_x or self.delta_y != __other.delta_y
+
+
+# Array of a field, `numpy.ndarray` if NumPy is installed, otherwise `array.array`.
+_ArrayType = Union[array, "np.ndarray"]
+
+
+class CoordArray:
+    """Coordinates of a batch of cores, stored as 2 compact integer arrays of x & y.
+
+    Operations are vectorized over the batch, with NumPy if installed.
+
+    Examples:
+    >>> coords = CoordArray.from_addresses([0, 33, 100])
+    >>> coords + CoordOffset(1, 1)
+    CoordArray([(1, 1), (2, 2), (4, 5)])
+
+    >>> coords < Coord(0b11100, 0b11100)
+    [True, True, True]
+    """
+
+    __slots__ = ("xs", "ys")
+
+    def __init__(self, xs: Iterable[int], ys: Iterable[int]) -> None:
+        if np is not None:
+            _xs = np.asarray(list(xs) if isinstance(xs, Iterator) else xs, dtype=np.int64)
+            _ys = np.asarray(list(ys) if isinstance(ys, Iterator) else ys, dtype=np.int64)
+        else:
+            _xs, _ys = list(xs), list(ys)  # type: ignore
+
+        if len(_xs) != len(_ys):
+            raise ValueError(f"Length of x & y mismatch: {len(_xs)} != {len(_ys)}")
+
+        lo, hi = Coord._COORD_LOW_LIMIT, Coord._COORD_MAX_LIMIT
+        if len(_xs) > 0:
+            _min, _max = (np.min, np.max) if np is not None else (min, max)
+            if not (lo <= _min(_xs) and _max(_xs) <= hi and lo <= _min(_ys) and _max(_ys) <= hi):  # type: ignore
+                raise ValueError(f"{lo} <= x <= {hi}, {lo} <= y <= {hi}")
+
+        if np is not None:
+            self.xs: _ArrayType = _xs.astype(np.uint8)
+            self.ys: _ArrayType = _ys.astype(np.uint8)
+        else:
+            self.xs = array("B", _xs)
+            self.ys = array("B", _ys)
+
+    @classmethod
+    def from_coords(cls, coords: Iterable[Coord]) -> "CoordArray":
+        _coords = list(coords)
+
+        return cls([c.x for c in _coords], [c.y for c in _coords])
+
+    @classmethod
+    def from_addresses(cls, addresses: Iterable[int]) -> "CoordArray":
+        """From the addresses, 10 bits."""
+        if np is not None:
+            _addresses = np.asarray(addresses, dtype=np.int64)
+            if _addresses.size and not (
+                0 <= _addresses.min() and _addresses.max() < len(_COORD_POOL)
+            ):
+                raise ValueError(f"0 <= address < {len(_COORD_POOL)}")
+
+            return cls(_addresses >> 5, _addresses & Coord._COORD_MAX_LIMIT)
+
+        _addresses = list(addresses)
+        if _addresses and not (
+            0 <= min(_addresses) and max(_addresses) < len(_COORD_POOL)
+        ):
+            raise ValueError(f"0 <= address < {len(_COORD_POOL)}")
+
+        return cls(
+            [addr >> 5 for addr in _addresses],
+            [addr & Coord._COORD_MAX_LIMIT for addr in _addresses],
+        )
+
+    @classmethod
+    def full(cls, n: int, coord: Coord) -> "CoordArray":
+        """'n' copies of the coordinate."""
+        coords = cls.__new__(cls)
+
+        if np is not None:
+            coords.xs = np.full(n, coord.x, dtype=np.uint8)
+            coords.ys = np.full(n, coord.y, dtype=np.uint8)
+        else:
+            coords.xs = array("B", [coord.x]) * n
+            coords.ys = array("B", [coord.y]) * n
+
+        return coords
+
+    @property
+    def addresses(self) -> _ArrayType:
+        """Addresses of the coordinates, 10 bits."""
+        if np is not None:
+            return (self.xs.astype(np.uint16) << 5) | self.ys
+
+        return array("H", [(x << 5) | y for x, y in zip(self.xs, self.ys)])
+
+    def to_list(self) -> List[Coord]:
+        return [_COORD_POOL[addr] for addr in self.addresses]
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __iter__(self) -> Iterator[Coord]:
+        return iter(self.to_list())
+
+    @overload
+    def __getitem__(self, __index: int) -> Coord:
+        ...
+
+    @overload
+    def __getitem__(self, __index: slice) -> "CoordArray":
+        ...
+
+    def __getitem__(self, __index: Union[int, slice]) -> Union[Coord, "CoordArray"]:
+        if isinstance(__index, slice):
+            return CoordArray(self.xs[__index], self.ys[__index])
+
+        return _COORD_POOL[(int(self.xs[__index]) << 5) | int(self.ys[__index])]
+
+    def __add__(self, __other: CoordOffset) -> "CoordArray":
+        """CoordArray = CoordArray + CoordOffset"""
+        if not isinstance(__other, CoordOffset):
+            raise TypeError(f"Unsupported type: {type(__other)}")
+
+        return self._shift(__other.delta_x, __other.delta_y)
+
+    @overload
+    def __sub__(self, __other: Coord) -> Tuple[_ArrayType, _ArrayType]:
+        ...
+
+    @overload
+    def __sub__(self, __other: CoordOffset) -> "CoordArray":
+        ...
+
+    def __sub__(
+        self, __other: Union[Coord, CoordOffset]
+    ) -> Union[Tuple[_ArrayType, _ArrayType], "CoordArray"]:
+        """
+        - CoordArray - CoordOffset = CoordArray
+        - CoordArray - Coord = (delta_x array, delta_y array), the offsets of every coordinate.
+        """
+        if isinstance(__other, Coord):
+            if np is not None:
+                return (
+                    self.xs.astype(np.int8) - np.int8(__other.x),
+                    self.ys.astype(np.int8) - np.int8(__other.y),
+                )
+
+            return (
+                array("b", [x - __other.x for x in self.xs]),
+                array("b", [y - __other.y for y in self.ys]),
+            )
+
+        if isinstance(__other, CoordOffset):
+            return self._shift(-__other.delta_x, -__other.delta_y)
+
+        raise TypeError(f"Unsupported type: {type(__other)}")
+
+    def _shift(self, delta_x: int, delta_y: int) -> "CoordArray":
+        if np is not None:
+            return CoordArray(
+                self.xs.astype(np.int16) + delta_x, self.ys.astype(np.int16) + delta_y
+            )
+
+        return CoordArray(
+            [x + delta_x for x in self.xs], [y + delta_y for y in self.ys]
+        )
+
+    """Region tests, same as the ones of `Coord`, for every coordinate."""
+
+    def __lt__(self, __other: Coord) -> _ArrayType:
+        """Whether every coord is on the left OR below of __other."""
+        if not isinstance(__other, Coord):
+            raise TypeError(f"Unsupported type: {type(__other)}")
+
+        if np is not None:
+            return (self.xs < __other.x) | (self.ys < __other.y)
+
+        return [x < __other.x or y < __other.y for x, y in zip(self.xs, self.ys)]  # type: ignore
+
+    def __ge__(self, __other: Coord) -> _ArrayType:
+        """Whether every coord is on the right AND above of __other, or equal."""
+        if not isinstance(__other, Coord):
+            raise TypeError(f"Unsupported type: {type(__other)}")
+
+        if np is not None:
+            return (self.xs >= __other.x) & (self.ys >= __other.y)
+
+        return [x >= __other.x and y >= __other.y for x, y in zip(self.xs, self.ys)]  # type: ignore
+
+    def isin(
+        self, mask: Union["CoordArray", Iterable[Union[Coord, int]]]
+    ) -> _ArrayType:
+        """Whether every coordinate is in the mask.
+
+        Arguments:
+            - mask: coordinates or addresses.
+        """
+        if isinstance(mask, CoordArray):
+            masked = set(mask.addresses.tolist())
+        else:
+            masked = {m.address if isinstance(m, Coord) else m for m in mask}
+
+        if np is not None:
+            lut = np.zeros(len(_COORD_POOL), dtype=np.bool_)
+            lut[list(masked)] = True
+
+            return lut[self.addresses]
+
+        return [addr in masked for addr in self.addresses]  # type: ignore
+
+    def __repr__(self) -> str:
+        return "CoordArray([%s])" % ", ".join(
+            f"({x}, {y})" for x, y in zip(self.xs.tolist(), self.ys.tolist())
+        )
@@ -1,20 +1,24 @@
-from typing import Tuple, Union, Optional, overload
+from typing import Any, Iterable, Iterator, List, Tuple, Union, Optional, overload
 
 class Coord:
     x: int = ...
     y: int = ...
-    def __init__(self, _x: Union[Tuple[int, int], int], _y: Optional[int] = None) -> None: ...
+    address: int = ...
+    def __new__(cls, _x: Union[Tuple[int, int], int], _y: Optional[int] = None) -> Coord: ...
     @classmethod
     def from_tuple(cls, pos) -> Coord: ...
     @classmethod
+    def from_address(cls, address: int) -> Coord: ...
+    @classmethod
     def default(cls) -> Coord: ...
     def __add__(self, __other: CoordOffset) -> Coord: ...
     @overload
     def __sub__(self, __other: Coord) -> CoordOffset: ...
     @overload
     def __sub__(self, __other: CoordOffset) -> Coord: ...
-    def __eq__(self, __other: Coord) -> bool: ...
-    def __ne__(self, __other: Coord) -> bool: ...
+    def __eq__(self, __other: object) -> bool: ...
+    def __ne__(self, __other: object) -> bool: ...
+    def __hash__(self) -> int: ...
     def __lt__(self, __other: Coord) -> bool: ...
     def __gt__(self, __other: Coord) -> bool: ...
     def __le__(self, __other: Coord) -> bool: ...
@@ -22,8 +26,6 @@ class Coord:
     def __str__(self) -> str: ...
     def __repr__(self) -> str: ...
     def to_tuple(self) -> Tuple[int, int]: ...
-    @property
-    def address(self) -> int: ...
 
 class CoordOffset:
     delta_x: int = ...
@@ -36,5 +38,35 @@ class CoordOffset:
     def __iadd__(self, __other: CoordOffset) -> CoordOffset: ...
     def __sub__(self, __other: CoordOffset) -> CoordOffset: ...
     def __isub__(self, __other: CoordOffset) -> CoordOffset: ...
-    def __eq__(self, __other: CoordOffset) -> bool: ...
-    def __ne__(self, __other: CoordOffset) -> bool: ...
+    def __eq__(self, __other: object) -> bool: ...
+    def __ne__(self, __other: object) -> bool: ...
+    def __hash__(self) -> int: ...
+
+class CoordArray:
+    xs: Any = ...
+    ys: Any = ...
+    def __init__(self, xs: Iterable[int], ys: Iterable[int]) -> None: ...
+    @classmethod
+    def from_coords(cls, coords: Iterable[Coord]) -> CoordArray: ...
+    @classmethod
+    def from_addresses(cls, addresses: Iterable[int]) -> CoordArray: ...
+    @classmethod
+    def full(cls, n: int, coord: Coord) -> CoordArray: ...
+    @property
+    def addresses(self) -> Any: ...
+    def to_list(self) -> List[Coord]: ...
+    def __len__(self) -> int: ...
+    def __iter__(self) -> Iterator[Coord]: ...
+    @overload
+    def __getitem__(self, __index: int) -> Coord: ...
+    @overload
+    def __getitem__(self, __index: slice) -> CoordArray: ...
+    def __add__(self, __other: CoordOffset) -> CoordArray: ...
+    @overload
+    def __sub__(self, __other: Coord) -> Tuple[Any, Any]: ...
+    @overload
+    def __sub__(self, __other: CoordOffset) -> CoordArray: ...
+    def __lt__(self, __other: Coord) -> Any: ...
+    def __ge__(self, __other: Coord) -> Any: ...
+    def isin(self, mask: Union[CoordArray, Iterable[Union[Coord, int]]]) -> Any: ...
+    def __repr__(self) -> str: ...
@@ -0,0 +1,107 @@
+"""Demultiplex a stream of frames to the slots expected of every core.
+
+The frames of different cores can arrive in any order, but the frames of a core \
+    arrive in order. So the k-th frame of a core in the stream goes to the k-th slot \
+    of the core, e.g. the frame #k % 3 of the (k // 3)-th group of the core.
+"""
+
+from typing import List, Sequence
+
+from .frame_params import FrameMask as FM
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Number of core addresses, 10 bits.
+N_CORE_ADDRS = FM.GENERAL_CORE_ADDR_MASK + 1
+
+FRAME_BYTES = 8
+
+
+def _RunRanks(sorted_addrs: "np.ndarray") -> "np.ndarray":
+    """Rank of every element in its run of the same core address."""
+    n = len(sorted_addrs)
+    starts = np.flatnonzero(np.diff(sorted_addrs.astype(np.int64), prepend=-1))
+
+    return np.arange(n) - np.repeat(starts, np.diff(np.append(starts, n)))
+
+
+class CoreDemux:
+    """Map the frames of a stream to the slots of their cores, chunk by chunk.
+
+    Every item, e.g. a group, of the core address 'core_addrs[i]' has 'n_slots' \
+        slots, indexed from 'n_slots * i'.
+
+    Examples:
+    >>> demux = CoreDemux(core_addrs, 3)
+    >>> slots = demux.map(frame_core_addrs)  # -1 for the frames beyond the slots
+    """
+
+    def __init__(self, core_addrs: Sequence[int], n_slots: int = 1) -> None:
+        """
+        Arguments:
+            - core_addrs: the core address of every item, in the order of the stream.
+            - n_slots: the number of slots of every item.
+        """
+        self.n_slots = n_slots
+
+        if np is not None:
+            slot_addrs = np.repeat(np.asarray(core_addrs, dtype=np.intp), n_slots)
+            # Slots of every core in order: _slots[_starts[core] : _starts[core + 1]]
+            self._slots = np.argsort(slot_addrs.astype(np.uint16), kind="stable")
+            self._counts = np.bincount(slot_addrs, minlength=N_CORE_ADDRS)
+            self._starts = np.concatenate(([0], np.cumsum(self._counts)))
+            self._received = np.zeros(N_CORE_ADDRS, dtype=np.int64)
+        else:
+            self._core_slots: List[List[int]] = [[] for _ in range(N_CORE_ADDRS)]
+            for i, core_addr in enumerate(core_addrs):
+                self._core_slots[core_addr].extend(
+                    range(n_slots * i, n_slots * (i + 1))
+                )
+
+            self._received_list = [0] * N_CORE_ADDRS
+
+    @property
+    def n_mapped(self) -> int:
+        """Number of the slots taken."""
+        if np is not None:
+            return int(np.minimum(self._received, self._counts).sum())
+
+        return sum(
+            min(n, len(slots))
+            for n, slots in zip(self._received_list, self._core_slots)
+        )
+
+    def map(self, core_addrs: "np.ndarray") -> "np.ndarray":
+        """Slot of every frame of a chunk from its core address, or -1 if all the \
+            slots of the core are taken.
+
+        Arguments:
+            - core_addrs: the core address of every frame, as `intp`.
+        """
+        # Rank of every frame in its core in the whole stream.
+        order = np.argsort(core_addrs.astype(np.uint16), kind="stable")
+        ranks = np.empty(len(core_addrs), dtype=np.int64)
+        ranks[order] = _RunRanks(core_addrs[order])
+        ranks += self._received[core_addrs]
+        self._received += np.bincount(core_addrs, minlength=N_CORE_ADDRS)
+
+        slots = np.full(len(core_addrs), -1, dtype=np.intp)
+        expected = ranks < self._counts[core_addrs]
+        slots[expected] = self._slots[
+            self._starts[core_addrs[expected]] + ranks[expected]
+        ]
+
+        return slots
+
+    def map_one(self, core_addr: int) -> int:
+        """Pure-Python version of `map` for 1 frame."""
+        rank = self._received_list[core_addr]
+        self._received_list[core_addr] = rank + 1
+
+        slots = self._core_slots[core_addr]
+
+        return slots[rank] if rank < len(slots) else -1
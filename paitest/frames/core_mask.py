@@ -0,0 +1,230 @@
+"""Mask of cores to avoid, e.g. the defect map of a chip.
+
+The mask is stored as a 1024-bit bitmap, bit 'i' for the core at address 'i'.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator, Tuple, Union
+
+from .coord import Coord, CoordArray
+
+# Number of cores addresses, 10 bits.
+N_CORE_ADDRS = 1 << 10
+
+_BITMAP_MASK = (1 << N_CORE_ADDRS) - 1
+_BITMAP_BYTES = N_CORE_ADDRS // 8
+
+# Bitmap of the valid cores, 0 <= x < 28 or 0 <= y < 28. 1008 in total.
+VALID_CORES_BITMAP: int = sum(
+    1 << addr
+    for addr in range(N_CORE_ADDRS)
+    if (addr >> 5) < 0b11100 or (addr & ((1 << 5) - 1)) < 0b11100
+)
+
+CoreMaskType = Union[
+    "CoreMask",
+    Coord,
+    Tuple[int, int],
+    CoordArray,
+    Iterable[Union[Coord, Tuple[int, int], int]],
+    int,
+    str,
+    Path,
+]
+
+
+def _PopCount(bitmap: int) -> int:
+    return bin(bitmap).count("1")
+
+
+@lru_cache(maxsize=64)
+def _BitmapAddrs(bitmap: int) -> Tuple[int, ...]:
+    """Addresses of the set bits in ascending order."""
+    return tuple(addr for addr in range(bitmap.bit_length()) if (bitmap >> addr) & 1)
+
+
+class CoreMask:
+    """Cores to avoid when generating the test suites.
+
+    Examples:
+    >>> mask = CoreMask.from_coords([(1, 2), Coord(3, 4), 1000])
+    >>> len(mask), Coord(1, 2) in mask
+    (3, True)
+
+    >>> mask.n_available
+    1005
+    """
+
+    __slots__ = ("bitmap",)
+
+    def __init__(self, bitmap: int = 0) -> None:
+        if not 0 <= bitmap <= _BITMAP_MASK:
+            raise ValueError(f"Bitmap must be a {N_CORE_ADDRS}-bit unsigned integer")
+
+        self.bitmap: int = bitmap
+
+    @classmethod
+    def from_coords(
+        cls, coords: Iterable[Union[Coord, Tuple[int, int], int]]
+    ) -> "CoreMask":
+        """From the coordinates, (x, y) tuples or addresses."""
+        if isinstance(coords, CoordArray):
+            return cls._from_addrs(coords.addresses.tolist())
+
+        addrs = []
+        for c in coords:
+            if isinstance(c, Coord):
+                addrs.append(c.address)
+            elif isinstance(c, tuple):
+                addrs.append(Coord(c).address)
+            else:
+                addrs.append(int(c))
+
+        return cls._from_addrs(addrs)
+
+    @classmethod
+    def _from_addrs(cls, addrs: Iterable[int]) -> "CoreMask":
+        bitmap = 0
+        for addr in addrs:
+            if not 0 <= addr < N_CORE_ADDRS:
+                raise ValueError(f"0 <= address < {N_CORE_ADDRS}")
+
+            bitmap |= 1 << addr
+
+        return cls(bitmap)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "CoreMask":
+        """Load a defect map.
+
+        - '.bin': the 128-byte bitmap in little-endian, bit 'i' for the core at address 'i'.
+        - '.txt': a core per line, "x, y" or "x y" or an address. Text after '#' is ignored.
+        """
+        _path = Path(path)
+        _suffix = _path.suffix
+
+        if _suffix == ".bin":
+            data = _path.read_bytes()
+            if len(data) != _BITMAP_BYTES:
+                raise ValueError(
+                    f"Bitmap file must be {_BITMAP_BYTES} bytes, but got {len(data)}"
+                )
+
+            return cls(int.from_bytes(data, "little"))
+
+        if _suffix != ".txt":
+            raise NotImplementedError(f"File with suffix {_suffix} is not supported!")
+
+        addrs = []
+        with open(_path, "r") as f:
+            for lineno, line in enumerate(f, 1):
+                fields = line.split("#", 1)[0]
+                for sep in ",()":
+                    fields = fields.replace(sep, " ")
+
+                if not fields.strip():
+                    continue
+
+                try:
+                    values = [int(v, 0) for v in fields.split()]
+                except ValueError:
+                    raise ValueError(f"{_path}:{lineno}: illegal core '{line.strip()}'")
+
+                if len(values) == 1:
+                    addrs.append(values[0])
+                elif len(values) == 2:
+                    addrs.append(Coord(values[0], values[1]).address)
+                else:
+                    raise ValueError(f"{_path}:{lineno}: illegal core '{line.strip()}'")
+
+        return cls._from_addrs(addrs)
+
+    @classmethod
+    def of(cls, mask: CoreMaskType) -> "CoreMask":
+        """Normalize any form of mask.
+
+        - `CoreMask`.
+        - a single core, `Coord` or (x, y).
+        - an iterable of `Coord`, (x, y) or addresses, or a `CoordArray`.
+        - a 1024-bit bitmap as an int.
+        - the path of a defect map file, see `from_file`.
+        """
+        if isinstance(mask, CoreMask):
+            return mask
+
+        if isinstance(mask, Coord):
+            return cls(1 << mask.address)
+
+        if (
+            isinstance(mask, tuple)
+            and len(mask) == 2
+            and all(isinstance(v, int) for v in mask)
+        ):
+            return cls(1 << Coord(mask).address)
+
+        if isinstance(mask, int):
+            return cls(mask)
+
+        if isinstance(mask, (str, Path)):
+            return cls.from_file(mask)
+
+        return cls.from_coords(mask)
+
+    def to_file(self, path: Union[str, Path]) -> None:
+        """Save the mask into a defect map file, see `from_file`."""
+        _path = Path(path)
+        _suffix = _path.suffix
+
+        if _suffix == ".bin":
+            _path.write_bytes(self.bitmap.to_bytes(_BITMAP_BYTES, "little"))
+        elif _suffix == ".txt":
+            with open(_path, "w") as f:
+                for coord in self:
+                    f.write(f"{coord.x}, {coord.y}\n")
+        else:
+            raise NotImplementedError(f"File with suffix {_suffix} is not supported!")
+
+    @property
+    def available_bitmap(self) -> int:
+        """Bitmap of the valid cores not masked."""
+        return VALID_CORES_BITMAP & ~self.bitmap
+
+    @property
+    def n_available(self) -> int:
+        """Number of the valid cores not masked."""
+        return _PopCount(self.available_bitmap)
+
+    @property
+    def available_addrs(self) -> Tuple[int, ...]:
+        """Addresses of the valid cores not masked, in ascending order."""
+        return _BitmapAddrs(self.available_bitmap)
+
+    def __contains__(self, coord: Union[Coord, int]) -> bool:
+        addr = coord.address if isinstance(coord, Coord) else coord
+
+        return bool((self.bitmap >> addr) & 1)
+
+    def __len__(self) -> int:
+        return _PopCount(self.bitmap)
+
+    def __iter__(self) -> Iterator[Coord]:
+        return (Coord.from_address(addr) for addr in _BitmapAddrs(self.bitmap))
+
+    def __or__(self, __other: "CoreMask") -> "CoreMask":
+        if not isinstance(__other, CoreMask):
+            return NotImplemented
+
+        return CoreMask(self.bitmap | __other.bitmap)
+
+    def __eq__(self, __other: object) -> bool:
+        if not isinstance(__other, CoreMask):
+            return NotImplemented
+
+        return self.bitmap == __other.bitmap
+
+    def __hash__(self) -> int:
+        return hash(self.bitmap)
+
+    def __repr__(self) -> str:
+        return "CoreMask([%s])" % ", ".join(f"({c.x}, {c.y})" for c in self)
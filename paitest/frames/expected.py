@@ -0,0 +1,531 @@
+"""Compact store of the expected test-out frames.
+
+The 3 test-out frames of a group share the header, test chip address, core address & \
+    core* address, and all but the core address are the same in a suite. The payloads \
+    of the frame #2 & #3 hold the test chip address too, see `ConfigFrameMask`: the \
+    low 3 bits of payload 2 are its high 3 bits, and payload 3 is its low 7 bits only. \
+    So only the core address & 57 bits of the payloads of every group are stored:
+
+- record: payload 1(30 bits) << 27 | payload 2 >> 3(27 bits), 8 bytes.
+- core address, 2 bytes.
+
+The frames are rebuilt from the header templates & the test chip address when needed.
+
+Layout of a '.bin' file, all in little-endian:
+
+- magic, 8 bytes.
+- test chip address, core* address, 2 bytes each. Reserved, 4 bytes.
+- number of groups, 8 bytes.
+- the records, 8 bytes per group, then the core addresses, 2 bytes per group.
+
+Files of version 1, 2 words of the full payloads per group, are loaded as well.
+"""
+
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterator, List, Sequence, Tuple, Union
+
+from .frame import FrameArray, FrameGen, as_frames, concat_frames, repeat_fields
+from .frame_io import DEFAULT_CHUNK_FRAMES
+from .frame_params import ConfigFrameMask as CFM
+from .frame_params import FrameMask as FM
+from .frame_params import FrameSubType as FST
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+EXPECTED_MAGIC = b"PAIEXP2\x00"
+_EXPECTED_MAGIC_V1 = b"PAIEXP1\x00"
+
+_HEADER = struct.Struct("<8sHH4xQ")
+_PAYLOAD_BITS = 30
+_PAYLOAD_MASK = FM.GENERAL_PAYLOAD_MASK
+_CORE_MASK = FM.GENERAL_CORE_ADDR_MASK
+
+# Bits of payload 2 stored, above the high 3 bits of the test chip address.
+_HIGH3_BITS = CFM.TEST_CHIP_ADDR_HIGH3_MASK.bit_length()
+_P2_BITS = _PAYLOAD_BITS - _HIGH3_BITS
+_P2_MASK = (1 << _P2_BITS) - 1
+
+# Bytes of a group, the record & the core address.
+_GROUP_BYTES = 10
+
+# Frames of a group.
+_GROUP_FRAMES = 3
+
+
+def _fixed_bits(test_chip_addr: int, core_star_addr: int) -> int:
+    """The upper 34 bits of the test-out frames, with core address 0."""
+    return (
+        FrameGen._GenFrame(FST.TEST_TYPE2.value, test_chip_addr, 0, core_star_addr, 0)
+        >> _PAYLOAD_BITS
+    )
+
+
+def _chip_payload_bits(test_chip_addr: int) -> Tuple[int, int]:
+    """The test chip address in payload 2 (the low 3 bits) & payload 3."""
+    high3 = (
+        test_chip_addr >> CFM.TEST_CHIP_ADDR_COMBINATION_OFFSET
+    ) & CFM.TEST_CHIP_ADDR_HIGH3_MASK
+    low7 = test_chip_addr & CFM.TEST_CHIP_ADDR_LOW7_MASK
+
+    return high3, low7 << CFM.TEST_CHIP_ADDR_LOW7_OFFSET
+
+
+def _empty(typecode: str) -> Union[array, "np.ndarray"]:
+    if np is not None:
+        return np.zeros(0, dtype=np.uint64 if typecode == "Q" else np.uint16)
+
+    return array(typecode)
+
+
+class CompactTestOut:
+    """Expected test-out frames of a suite, 10 bytes per group instead of 24.
+
+    Examples:
+    >>> config, testin, testout = manager.Get1GroupForNCoresWithNParams(100)
+    >>> expected = CompactTestOut.from_frames(testout)
+    >>> expected.equals(captured)
+    True
+    """
+
+    __slots__ = ("records", "core_addrs", "test_chip_addr", "core_star_addr")
+
+    def __init__(
+        self,
+        records: FrameArray,
+        core_addrs: Union[array, "np.ndarray"],
+        test_chip_addr: int,
+        core_star_addr: int = 0,
+    ) -> None:
+        """
+        Arguments:
+            - records: the payloads stored of every group, see the module.
+            - core_addrs: the core address of every group, `uint16`.
+            - test_chip_addr: the chip address of the test-out frames.
+            - core_star_addr: the core* address of the test-out frames.
+        """
+        if len(records) != len(core_addrs):
+            raise ValueError(
+                f"1 core address per record expected, but got {len(core_addrs)} "
+                f"for {len(records)}"
+            )
+
+        self.records: FrameArray = records
+        self.core_addrs: Union[array, "np.ndarray"] = core_addrs
+        self.test_chip_addr: int = test_chip_addr & FM.GENERAL_CHIP_ADDR_MASK
+        self.core_star_addr: int = core_star_addr & FM.GENERAL_CORE_STAR_ADDR_MASK
+
+    @classmethod
+    def from_fields(
+        cls,
+        core_addrs: Sequence[int],
+        payloads: Sequence[int],
+        test_chip_addr: int,
+        core_star_addr: int = 0,
+    ) -> "CompactTestOut":
+        """From the core address & the 3 payloads of every group, payloads flattened.
+
+        Raise `ValueError` if the payloads 2 & 3 don't hold the test chip address.
+        """
+        if len(payloads) != _GROUP_FRAMES * len(core_addrs):
+            raise ValueError(
+                f"{_GROUP_FRAMES * len(core_addrs)} payloads expected, "
+                f"but got {len(payloads)}"
+            )
+
+        high3, payload3 = _chip_payload_bits(test_chip_addr)
+
+        if np is not None:
+            _core_addrs = np.asarray(core_addrs, dtype=np.uint16) & np.uint16(
+                _CORE_MASK
+            )
+            _payloads = np.asarray(payloads, dtype=np.uint64)
+            _payloads = (_payloads & np.uint64(_PAYLOAD_MASK)).reshape(
+                -1, _GROUP_FRAMES
+            )
+
+            if (
+                not (
+                    (_payloads[:, 1] & np.uint64(CFM.TEST_CHIP_ADDR_HIGH3_MASK))
+                    == high3
+                ).all()
+                or not (_payloads[:, 2] == payload3).all()
+            ):
+                raise ValueError("The payloads don't hold the test chip address")
+
+            records = (_payloads[:, 0] << np.uint64(_P2_BITS)) | (
+                _payloads[:, 1] >> np.uint64(_HIGH3_BITS)
+            )
+
+            return cls(records, _core_addrs, test_chip_addr, core_star_addr)
+
+        records = array("Q")
+        for i in range(len(core_addrs)):
+            p1, p2, p3 = (p & _PAYLOAD_MASK for p in payloads[3 * i : 3 * i + 3])
+            if (p2 & CFM.TEST_CHIP_ADDR_HIGH3_MASK) != high3 or p3 != payload3:
+                raise ValueError("The payloads don't hold the test chip address")
+
+            records.append((p1 << _P2_BITS) | (p2 >> _HIGH3_BITS))
+
+        return cls(
+            records,
+            array("H", [addr & _CORE_MASK for addr in core_addrs]),
+            test_chip_addr,
+            core_star_addr,
+        )
+
+    @classmethod
+    def from_frames(
+        cls, frames: Sequence[int], byteorder: str = "big"
+    ) -> "CompactTestOut":
+        """From the test-out frames of a suite, 3 frames per group.
+
+        Raise `ValueError` if the frames are not test-out frames of type II, or the \
+            fixed bits differ between frames or the core addresses within a group.
+        """
+        _frames = as_frames(frames, byteorder)
+        if len(_frames) % _GROUP_FRAMES != 0:
+            raise ValueError(
+                f"Number of frames must be a multiple of {_GROUP_FRAMES}, "
+                f"but got {len(_frames)}"
+            )
+
+        if len(_frames) == 0:
+            return cls(_empty("Q"), _empty("H"), 0)
+
+        first = int(_frames[0])
+        test_chip_addr = (
+            first >> FM.GENERAL_CHIP_ADDR_OFFSET
+        ) & FM.GENERAL_CHIP_ADDR_MASK
+        core_star_addr = (
+            first >> FM.GENERAL_CORE_STAR_ADDR_OFFSET
+        ) & FM.GENERAL_CORE_STAR_ADDR_MASK
+        fixed = _fixed_bits(test_chip_addr, core_star_addr)
+        core_offset = FM.GENERAL_CORE_ADDR_OFFSET - _PAYLOAD_BITS
+
+        if np is not None:
+            hi = (_frames >> np.uint64(_PAYLOAD_BITS)).reshape(-1, _GROUP_FRAMES)
+            core_addrs = (hi[:, 0] >> np.uint64(core_offset)) & np.uint64(_CORE_MASK)
+            _hi = np.uint64(fixed) | (core_addrs << np.uint64(core_offset))
+
+            if not (hi == _hi[:, None]).all():
+                raise ValueError("Not the test-out frames of type II of a suite")
+
+            payloads = _frames & np.uint64(_PAYLOAD_MASK)
+        else:
+            core_addrs = array("H")
+            for i in range(0, len(_frames), _GROUP_FRAMES):
+                core_addr = (_frames[i] >> FM.GENERAL_CORE_ADDR_OFFSET) & _CORE_MASK
+                _hi = fixed | (core_addr << core_offset)
+
+                if any(
+                    (frame >> _PAYLOAD_BITS) != _hi
+                    for frame in _frames[i : i + _GROUP_FRAMES]
+                ):
+                    raise ValueError("Not the test-out frames of type II of a suite")
+
+                core_addrs.append(core_addr)
+
+            payloads = [frame & _PAYLOAD_MASK for frame in _frames]
+
+        return cls.from_fields(core_addrs, payloads, test_chip_addr, core_star_addr)
+
+    @classmethod
+    def concat(cls, stores: Sequence["CompactTestOut"]) -> "CompactTestOut":
+        """Concatenate the stores of the same suite, e.g. built chunk by chunk."""
+        if not stores:
+            raise ValueError("No stores to concatenate")
+
+        first = stores[0]
+        for store in stores[1:]:
+            if (store.test_chip_addr, store.core_star_addr) != (
+                first.test_chip_addr,
+                first.core_star_addr,
+            ):
+                raise ValueError("Stores of different suites")
+
+        if np is not None:
+            core_addrs = np.concatenate([store.core_addrs for store in stores])
+        else:
+            core_addrs = array("H")
+            for store in stores:
+                core_addrs.extend(store.core_addrs)
+
+        return cls(
+            concat_frames([store.records for store in stores]),
+            core_addrs,
+            first.test_chip_addr,
+            first.core_star_addr,
+        )
+
+    def __len__(self) -> int:
+        """Number of groups."""
+        return len(self.records)
+
+    @property
+    def n_frames(self) -> int:
+        return _GROUP_FRAMES * len(self)
+
+    @property
+    def nbytes(self) -> int:
+        return _GROUP_BYTES * len(self)
+
+    @property
+    def payloads(self) -> FrameArray:
+        """The 3 payloads of every group, flattened."""
+        high3, payload3 = _chip_payload_bits(self.test_chip_addr)
+
+        if np is not None:
+            payloads = np.empty((len(self), _GROUP_FRAMES), dtype=np.uint64)
+            payloads[:, 0] = self.records >> np.uint64(_P2_BITS)
+            payloads[:, 1] = (
+                (self.records & np.uint64(_P2_MASK)) << np.uint64(_HIGH3_BITS)
+            ) | np.uint64(high3)
+            payloads[:, 2] = payload3
+
+            return payloads.ravel()
+
+        payloads = array("Q")
+        for record in self.records:
+            payloads.extend(
+                (
+                    record >> _P2_BITS,
+                    ((record & _P2_MASK) << _HIGH3_BITS) | high3,
+                    payload3,
+                )
+            )
+
+        return payloads
+
+    def _slice(self, start: int, stop: int) -> "CompactTestOut":
+        return CompactTestOut(
+            self.records[start:stop],
+            self.core_addrs[start:stop],
+            self.test_chip_addr,
+            self.core_star_addr,
+        )
+
+    def __getitem__(self, index: int) -> Tuple[int, ...]:
+        """The 3 test-out frames of a group."""
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("Group index out of range")
+
+        return tuple(self._slice(index, index + 1).to_frames().tolist())
+
+    def to_frames(self) -> FrameArray:
+        """Expand into the full test-out frames."""
+        return FrameGen.GenFramesFromTemplates(
+            FST.TEST_TYPE2,
+            self.test_chip_addr,
+            repeat_fields(self.core_addrs, _GROUP_FRAMES),
+            self.core_star_addr,
+            self.payloads,
+        )
+
+    def take(self, indices: Sequence[int]) -> FrameArray:
+        """Expand only the test-out frames at the indices, in frames, not groups."""
+        high3, payload3 = _chip_payload_bits(self.test_chip_addr)
+
+        if np is not None:
+            _indices = np.asarray(indices, dtype=np.intp)
+            groups, positions = np.divmod(_indices, _GROUP_FRAMES)
+            records = self.records[groups]
+
+            payloads = np.where(
+                positions == 0,
+                records >> np.uint64(_P2_BITS),
+                np.where(
+                    positions == 1,
+                    ((records & np.uint64(_P2_MASK)) << np.uint64(_HIGH3_BITS))
+                    | np.uint64(high3),
+                    np.uint64(payload3),
+                ),
+            )
+
+            templates = FrameGen._GetTemplatesArray(
+                FST.TEST_TYPE2, self.test_chip_addr, self.core_star_addr
+            )
+            return templates[self.core_addrs[groups].astype(np.intp)] | payloads
+
+        templates = FrameGen._GetTemplates(
+            FST.TEST_TYPE2, self.test_chip_addr, self.core_star_addr
+        )
+        frames = array("Q")
+        for index in indices:
+            group, position = divmod(index, _GROUP_FRAMES)
+            record = self.records[group]
+
+            if position == 0:
+                payload = record >> _P2_BITS
+            elif position == 1:
+                payload = ((record & _P2_MASK) << _HIGH3_BITS) | high3
+            else:
+                payload = payload3
+
+            frames.append(templates[self.core_addrs[group]] | payload)
+
+        return frames
+
+    def iter_frames(
+        self, chunk_size: int = DEFAULT_CHUNK_FRAMES // _GROUP_FRAMES
+    ) -> Iterator[FrameArray]:
+        """Expand into the full test-out frames lazily, 'chunk_size' groups a time."""
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+
+        for start in range(0, len(self), chunk_size):
+            yield self._slice(start, start + chunk_size).to_frames()
+
+    def match(
+        self, frames: Sequence[int], byteorder: str = "big"
+    ) -> Union[List[bool], "np.ndarray"]:
+        """Compare the frames with the expected ones without expanding them.
+
+        Arguments:
+            - frames: the test-out frames in the same order, an array or raw bytes.
+            - byteorder: the byte order of raw bytes.
+
+        Returns:
+            - whether every frame is the expected one.
+        """
+        _frames = as_frames(frames, byteorder)
+        if len(_frames) != self.n_frames:
+            raise ValueError(f"{self.n_frames} frames expected, but got {len(_frames)}")
+
+        fixed = _fixed_bits(self.test_chip_addr, self.core_star_addr)
+        core_offset = FM.GENERAL_CORE_ADDR_OFFSET - _PAYLOAD_BITS
+        expected = self.payloads
+
+        if np is not None:
+            hi = (_frames >> np.uint64(_PAYLOAD_BITS)).reshape(-1, _GROUP_FRAMES)
+            _hi = np.uint64(fixed) | (
+                self.core_addrs.astype(np.uint64) << np.uint64(core_offset)
+            )
+
+            matched = hi == _hi[:, None]
+            matched &= ((_frames & np.uint64(_PAYLOAD_MASK)) == expected).reshape(
+                -1, _GROUP_FRAMES
+            )
+
+            return matched.ravel()
+
+        matched = []
+        for i, frame in enumerate(_frames):
+            hi = fixed | (self.core_addrs[i // _GROUP_FRAMES] << core_offset)
+            matched.append(
+                (frame >> _PAYLOAD_BITS) == hi
+                and (frame & _PAYLOAD_MASK) == expected[i]
+            )
+
+        return matched
+
+    def equals(self, frames: Sequence[int], byteorder: str = "big") -> bool:
+        """Whether all the frames are the expected ones, see `match`."""
+        try:
+            return bool(all(self.match(frames, byteorder)))
+        except ValueError:
+            return False
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Save into a '.bin' file, see the module."""
+        _path = Path(path)
+        if _path.suffix != ".bin":
+            raise NotImplementedError(
+                f"File with suffix {_path.suffix} is not supported!"
+            )
+
+        header = _HEADER.pack(
+            EXPECTED_MAGIC, self.test_chip_addr, self.core_star_addr, len(self)
+        )
+
+        if np is not None:
+            records = np.asarray(self.records, dtype="<u8").tobytes()
+            core_addrs = np.asarray(self.core_addrs, dtype="<u2").tobytes()
+        else:
+            _records = array("Q", self.records)
+            _core_addrs = array("H", self.core_addrs)
+            if sys.byteorder != "little":
+                _records.byteswap()
+                _core_addrs.byteswap()
+
+            records, core_addrs = _records.tobytes(), _core_addrs.tobytes()
+
+        with open(_path, "wb") as f:
+            f.write(header)
+            f.write(records)
+            f.write(core_addrs)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "CompactTestOut":
+        """Load from a '.bin' file saved by `save`."""
+        _path = Path(path)
+        if _path.suffix != ".bin":
+            raise NotImplementedError(
+                f"File with suffix {_path.suffix} is not supported!"
+            )
+
+        data = _path.read_bytes()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{_path} is not an expected test-out file")
+
+        magic, test_chip_addr, core_star_addr, n = _HEADER.unpack_from(data)
+        if magic not in (EXPECTED_MAGIC, _EXPECTED_MAGIC_V1):
+            raise ValueError(f"{_path} is not an expected test-out file")
+
+        body = data[_HEADER.size :]
+        group_bytes = _GROUP_BYTES if magic == EXPECTED_MAGIC else 16
+        if len(body) != group_bytes * n:
+            raise ValueError(f"{_path} is truncated, {n} groups expected")
+
+        if magic == _EXPECTED_MAGIC_V1:
+            return cls._from_v1(
+                as_frames(body, "little"), test_chip_addr, core_star_addr
+            )
+
+        records = as_frames(body[: 8 * n], "little")
+        if np is not None:
+            core_addrs = np.frombuffer(body[8 * n :], dtype="<u2").astype(np.uint16)
+        else:
+            core_addrs = array("H", body[8 * n :])
+            if sys.byteorder != "little":
+                core_addrs.byteswap()
+
+        return cls(records, core_addrs, test_chip_addr, core_star_addr)
+
+    @classmethod
+    def _from_v1(
+        cls, words: FrameArray, test_chip_addr: int, core_star_addr: int
+    ) -> "CompactTestOut":
+        """From the records of version 1: core address << 30 | payload 1, and \
+            payload 2 << 30 | payload 3.
+        """
+        w0, w1 = words[0::2], words[1::2]
+
+        if np is not None:
+            mask, shift = np.uint64(_PAYLOAD_MASK), np.uint64(_PAYLOAD_BITS)
+            core_addrs = w0 >> shift
+            payloads = np.stack((w0 & mask, w1 >> shift, w1 & mask), axis=1).ravel()
+        else:
+            core_addrs = [w >> _PAYLOAD_BITS for w in w0]
+            payloads = array("Q")
+            for _w0, _w1 in zip(w0, w1):
+                payloads.extend(
+                    (_w0 & _PAYLOAD_MASK, _w1 >> _PAYLOAD_BITS, _w1 & _PAYLOAD_MASK)
+                )
+
+        return cls.from_fields(core_addrs, payloads, test_chip_addr, core_star_addr)
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactTestOut({len(self)} groups, test_chip_addr={self.test_chip_addr}, "
+            f"core_star_addr={self.core_star_addr})"
+        )
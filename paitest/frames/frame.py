@@ -1,20 +1,52 @@
+import bisect
+import mmap
 import random
-from typing import Any, Dict, List, Optional, Tuple, Union
-
-from .coord import Coord
+import sys
+from array import array
+from pathlib import Path
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .coord import Coord, CoordArray
 from .frame_params import ConfigFrameMask as CFM
 from .frame_params import FrameMask as FM
 from .frame_params import FrameSubType as FST
 from .frame_params import FrameType as FT
+from .frame_params import RandomSeedFrameMask as RFM
 from .frame_params import *
+from .legal_params import GenLegalParamReg, GenLegalParamRegsBatch
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# A contiguous buffer of 64-bit frames. `numpy.ndarray` of `uint64` when NumPy is
+# installed, otherwise `array.array('Q')`.
+FrameArray = Union[array, "np.ndarray"]
+
+# A frame field given as a single value (broadcast to every frame) or one value per frame.
+# Address fields can also be given as `CoordArray`.
+_FieldType = Union[int, Sequence[int], "np.ndarray", CoordArray]
 
 
 def Addr2Coord(addr: int) -> Coord:
-    return Coord(addr >> 5, addr & ((1 << 5) - 1))
+    return Coord.from_address(addr)
 
 
 def Coord2Addr(coord: Coord) -> int:
-    return (coord.x << 5) | coord.y
+    return coord.address
 
 
 def test_chip_coord_split(coord: Coord) -> Tuple[int, int]:
@@ -36,7 +68,194 @@ def test_chip_addr_combine(high3: int, low7: int) -> Coord:
     return Addr2Coord(addr)
 
 
+def _as_field(field: _FieldType) -> _FieldType:
+    """Take the addresses of `CoordArray`."""
+    if isinstance(field, CoordArray):
+        return field.addresses
+
+    return field
+
+
+def _broadcast_len(fields: Sequence[_FieldType]) -> int:
+    """Length of the frames built from the fields. Single values are broadcast."""
+    n: Optional[int] = None
+
+    for field in fields:
+        if isinstance(field, int) or (np is not None and np.ndim(field) == 0):
+            continue
+
+        if n is None:
+            n = len(field)  # type: ignore
+        elif len(field) != n:  # type: ignore
+            raise ValueError(f"Length of fields mismatch: {len(field)} != {n}")  # type: ignore
+
+    return 1 if n is None else n
+
+
+_MASK64 = (1 << 64) - 1
+
+
+def _SplitMix64(x: int) -> int:
+    """SplitMix64 mixing function, on a 64-bit integer."""
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+
+    return x ^ (x >> 31)
+
+
+def _SplitMix64Batch(x: "np.ndarray") -> "np.ndarray":
+    """SplitMix64 mixing function, on an array of `uint64`. Wrap around on overflow."""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+
+    return x ^ (x >> np.uint64(31))
+
+
+def _CounterHash(seed: int, chip_addr: int, core_addr: int, index: int) -> int:
+    """64 random bits keyed by (seed, chip, core, index)."""
+    key = _SplitMix64(seed & _MASK64)
+    key = _SplitMix64(key ^ ((chip_addr << 10) | core_addr))
+
+    return _SplitMix64(key ^ (index & _MASK64))
+
+
+_FIELD_MASKS = (
+    FM.GENERAL_HEADER_MASK,
+    FM.GENERAL_CHIP_ADDR_MASK,
+    FM.GENERAL_CORE_ADDR_MASK,
+    FM.GENERAL_CORE_STAR_ADDR_MASK,
+    FM.GENERAL_PAYLOAD_MASK,
+)
+_FIELD_OFFSETS = (
+    FM.GENERAL_HEADER_OFFSET,
+    FM.GENERAL_CHIP_ADDR_OFFSET,
+    FM.GENERAL_CORE_ADDR_OFFSET,
+    FM.GENERAL_CORE_STAR_ADDR_OFFSET,
+    FM.GENERAL_PAYLOAD_OFFSET,
+)
+
+
+def repeat_fields(fields: _FieldType, repeats: int) -> _FieldType:
+    """Repeat every field 'repeats' times, e.g. the core address for every frame of a group."""
+    fields = _as_field(fields)
+
+    if np is not None:
+        return np.repeat(np.asarray(fields, dtype=np.uint64), repeats)
+
+    return [field for field in fields for _ in range(repeats)]  # type: ignore
+
+
+def concat_frames(arrays: Sequence[FrameArray]) -> FrameArray:
+    """Concatenate buffers of frames into one."""
+    if np is not None:
+        return np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.uint64)
+
+    frames = array("Q")
+    for _frames in arrays:
+        frames.extend(_frames)
+
+    return frames
+
+
 class FrameGen:
+    # Cache of the header templates, the upper 34 bits of the frames of all the 1024 cores.
+    # (header, chip address, core* address) -> templates indexed by core address.
+    _templates: Dict[Tuple[int, int, int], Tuple[int, ...]] = {}
+    _templates_array: Dict[Tuple[int, int, int], FrameArray] = {}
+    # At most so many keys are cached, the oldest ones are dropped first.
+    _TEMPLATES_CACHE_SIZE = 16
+
+    @staticmethod
+    def _CacheTemplates(
+        cache: Dict[Tuple[int, int, int], Any],
+        key: Tuple[int, int, int],
+        templates: Any,
+    ) -> None:
+        """Cache the header templates of 'key', dropping the oldest ones if full."""
+        while len(cache) >= FrameGen._TEMPLATES_CACHE_SIZE:
+            del cache[next(iter(cache))]
+
+        cache[key] = templates
+
+    @staticmethod
+    def _GetTemplates(
+        header: FST, chip_addr: int, core_star_addr: int
+    ) -> Tuple[int, ...]:
+        """Get the header templates of all cores. Build them at the first call."""
+        key = (header.value, chip_addr, core_star_addr)
+        templates = FrameGen._templates.get(key)
+
+        if templates is None:
+            templates = tuple(
+                FrameGen._GenFrame(
+                    header.value, chip_addr, core_addr, core_star_addr, 0
+                )
+                for core_addr in range(FM.GENERAL_CORE_ADDR_MASK + 1)
+            )
+            FrameGen._CacheTemplates(FrameGen._templates, key, templates)
+
+        return templates
+
+    @staticmethod
+    def _GetTemplatesArray(
+        header: FST, chip_addr: int, core_star_addr: int
+    ) -> FrameArray:
+        """`uint64` buffer version of `_GetTemplates`."""
+        key = (header.value, chip_addr, core_star_addr)
+        templates = FrameGen._templates_array.get(key)
+
+        if templates is None:
+            _templates = FrameGen._GetTemplates(header, chip_addr, core_star_addr)
+            if np is not None:
+                templates = np.array(_templates, dtype=np.uint64)
+            else:
+                templates = array("Q", _templates)
+
+            FrameGen._CacheTemplates(FrameGen._templates_array, key, templates)
+
+        return templates
+
+    @staticmethod
+    def GenFramesFromTemplates(
+        header: FST,
+        chip_addr: int,
+        core_addrs: _FieldType,
+        core_star_addr: int,
+        payloads: _FieldType,
+    ) -> FrameArray:
+        """Same as `GenFramesBatch` with the same header, chip & core* address for all frames.
+
+        Every frame is a lookup of the header templates ORed with the payload.
+        """
+        core_addrs = _as_field(core_addrs)
+        n = _broadcast_len((core_addrs, payloads))
+
+        if np is not None:
+            templates = FrameGen._GetTemplatesArray(header, chip_addr, core_star_addr)
+            _core_addrs = np.asarray(core_addrs, dtype=np.intp)
+            _payloads = np.asarray(payloads, dtype=np.uint64)
+
+            return np.broadcast_to(
+                templates[_core_addrs]
+                | (_payloads & np.uint64(FM.GENERAL_PAYLOAD_MASK)),
+                n,
+            ).copy()
+
+        templates = FrameGen._GetTemplates(header, chip_addr, core_star_addr)
+        _core_addrs = (core_addrs,) * n if isinstance(core_addrs, int) else core_addrs
+        _payloads = (payloads,) * n if isinstance(payloads, int) else payloads
+        mask = FM.GENERAL_PAYLOAD_MASK
+
+        return array(
+            "Q",
+            [
+                templates[core_addr] | (payload & mask)
+                for core_addr, payload in zip(_core_addrs, _payloads)
+            ],
+        )
+
     @staticmethod
     def _GenFrame(
         header: int, chip_addr: int, core_addr: int, core_star_addr: int, payload: int
@@ -55,6 +274,58 @@ class FrameGen:
             | (payload << FM.GENERAL_PAYLOAD_OFFSET)
         )
 
+    @staticmethod
+    def GenFramesBatch(
+        headers: Union[FST, _FieldType],
+        chip_addrs: _FieldType,
+        core_addrs: _FieldType,
+        core_star_addrs: _FieldType,
+        payloads: _FieldType,
+    ) -> FrameArray:
+        """Pack arrays of fields into a contiguous buffer of 64-bit frames in one pass.
+
+        Every field is either a single value, which is broadcast to all frames, \
+            or a sequence with one value per frame. All sequences must have the same length.
+
+        Returns:
+            - `numpy.ndarray` of `uint64` if NumPy is installed, otherwise `array('Q')`.
+        """
+        if isinstance(headers, FST):
+            headers = headers.value
+
+        fields = tuple(
+            _as_field(field)
+            for field in (headers, chip_addrs, core_addrs, core_star_addrs, payloads)
+        )
+        n = _broadcast_len(fields)
+
+        if np is not None:
+            frames = np.zeros(n, dtype=np.uint64)
+            for field, mask, offset in zip(fields, _FIELD_MASKS, _FIELD_OFFSETS):
+                _field = np.asarray(field, dtype=np.uint64)
+                frames |= (_field & np.uint64(mask)) << np.uint64(offset)
+
+            return frames
+
+        # Broadcast the single values
+        _fields = [
+            (field,) * n if isinstance(field, int) else field for field in fields
+        ]
+        h_mask, chip_mask, core_mask, core_star_mask, payload_mask = _FIELD_MASKS
+        h_off, chip_off, core_off, core_star_off, payload_off = _FIELD_OFFSETS
+
+        return array(
+            "Q",
+            [
+                ((h & h_mask) << h_off)
+                | ((chip & chip_mask) << chip_off)
+                | ((core & core_mask) << core_off)
+                | ((core_star & core_star_mask) << core_star_off)
+                | ((payload & payload_mask) << payload_off)
+                for h, chip, core, core_star, payload in zip(*_fields)
+            ],
+        )
+
     @staticmethod
     def GenConfigFrame(
         header: FST,
@@ -63,14 +334,12 @@ class FrameGen:
         core_star_coord: Coord,
         payload: int,
     ) -> int:
-        chip_addr = Coord2Addr(chip_coord)
-        core_addr = Coord2Addr(core_coord)
-        core_star_addr = Coord2Addr(core_star_coord)
-
-        return FrameGen._GenFrame(
-            header.value, chip_addr, core_addr, core_star_addr, payload
+        templates = FrameGen._GetTemplates(
+            header, Coord2Addr(chip_coord), Coord2Addr(core_star_coord)
         )
 
+        return templates[Coord2Addr(core_coord)] | (payload & FM.GENERAL_PAYLOAD_MASK)
+
     @staticmethod
     def GenConfigGroup(
         header: FST,
@@ -107,8 +376,10 @@ class FrameGen:
         tick_wait_end: Optional[int] = None,
         snn_en: Optional[bool] = None,
         target_lcn: Optional[int] = None,
+        rng: Optional[random.Random] = None,
     ) -> Tuple[int, ...]:
         high3, low7 = test_chip_coord_split(test_chip_coord)
+        _rng = random if rng is None else rng
 
         param_reg: List[int] = []
 
@@ -116,16 +387,148 @@ class FrameGen:
             if not is_legal:
                 # Don't care 'tick_wait_start' split in #1 and #2
                 for _ in range(2):
-                    param_reg.append(random.randint(0, FM.GENERAL_PAYLOAD_MASK))
+                    param_reg.append(_rng.randint(0, FM.GENERAL_PAYLOAD_MASK))
 
                 param_reg[1] = (param_reg[1] & (~CFM.TEST_CHIP_ADDR_HIGH3_MASK)) | high3
                 param_reg.append(low7 << CFM.TEST_CHIP_ADDR_LOW7_OFFSET)
             else:
-                # DTODO o legal generation
-                raise NotImplementedError
+                fixed = {
+                    "weight_width_type": weight_width_type,
+                    "lcn_type": lcn_type,
+                    "input_width_type": input_width_type,
+                    "spike_width_type": spike_width_type,
+                    "neuron_num": neuron_num,
+                    "pool_max_en": pool_max_en,
+                    "tick_wait_start": tick_wait_start,
+                    "tick_wait_end": tick_wait_end,
+                    "snn_en": snn_en,
+                    "target_lcn": target_lcn,
+                }
+                param_reg.extend(
+                    GenLegalParamReg(
+                        _rng.getrandbits(64),
+                        _rng.getrandbits(64),
+                        Coord2Addr(test_chip_coord),
+                        **{k: v for k, v in fixed.items() if v is not None},
+                    )
+                )
 
         return tuple(param_reg)
 
+    @staticmethod
+    def _GenLegalParamRegs(
+        N: int, test_chip_coord: Coord, rng: Optional[random.Random] = None
+    ) -> FrameArray:
+        """Generate 'N' legal parameters reg in bulk. Same as calling `_GenParamReg` \
+            with `is_legal=True` 'N' times.
+
+        Returns:
+            - the 3 parameters reg of every group in order, as payloads of a `uint64` buffer.
+        """
+        _rng = random if rng is None else rng
+        test_chip_addr = Coord2Addr(test_chip_coord)
+
+        if np is not None:
+            # 2 words for each, in the same order as `getrandbits(64)` twice
+            words = np.frombuffer(
+                _rng.getrandbits(128 * N).to_bytes(16 * N, "little"), dtype="<u8"
+            ).astype(np.uint64)
+
+            return GenLegalParamRegsBatch(words[0::2], words[1::2], test_chip_addr)
+
+        payloads = array("Q")
+        for _ in range(N):
+            payloads.extend(
+                GenLegalParamReg(
+                    _rng.getrandbits(64), _rng.getrandbits(64), test_chip_addr
+                )
+            )
+
+        return payloads
+
+    @staticmethod
+    def _GenParamRegAt(
+        seed: int,
+        chip_addr: int,
+        core_addr: int,
+        index: int,
+        test_chip_coord: Coord,
+        is_legal: bool = False,
+    ) -> Tuple[int, ...]:
+        """Generate the random parameters reg of group #'index' of a core.
+
+        Counter-based: the parameters only depend on (seed, chip, core, index), \
+            so any group can be regenerated without generating the groups before it.
+        """
+        r = _CounterHash(seed, chip_addr, core_addr, index)
+
+        if is_legal:
+            return GenLegalParamReg(r, _SplitMix64(r), Coord2Addr(test_chip_coord))
+
+        high3, low7 = test_chip_coord_split(test_chip_coord)
+
+        return (
+            r & FM.GENERAL_PAYLOAD_MASK,
+            ((r >> 30) & FM.GENERAL_PAYLOAD_MASK & (~CFM.TEST_CHIP_ADDR_HIGH3_MASK))
+            | high3,
+            low7 << CFM.TEST_CHIP_ADDR_LOW7_OFFSET,
+        )
+
+    @staticmethod
+    def _GenParamRegsBatch(
+        seed: int,
+        chip_addr: int,
+        core_addrs: _FieldType,
+        indices: _FieldType,
+        test_chip_coord: Coord,
+        is_legal: bool = False,
+    ) -> FrameArray:
+        """Batch version of `_GenParamRegAt`.
+
+        Returns:
+            - the 3 parameters reg of every group in order, as payloads of a `uint64` buffer.
+        """
+        core_addrs = _as_field(core_addrs)
+        n = _broadcast_len((core_addrs, indices))
+        high3, low7 = test_chip_coord_split(test_chip_coord)
+
+        if np is not None:
+            _core_addrs = np.broadcast_to(np.asarray(core_addrs, dtype=np.uint64), n)
+            _indices = np.broadcast_to(np.asarray(indices, dtype=np.uint64), n)
+            key = np.uint64(_SplitMix64(seed & _MASK64))
+            key = _SplitMix64Batch(
+                key ^ ((np.uint64(chip_addr) << np.uint64(10)) | _core_addrs)
+            )
+            r = _SplitMix64Batch(key ^ _indices)
+
+            if is_legal:
+                return GenLegalParamRegsBatch(
+                    r, _SplitMix64Batch(r), Coord2Addr(test_chip_coord)
+                )
+
+            payloads = np.empty((n, 3), dtype=np.uint64)
+            payloads[:, 0] = r & np.uint64(FM.GENERAL_PAYLOAD_MASK)
+            payloads[:, 1] = (
+                (r >> np.uint64(30))
+                & np.uint64(FM.GENERAL_PAYLOAD_MASK & (~CFM.TEST_CHIP_ADDR_HIGH3_MASK))
+            ) | np.uint64(high3)
+            payloads[:, 2] = low7 << CFM.TEST_CHIP_ADDR_LOW7_OFFSET
+
+            return payloads.ravel()
+
+        _core_addrs = (core_addrs,) * n if isinstance(core_addrs, int) else core_addrs
+        _indices = (indices,) * n if isinstance(indices, int) else indices
+
+        payloads = array("Q")
+        for core_addr, index in zip(_core_addrs, _indices):
+            payloads.extend(
+                FrameGen._GenParamRegAt(
+                    seed, chip_addr, core_addr, index, test_chip_coord, is_legal
+                )
+            )
+
+        return payloads
+
     """Functions of Test Frames Generation"""
 
     @staticmethod
@@ -136,14 +539,12 @@ class FrameGen:
         core_star_coord: Coord,
         payload: int = 0,
     ) -> int:
-        chip_addr = Coord2Addr(chip_coord)
-        core_addr = Coord2Addr(core_coord)
-        core_star_addr = Coord2Addr(core_star_coord)
-
-        return FrameGen._GenFrame(
-            header.value, chip_addr, core_addr, core_star_addr, payload
+        templates = FrameGen._GetTemplates(
+            header, Coord2Addr(chip_coord), Coord2Addr(core_star_coord)
         )
 
+        return templates[Coord2Addr(core_coord)] | (payload & FM.GENERAL_PAYLOAD_MASK)
+
     @staticmethod
     def GenTest1InFrame(
         chip_coord: Coord, core_coord: Coord, core_star_coord: Coord
@@ -167,10 +568,13 @@ class FrameGen:
     def GenTest2InFrame(
         chip_coord: Coord, core_coord: Coord, core_star_coord: Coord
     ) -> int:
-        return FrameGen._GenTestFrame(
-            FST.TEST_TYPE2, chip_coord, core_coord, core_star_coord
+        # No payload, served from the templates directly
+        templates = FrameGen._GetTemplates(
+            FST.TEST_TYPE2, Coord2Addr(chip_coord), Coord2Addr(core_star_coord)
         )
 
+        return templates[Coord2Addr(core_coord)]
+
     @staticmethod
     def GenTest2OutFrame(
         test_chip_coord: Coord,
@@ -183,69 +587,514 @@ class FrameGen:
         )
 
 
+# Columns of every frame: (name, offset, mask, dtype)
+_GENERAL_COLUMNS = (
+    ("sub_type", FM.GENERAL_HEADER_OFFSET, FM.GENERAL_HEADER_MASK, "u1"),
+    ("chip_addr", FM.GENERAL_CHIP_ADDR_OFFSET, FM.GENERAL_CHIP_ADDR_MASK, "u2"),
+    ("core_addr", FM.GENERAL_CORE_ADDR_OFFSET, FM.GENERAL_CORE_ADDR_MASK, "u2"),
+    (
+        "core_star_addr",
+        FM.GENERAL_CORE_STAR_ADDR_OFFSET,
+        FM.GENERAL_CORE_STAR_ADDR_MASK,
+        "u2",
+    ),
+    ("payload", FM.GENERAL_PAYLOAD_OFFSET, FM.GENERAL_PAYLOAD_MASK, "u4"),
+)
+
+# Columns of the parameters reg of a config type II group: \
+#   (name, [(frame #, offset, mask, shift), ...], dtype). \
+#   A field split over 2 frames is the OR of its parts, each shifted by 'shift'.
+_PARAM_REG_COLUMNS = (
+    ("weight_width", [(0, CFM.WEIGHT_WIDTH_OFFSET, CFM.WEIGHT_WIDTH_MASK, 0)], "u1"),
+    ("LCN", [(0, CFM.LCN_OFFSET, CFM.LCN_MASK, 0)], "u1"),
+    ("input_width", [(0, CFM.INPUT_WIDTH_OFFSET, CFM.INPUT_WIDTH_MASK, 0)], "u1"),
+    ("spike_width", [(0, CFM.SPIKE_WIDTH_OFFSET, CFM.SPIKE_WIDTH_MASK, 0)], "u1"),
+    ("neuron_num", [(0, CFM.NEURON_NUM_OFFSET, CFM.NEURON_NUM_MASK, 0)], "u2"),
+    ("pool_max", [(0, CFM.POOL_MAX_OFFSET, CFM.POOL_MAX_MASK, 0)], "u1"),
+    (
+        "tick_wait_start",
+        [
+            (
+                0,
+                CFM.TICK_WAIT_START_HIGH8_OFFSET,
+                CFM.TICK_WAIT_START_HIGH8_MASK,
+                CFM.TICK_WAIT_START_COMBINATION_OFFSET,
+            ),
+            (1, CFM.TICK_WAIT_START_LOW7_OFFSET, CFM.TICK_WAIT_START_LOW7_MASK, 0),
+        ],
+        "u2",
+    ),
+    ("tick_wait_end", [(1, CFM.TICK_WAIT_END_OFFSET, CFM.TICK_WAIT_END_MASK, 0)], "u2"),
+    ("SNN_EN", [(1, CFM.SNN_EN_OFFSET, CFM.SNN_EN_MASK, 0)], "u1"),
+    ("target_LCN", [(1, CFM.TARGET_LCN_OFFSET, CFM.TARGET_LCN_MASK, 0)], "u1"),
+    (
+        "test_chip_addr",
+        [
+            (
+                1,
+                CFM.TEST_CHIP_ADDR_HIGH3_OFFSET,
+                CFM.TEST_CHIP_ADDR_HIGH3_MASK,
+                CFM.TEST_CHIP_ADDR_COMBINATION_OFFSET,
+            ),
+            (2, CFM.TEST_CHIP_ADDR_LOW7_OFFSET, CFM.TEST_CHIP_ADDR_LOW7_MASK, 0),
+        ],
+        "u2",
+    ),
+)
+
+# Column of the 64-bit random seed of a config/test type I group.
+_RANDOM_SEED_COLUMN = (
+    "random_seed",
+    [
+        (
+            0,
+            RFM.SEED_HIGH30_OFFSET,
+            RFM.SEED_HIGH30_MASK,
+            RFM.SEED_HIGH30_COMBINATION_OFFSET,
+        ),
+        (
+            1,
+            RFM.SEED_MID30_OFFSET,
+            RFM.SEED_MID30_MASK,
+            RFM.SEED_MID30_COMBINATION_OFFSET,
+        ),
+        (2, RFM.SEED_LOW4_OFFSET, RFM.SEED_LOW4_MASK, 0),
+    ],
+    "u8",
+)
+
+# Columns of the startup frame of a data package: (name, offset, mask, dtype)
+_PACKAGE_COLUMNS = (
+    (
+        "sram_start_addr",
+        FM.GENERAL_PACKAGE_SRAM_START_ADDR_OFFSET,
+        FM.GENERAL_PACKAGE_SRAM_START_ADDR_MASK,
+        "u2",
+    ),
+    (
+        "package_type",
+        FM.GENERAL_PACKAGE_TYPE_OFFSET,
+        FM.GENERAL_PACKAGE_TYPE_MASK,
+        "u1",
+    ),
+    (
+        "count",
+        FM.GENERAL_PACKAGE_COUNT_OFFSET,
+        FM.GENERAL_PACKAGE_COUNT_MASK,
+        "u4",
+    ),
+)
+
+# Decoded columns, `numpy.ndarray` if NumPy is installed, otherwise `array.array`.
+ColumnsType = Dict[str, Union[array, "np.ndarray"]]
+
+
+# Raw bytes of frames.
+_BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+
+def as_frames(buffer: Any, byteorder: str = "big") -> FrameArray:
+    """View a buffer of frames as `uint64` without copying if possible.
+
+    Arguments:
+        - buffer: an array of frames, or raw bytes (`bytes`, `memoryview`, `mmap`, ...) \
+            of 8-byte frames.
+        - byteorder: the byte order of the raw bytes. Ignored for arrays of integers.
+    """
+    assert byteorder in ["little", "big"]
+    dtype = ">u8" if byteorder == "big" else "<u8"
+
+    if np is not None:
+        if isinstance(buffer, np.ndarray):
+            return buffer.astype(np.uint64, copy=False)
+
+        if isinstance(buffer, array) and buffer.typecode == "Q":
+            return np.frombuffer(buffer, dtype=np.uint64)
+
+        if isinstance(buffer, _BUFFER_TYPES):
+            frames = np.frombuffer(buffer, dtype=dtype)
+            return frames.astype(np.uint64, copy=False)
+
+        return np.asarray(buffer, dtype=np.uint64)
+
+    if isinstance(buffer, array) and buffer.typecode == "Q":
+        return buffer
+
+    if isinstance(buffer, _BUFFER_TYPES):
+        frames = array("Q", bytes(buffer))
+        if byteorder != sys.byteorder:
+            frames.byteswap()
+
+        return frames
+
+    return array("Q", buffer)
+
+
+def _Column(frames: FrameArray, offset: int, mask: int, dtype: str) -> Any:
+    if np is not None:
+        return ((frames >> np.uint64(offset)) & np.uint64(mask)).astype(dtype)
+
+    return array(_TYPECODES[dtype], [(frame >> offset) & mask for frame in frames])
+
+
+_TYPECODES = {"u1": "B", "u2": "H", "u4": "L", "u8": "Q"}
+
+
+def _SplitColumn(
+    group_frames: Sequence[FrameArray],
+    parts: Sequence[Tuple[int, int, int, int]],
+    dtype: str,
+) -> Any:
+    """Column of a field split over the frames of a group."""
+    if np is not None:
+        column = np.zeros(len(group_frames[0]), dtype=dtype)
+        for i, offset, mask, shift in parts:
+            part = _Column(group_frames[i], offset, mask, dtype)
+            column |= part << np.array(shift, dtype=dtype)
+
+        return column
+
+    column = [0] * len(group_frames[0])
+    for i, offset, mask, shift in parts:
+        column = [
+            c | (((frame >> offset) & mask) << shift)
+            for c, frame in zip(column, group_frames[i])
+        ]
+
+    return array(_TYPECODES[dtype], column)
+
+
+def _GeneralColumns(frames: FrameArray) -> ColumnsType:
+    return {
+        name: _Column(frames, offset, mask, dtype)
+        for name, offset, mask, dtype in _GENERAL_COLUMNS
+    }
+
+
+def _GroupColumns(
+    frames: FrameArray,
+    split_columns: Sequence[Tuple[str, Sequence[Tuple[int, int, int, int]], str]],
+) -> ColumnsType:
+    """Columns of groups of 3 frames, one row per group."""
+    if len(frames) % 3 != 0:
+        raise ValueError(
+            f"Length of frames must be a multiple of 3, but got {len(frames)}"
+        )
+
+    group_frames = [frames[i::3] for i in range(3)]
+    columns: ColumnsType = {}
+
+    for name, offset, mask, dtype in _GENERAL_COLUMNS[:-1]:
+        columns[name] = _Column(group_frames[0], offset, mask, dtype)
+
+    payload_offset, payload_mask, payload_dtype = _GENERAL_COLUMNS[-1][1:]
+    for i, _frames in enumerate(group_frames):
+        columns[f"payload{i + 1}"] = _Column(
+            _frames, payload_offset, payload_mask, payload_dtype
+        )
+
+    for name, parts, dtype in split_columns:
+        columns[name] = _SplitColumn(group_frames, parts, dtype)
+
+    return columns
+
+
+def _DecodeSingles(frames: FrameArray, data: FrameArray) -> ColumnsType:
+    """Single frames, e.g. test-in & work frames."""
+    return _GeneralColumns(frames)
+
+
+def _DecodeSeedGroups(frames: FrameArray, data: FrameArray) -> ColumnsType:
+    """Groups of 3 frames of the random seed."""
+    return _GroupColumns(frames, (_RANDOM_SEED_COLUMN,))
+
+
+def _DecodeParamRegGroups(frames: FrameArray, data: FrameArray) -> ColumnsType:
+    """Groups of 3 frames of the parameters reg."""
+    return _GroupColumns(frames, _PARAM_REG_COLUMNS)
+
+
+def _DecodeStartups(frames: FrameArray, data: FrameArray) -> ColumnsType:
+    """Startup frames of the data packages without data, e.g. test-in type III/IV."""
+    columns = _GeneralColumns(frames)
+
+    for name, offset, mask, dtype in _PACKAGE_COLUMNS:
+        columns[name] = _Column(frames, offset, mask, dtype)
+
+    return columns
+
+
+def _DecodePackages(frames: FrameArray, data: FrameArray) -> ColumnsType:
+    """Data packages. One row per package, with the data frames of all packages in \
+        'data' and the index of the first data frame of every package in 'data_start'.
+    """
+    columns = _DecodeStartups(frames, data)
+    counts = columns["count"]
+
+    if np is not None:
+        columns["data_start"] = np.cumsum(counts, dtype=np.uint64) - counts
+    else:
+        data_start, start = array("Q"), 0
+        for count in counts:
+            data_start.append(start)
+            start += count
+
+        columns["data_start"] = data_start
+
+    columns["data"] = data
+
+    return columns
+
+
+_StreamDecoderType = Callable[[FrameArray, FrameArray], ColumnsType]
+
+# Bulk decoders of the frames in a stream, indexed by the 4-bit header.
+_STREAM_DECODERS: Tuple[_StreamDecoderType, ...] = (
+    _DecodeSeedGroups,  # CONFIG_TYPE1
+    _DecodeParamRegGroups,  # CONFIG_TYPE2
+    _DecodePackages,  # CONFIG_TYPE3
+    _DecodePackages,  # CONFIG_TYPE4
+    _DecodeSeedGroups,  # TEST_TYPE1, test-out
+    _DecodeParamRegGroups,  # TEST_TYPE2, test-out
+    _DecodePackages,  # TEST_TYPE3, test-out
+    _DecodePackages,  # TEST_TYPE4, test-out
+    _DecodeSingles,  # WORK_TYPE1
+    _DecodeSingles,  # WORK_TYPE2
+    _DecodeSingles,  # WORK_TYPE3
+    _DecodeSingles,  # WORK_TYPE4
+)
+
+# Same as `_STREAM_DECODERS`, but the test frames are test-in frames.
+_TESTIN_STREAM_DECODERS: Tuple[_StreamDecoderType, ...] = (
+    _STREAM_DECODERS[:4]
+    + (_DecodeSingles, _DecodeSingles, _DecodeStartups, _DecodeStartups)
+    + _STREAM_DECODERS[8:]
+)
+
+
+def _PackageHeaders(testin: bool = False) -> Set[int]:
+    """Headers of the startup frames of the data packages, see `decode_stream`."""
+    decoders = _TESTIN_STREAM_DECODERS if testin else _STREAM_DECODERS
+
+    return {h for h, decoder in enumerate(decoders) if decoder is _DecodePackages}
+
+
+def _PackageDataOwners(
+    frames: FrameArray, headers: Any, package_headers: Set[int], partial: bool = False
+) -> Any:
+    """Header of the package owning every frame, or -1 if it's not a data frame.
+
+    The data frames are raw 64-bit data, so the stream is walked from one startup \
+        frame to the next. Only the startup frames are visited.
+
+    Arguments:
+        - partial: whether the last package may be cut at the end of the frames, \
+            e.g. in a block of a longer stream. Otherwise, it's an error.
+    """
+    n = len(frames)
+    count_mask = FM.GENERAL_PACKAGE_COUNT_MASK
+
+    if np is not None:
+        is_package = np.zeros(FM.GENERAL_HEADER_MASK + 1, dtype=np.bool_)
+        is_package[list(package_headers)] = True
+        starts = np.flatnonzero(is_package[headers])
+        owners = np.full(n, -1, dtype=np.int8)
+    else:
+        starts = [i for i, h in enumerate(headers) if h in package_headers]
+        owners = array("b", [-1]) * n
+
+    i = 0
+    while i < len(starts):
+        start = int(starts[i])
+        end = start + 1 + (int(frames[start]) & count_mask)
+        if end > n:
+            if not partial:
+                raise ValueError(
+                    f"Data package at frame #{start} is truncated, "
+                    f"{end - n} frames missing"
+                )
+
+            end = n
+
+        if np is not None:
+            owners[start + 1 : end] = headers[start]
+            i = int(np.searchsorted(starts, end))
+        else:
+            owners[start + 1 : end] = array("b", [headers[start]]) * (end - start - 1)
+            i = bisect.bisect_left(starts, end)
+
+    return owners
+
+
 class FrameDecoder:
-    """Frame decoder"""
-
-    def __init__(self) -> None:
-        self.groups_len: int
-        self._frame: int
-        self._frames_group: Tuple[int, ...]
-
-        # Total attributes dictionary
-        self._attr_dict: Dict[str, Any] = {}
-
-        # For general attributes:
-        self._general_attr: Dict[str, Union[FST, Coord]] = {
-            "sub_type": FST.CONFIG_TYPE2,
-            "chip_coord": Coord(0, 0),
-            "core_coord": Coord(0, 0),
-            "core_star_coord": Coord(0, 0),
-        }
+    """Frame decoder.
 
-        # For type II attributes
-        self._param_reg_dict: Dict[str, Union[int, bool, Coord]] = {
-            "weight_width": 0,
-            "LCN": 0,
-            "input_width": 0,
-            "spike_width": 0,
-            "neuron_num": 0,
-            "pool_max": True,
-            "tick_wait_start": 0,
-            "tick_wait_end": 0,
-            "SNN_EN": 0,
-            "target_LCN": 0,
-            "test_chip_coord": Coord(0, 0),
-        }
+    Stateless: the decoding methods are pure functions of their input frames and \
+        return fresh read-only results, so an instance can be shared across threads. \
+        Use `format` to dump the results in human-readable form.
+    """
 
-    def decode(self, frames: Union[int, List[int], Tuple[int, ...]]) -> Dict[str, Any]:
+    def decode(
+        self, frames: Union[int, List[int], Tuple[int, ...]]
+    ) -> Mapping[str, Any]:
         """Call for decoding a frame or a valid group of frames.
 
-        Support single frame decoding & a group of 3 frames only.
+        - config/test-out type I & II: a group of 3 frames.
+        - config/test-out type III & IV: a data package, the startup frame & data frames.
+        - test-in & work frames: a single frame. A single startup frame is decoded too.
+
+        Returns:
+            - a read-only mapping of the general attributes, and the parameters reg \
+                for a group of config type II frames.
         """
         if isinstance(frames, int):
-            self.groups_len = 1
-            self._frame = frames
+            frames_group: Tuple[int, ...] = (frames,)
+        else:
+            frames_group = tuple(frames)
+
+        return MappingProxyType(FrameDecoder._decode(frames_group))
+
+    @staticmethod
+    def decode_many(
+        buffer: Any,
+        *,
+        grouped: bool = False,
+        structured: bool = False,
+        byteorder: str = "big",
+    ) -> Union[ColumnsType, "np.ndarray"]:
+        """Decode a buffer of frames in bulk, one vectorized pass per field.
+
+        Arguments:
+            - buffer: an array of frames or raw bytes, see `as_frames`.
+            - grouped: whether the frames are groups of 3 config type II frames. \
+                If true, one row per group with the fields of the parameters reg.
+            - structured: whether to return a NumPy structured array instead of columns.
+            - byteorder: the byte order of raw bytes.
+
+        Returns:
+            - a dict of columns, `sub_type`, `chip_addr`, `core_addr`, `core_star_addr` \
+                & `payload`. The payloads of the groups are in `payload1` ~ `payload3`.
+            If `structured` is true, a structured array with the same fields.
+        """
+        if structured and np is None:
+            raise NotImplementedError("Structured output requires NumPy")
+
+        frames = as_frames(buffer, byteorder)
+
+        if not grouped:
+            columns = _GeneralColumns(frames)
+        else:
+            columns = _GroupColumns(frames, _PARAM_REG_COLUMNS)
+
+        if not structured:
+            return columns
+
+        decoded = np.empty(
+            len(next(iter(columns.values()))),
+            dtype=[(name, column.dtype) for name, column in columns.items()],
+        )
+        for name, column in columns.items():
+            decoded[name] = column
+
+        return decoded
+
+    @staticmethod
+    def decode_stream(
+        buffer: Any, *, testin: bool = False, byteorder: str = "big"
+    ) -> Dict[FST, ColumnsType]:
+        """Decode a stream of frames of mixed sub-types in bulk, split by sub-type.
+
+        The frames of every sub-type are decoded with the bulk decoder of its header:
+
+        - config/test type I: groups of 3 frames of the random seed, `random_seed`.
+        - config/test type II: groups of 3 frames of the parameters reg, same as \
+            `decode_many` with 'grouped'.
+        - config/test type III/IV: data packages. The startup frame fields \
+            `sram_start_addr`, `package_type` & `count`, and the data frames in `data`, \
+            of which `data_start` is the index of the first one of every package.
+        - work frames: single frames, same as `decode_many`.
+
+        Arguments:
+            - buffer: an array of frames or raw bytes, see `as_frames`.
+            - testin: whether the test frames are test-in frames instead of test-out \
+                frames. Test-in frames are single frames, and the test-in type III/IV \
+                frames are startup frames without data.
+            - byteorder: the byte order of raw bytes.
+
+        Returns:
+            - the columns of every sub-type in the stream.
+        """
+        frames = as_frames(buffer, byteorder)
+        decoders = _TESTIN_STREAM_DECODERS if testin else _STREAM_DECODERS
+
+        headers = _Column(
+            frames, FM.GENERAL_HEADER_OFFSET, FM.GENERAL_HEADER_MASK, "u1"
+        )
+        owners = _PackageDataOwners(frames, headers, _PackageHeaders(testin))
+
+        if np is not None:
+            is_frame = owners < 0
+            present = np.unique(headers[is_frame]).tolist()
         else:
-            assert len(frames) == 3
-            self.groups_len = len(frames)
-            self._frame = frames[0]
-            self._frames_group = tuple(frames)
-
-        self._decode()
-        return self._attr_dict
-
-    def _get_subtype(self) -> FST:
-        _header: int = (
-            self._frame >> FM.GENERAL_HEADER_OFFSET
-        ) & FM.GENERAL_HEADER_MASK
+            present = sorted({h for h, o in zip(headers, owners) if o < 0})
+
+        decoded: Dict[FST, ColumnsType] = {}
+
+        for header in present:
+            if header >= len(decoders):
+                raise TypeError(f"Frame header {header} is illigal!")
+
+            if np is not None:
+                _frames = frames[is_frame & (headers == header)]
+                data = frames[owners == header]
+            else:
+                _frames = array(
+                    "Q",
+                    (
+                        f
+                        for f, h, o in zip(frames, headers, owners)
+                        if h == header and o < 0
+                    ),
+                )
+                data = array("Q", (f for f, o in zip(frames, owners) if o == header))
+
+            decoded[FST(header)] = decoders[header](_frames, data)
+
+        return decoded
+
+    @staticmethod
+    def save_npz(
+        save_path: Union[str, Path],
+        decoded: Union[ColumnsType, "np.ndarray"],
+        compressed: bool = False,
+    ) -> None:
+        """Save the output of `decode_many` into a '.npz' file, one array per column.
+
+        Load it back with `numpy.load`.
+        """
+        if np is None:
+            raise NotImplementedError("Saving into npz file requires NumPy")
+
+        if isinstance(decoded, np.ndarray):
+            columns = {name: decoded[name] for name in decoded.dtype.names}
+        else:
+            columns = {name: np.asarray(column) for name, column in decoded.items()}
+
+        _save = np.savez_compressed if compressed else np.savez
+        _save(Path(save_path), **columns)
+
+    @staticmethod
+    def _get_subtype(frame: int) -> FST:
+        _header: int = (frame >> FM.GENERAL_HEADER_OFFSET) & FM.GENERAL_HEADER_MASK
         try:
             _subtype = FST(_header)
             return _subtype
         except:
             raise TypeError(f"Frame header {_header} is illigal!")
 
-    def _get_type(self) -> FT:
-        _subtype_v: int = self._get_subtype().value
+    @staticmethod
+    def _get_type(frame: int) -> FT:
+        _subtype_v: int = FrameDecoder._get_subtype(frame).value
 
         if _subtype_v < 0b0100:
             _type = FT.FRAME_CONFIG
@@ -258,173 +1107,255 @@ class FrameDecoder:
 
         return _type
 
-    def _get_chip_coord(self) -> Coord:
+    @staticmethod
+    def _get_chip_coord(frame: int) -> Coord:
         _chip_addr: int = (
-            self._frame >> FM.GENERAL_CHIP_ADDR_OFFSET
+            frame >> FM.GENERAL_CHIP_ADDR_OFFSET
         ) & FM.GENERAL_CHIP_ADDR_MASK
 
         return Addr2Coord(_chip_addr)
 
-    def _get_core_coord(self) -> Coord:
+    @staticmethod
+    def _get_core_coord(frame: int) -> Coord:
         _core_addr: int = (
-            self._frame >> FM.GENERAL_CORE_ADDR_OFFSET
+            frame >> FM.GENERAL_CORE_ADDR_OFFSET
         ) & FM.GENERAL_CORE_ADDR_MASK
 
         return Addr2Coord(_core_addr)
 
-    def _get_core_star_coord(self) -> Coord:
+    @staticmethod
+    def _get_core_star_coord(frame: int) -> Coord:
         _core_star_addr: int = (
-            self._frame >> FM.GENERAL_CORE_STAR_ADDR_OFFSET
+            frame >> FM.GENERAL_CORE_STAR_ADDR_OFFSET
         ) & FM.GENERAL_CORE_STAR_ADDR_MASK
 
         return Addr2Coord(_core_star_addr)
 
-    def _get_payload(self) -> Union[List[int], int]:
-        if self.groups_len == 1:
-            _payload = (
-                self._frame >> FM.GENERAL_PAYLOAD_OFFSET
-            ) & FM.GENERAL_PAYLOAD_MASK
-        else:
-            _payload = []
-            for frame in self._frames_group:
-                _payload.append(
-                    (frame >> FM.GENERAL_PAYLOAD_OFFSET) & FM.GENERAL_PAYLOAD_MASK
-                )
+    @staticmethod
+    def _get_payload(frames_group: Tuple[int, ...]) -> Union[Tuple[int, ...], int]:
+        _payloads = tuple(
+            (frame >> FM.GENERAL_PAYLOAD_OFFSET) & FM.GENERAL_PAYLOAD_MASK
+            for frame in frames_group
+        )
 
-        self._payload = _payload
+        return _payloads[0] if len(_payloads) == 1 else _payloads
 
-        return _payload
+    @staticmethod
+    def _decode(frames_group: Tuple[int, ...]) -> Dict[str, Any]:
+        frame = frames_group[0]
+        subtype = FrameDecoder._get_subtype(frame)
+
+        attr_dict: Dict[str, Any] = {
+            "sub_type": subtype,
+            "chip_coord": FrameDecoder._get_chip_coord(frame),
+            "core_coord": FrameDecoder._get_core_coord(frame),
+            "core_star_coord": FrameDecoder._get_core_star_coord(frame),
+        }
 
-    def _decode(self) -> None:
-        subtype = self._get_subtype()
-        self._general_attr["sub_type"] = subtype
-        self._general_attr["chip_coord"] = self._get_chip_coord()
-        self._general_attr["core_coord"] = self._get_core_coord()
-        self._general_attr["core_star_coord"] = self._get_core_star_coord()
+        decoder = getattr(FrameDecoder, FrameDecoder._DECODERS[subtype.value])
+        attr_dict.update(decoder(frames_group))
+
+        return attr_dict
+
+    # Decoders of every sub-type, indexed by the 4-bit header.
+    _DECODERS: Tuple[str, ...] = (
+        "_decode_config1",
+        "_decode_config2",
+        "_decode_package",
+        "_decode_package",
+        "_decode_test1",
+        "_decode_test2",
+        "_decode_package",
+        "_decode_package",
+        "_decode_work",
+        "_decode_work",
+        "_decode_work",
+        "_decode_work",
+    )
 
-        if subtype == FST.CONFIG_TYPE2:
-            self._decode_config2()
-            self._attr_dict = {**self._general_attr, **self._param_reg_dict}
-        else:
-            raise NotImplementedError
+    @staticmethod
+    def _ensure_group(frames_group: Tuple[int, ...]) -> None:
+        if len(frames_group) != 3:
+            raise ValueError(
+                f"Support a group of 3 frames only, but got {len(frames_group)}"
+            )
 
-        self._info(subtype)
+    @staticmethod
+    def _decode_config1(frames_group: Tuple[int, ...]) -> Dict[str, Any]:
+        FrameDecoder._ensure_group(frames_group)
 
-    def _decode_config1(self) -> None:
-        pass
+        return FrameDecoder._random_seed_parse(frames_group)
 
-    def _decode_config2(self) -> None:
-        self._param_reg_parse()
+    @staticmethod
+    def _decode_config2(frames_group: Tuple[int, ...]) -> Dict[str, Any]:
+        FrameDecoder._ensure_group(frames_group)
 
-    def _decode_testout1(self) -> None:
-        pass
+        return FrameDecoder._param_reg_parse(frames_group)
 
-    def _decode_testout2(self) -> None:
-        pass
+    @staticmethod
+    def _decode_test1(frames_group: Tuple[int, ...]) -> Dict[str, Any]:
+        """Test-in type I frame, or the group of test-out type I frames."""
+        if len(frames_group) == 1:
+            return {"payload": FrameDecoder._get_payload(frames_group)}
+
+        return FrameDecoder._decode_config1(frames_group)
 
-    def _decode_testin1(self) -> None:
-        pass
+    @staticmethod
+    def _decode_test2(frames_group: Tuple[int, ...]) -> Dict[str, Any]:
+        """Test-in type II frame, or the group of test-out type II frames."""
+        if len(frames_group) == 1:
+            return {"payload": FrameDecoder._get_payload(frames_group)}
 
-    def _decode_testin2(self) -> None:
-        pass
+        return FrameDecoder._decode_config2(frames_group)
 
-    def _info(self, subtype: FST) -> None:
-        self._general_info()
+    @staticmethod
+    def _decode_package(frames: Tuple[int, ...]) -> Dict[str, Any]:
+        """Data package of type III/IV, or the startup frame only."""
+        startup = frames[0]
+        attr_dict: Dict[str, Any] = {
+            name: (startup >> offset) & mask
+            for name, offset, mask, _ in _PACKAGE_COLUMNS
+        }
+
+        if len(frames) > 1:
+            if len(frames) != 1 + attr_dict["count"]:
+                raise ValueError(
+                    f"Data package of {attr_dict['count']} frames, but got {len(frames) - 1}"
+                )
 
-        if subtype is FST.CONFIG_TYPE2:
-            return self._config2_info()
+            attr_dict["data"] = frames[1:]
+
+        return attr_dict
+
+    @staticmethod
+    def _decode_work(frames_group: Tuple[int, ...]) -> Dict[str, Any]:
+        if len(frames_group) != 1:
+            raise ValueError("Work frames must be decoded one by one")
+
+        return {"payload": FrameDecoder._get_payload(frames_group)}
+
+    @staticmethod
+    def format(decoded: Mapping[str, Any], frame: Optional[int] = None) -> str:
+        """Human-readable dump of the output of `decode`.
+
+        Arguments:
+            - decoded: the output of `decode`.
+            - frame: the (first) frame decoded, to be shown in the title.
+        """
+        lines = FrameDecoder._general_info(decoded, frame)
+
+        if "test_chip_coord" in decoded:
+            lines += FrameDecoder._config2_info(decoded)
         else:
-            raise NotImplementedError
+            lines += FrameDecoder._fields_info(decoded)
 
-    def _general_info(self) -> None:
-        print("General info of frame: 0x%x" % self._frame)
-        print("#1  Frame type:         %s" % self._get_subtype())
+        return "\n".join(lines)
 
-        chip_coord = self._get_chip_coord()
-        print(
-            "#2  Chip coordinate:    [0x%02x | 0x%02x]" % (chip_coord.x, chip_coord.y)
-        )
+    @staticmethod
+    def _fields_info(decoded: Mapping[str, Any]) -> List[str]:
+        names = [
+            name
+            for name in decoded
+            if name not in ("sub_type", "chip_coord", "core_coord", "core_star_coord")
+        ]
+        lines = ["Info of fields"] if names else []
+
+        for i, name in enumerate(names, 1):
+            value = decoded[name]
+            if isinstance(value, tuple):
+                value_str = "%d frames" % len(value)
+            else:
+                value_str = "0x%x" % value
 
-        core_coord = self._get_core_coord()
-        print(
-            "#3  Core coordinate:    [0x%02x | 0x%02x]" % (core_coord.x, core_coord.y)
-        )
+            lines.append("%-3s %-19s %s" % ("#%d" % i, name + ":", value_str))
+
+        return lines
 
-        core_star_coord = self._get_core_star_coord()
-        print(
+    @staticmethod
+    def _general_info(decoded: Mapping[str, Any], frame: Optional[int]) -> List[str]:
+        chip_coord = decoded["chip_coord"]
+        core_coord = decoded["core_coord"]
+        core_star_coord = decoded["core_star_coord"]
+
+        return [
+            "General info of frame" + ("" if frame is None else ": 0x%x" % frame),
+            "#1  Frame type:         %s" % decoded["sub_type"],
+            "#2  Chip coordinate:    [0x%02x | 0x%02x]" % (chip_coord.x, chip_coord.y),
+            "#3  Core coordinate:    [0x%02x | 0x%02x]" % (core_coord.x, core_coord.y),
             "#4  Core* coordinate:   [0x%02x | 0x%02x]"
-            % (core_star_coord.x, core_star_coord.y)
-        )
+            % (core_star_coord.x, core_star_coord.y),
+        ]
 
-    def _config2_info(self) -> None:
-        print("Info of parameter registers")
-        print("#1  Weight width:       0x%x" % self._param_reg_dict["weight_width"])
-        print("#2  LCN:                0x%x" % self._param_reg_dict["LCN"])
-        print("#3  Input width:        0x%x" % self._param_reg_dict["input_width"])
-        print("#4  Spike width:        0x%x" % self._param_reg_dict["spike_width"])
-        print("#5  Neuron num:         %d" % self._param_reg_dict["neuron_num"])
-        print("#6  Pool max enable:    %d" % self._param_reg_dict["pool_max"])
-        print("#7  Tick wait start:    0x%x" % self._param_reg_dict["tick_wait_start"])
-        print("#8  Tick wait end:      0x%x" % self._param_reg_dict["tick_wait_end"])
-        print("#9  SNN enable:         %d" % self._param_reg_dict["SNN_EN"])
-        print("#10 Target LCN:         0x%x" % self._param_reg_dict["target_LCN"])
-
-        test_chip_coord: Coord = self._param_reg_dict["test_chip_coord"] # type: ignore
-        print(
+    @staticmethod
+    def _config2_info(decoded: Mapping[str, Any]) -> List[str]:
+        test_chip_coord: Coord = decoded["test_chip_coord"]
+
+        return [
+            "Info of parameter registers",
+            "#1  Weight width:       0x%x" % decoded["weight_width"],
+            "#2  LCN:                0x%x" % decoded["LCN"],
+            "#3  Input width:        0x%x" % decoded["input_width"],
+            "#4  Spike width:        0x%x" % decoded["spike_width"],
+            "#5  Neuron num:         %d" % decoded["neuron_num"],
+            "#6  Pool max enable:    %d" % decoded["pool_max"],
+            "#7  Tick wait start:    0x%x" % decoded["tick_wait_start"],
+            "#8  Tick wait end:      0x%x" % decoded["tick_wait_end"],
+            "#9  SNN enable:         %d" % decoded["SNN_EN"],
+            "#10 Target LCN:         0x%x" % decoded["target_LCN"],
             "#11 Test chip coord:    [0x%02x | 0x%02x]"
-            % (test_chip_coord.x, test_chip_coord.y)
-        )
+            % (test_chip_coord.x, test_chip_coord.y),
+        ]
+
+    @staticmethod
+    def _random_seed_parse(frames_group: Tuple[int, ...]) -> Dict[str, Any]:
+        frame1, frame2, frame3 = frames_group
+
+        high30 = (frame1 >> RFM.SEED_HIGH30_OFFSET) & RFM.SEED_HIGH30_MASK
+        mid30 = (frame2 >> RFM.SEED_MID30_OFFSET) & RFM.SEED_MID30_MASK
+        low4 = (frame3 >> RFM.SEED_LOW4_OFFSET) & RFM.SEED_LOW4_MASK
+
+        return {
+            "random_seed": (high30 << RFM.SEED_HIGH30_COMBINATION_OFFSET)
+            | (mid30 << RFM.SEED_MID30_COMBINATION_OFFSET)
+            | low4
+        }
 
-    def _test2_info(self) -> None:
-        pass
-
-    def _param_reg_parse(self) -> None:
-        self._param_reg_dict["weight_width"] = (
-            self._frames_group[0] >> CFM.WEIGHT_WIDTH_OFFSET
-        ) & CFM.WEIGHT_WIDTH_MASK
-        self._param_reg_dict["LCN"] = (
-            self._frames_group[0] >> CFM.LCN_OFFSET
-        ) & CFM.LCN_MASK
-        self._param_reg_dict["input_width"] = (
-            self._frames_group[0] >> CFM.INPUT_WIDTH_OFFSET
-        ) & CFM.INPUT_WIDTH_MASK
-        self._param_reg_dict["spike_width"] = (
-            self._frames_group[0] >> CFM.SPIKE_WIDTH_OFFSET
-        ) & CFM.SPIKE_WIDTH_MASK
-        self._param_reg_dict["neuron_num"] = (
-            self._frames_group[0] >> CFM.NEURON_NUM_OFFSET
-        ) & CFM.NEURON_NUM_MASK
-        self._param_reg_dict["pool_max"] = (
-            self._frames_group[0] >> CFM.POOL_MAX_OFFSET
-        ) & CFM.POOL_MAX_MASK
+    @staticmethod
+    def _param_reg_parse(frames_group: Tuple[int, ...]) -> Dict[str, Any]:
+        frame1, frame2, frame3 = frames_group
 
         tick_wait_high8 = (
-            self._frames_group[0] >> CFM.TICK_WAIT_START_HIGH8_OFFSET
+            frame1 >> CFM.TICK_WAIT_START_HIGH8_OFFSET
         ) & CFM.TICK_WAIT_START_HIGH8_MASK
         tick_wait_low7 = (
-            self._frames_group[1] >> CFM.TICK_WAIT_START_LOW7_OFFSET
+            frame2 >> CFM.TICK_WAIT_START_LOW7_OFFSET
         ) & CFM.TICK_WAIT_START_LOW7_MASK
-        self._param_reg_dict["tick_wait_start"] = (
-            tick_wait_high8 << CFM.TICK_WAIT_START_COMBINATION_OFFSET
-        ) | tick_wait_low7
-
-        self._param_reg_dict["tick_wait_end"] = (
-            self._frames_group[1] >> CFM.TICK_WAIT_END_OFFSET
-        ) & CFM.TICK_WAIT_END_MASK
-        self._param_reg_dict["SNN_EN"] = (
-            self._frames_group[1] >> CFM.SNN_EN_OFFSET
-        ) & CFM.SNN_EN_MASK
-        self._param_reg_dict["target_LCN"] = (
-            self._frames_group[1] >> CFM.TARGET_LCN_OFFSET
-        ) & CFM.TARGET_LCN_MASK
-
-        high3 = self._frames_group[1] >> CFM.TEST_CHIP_ADDR_HIGH3_OFFSET
-        low7 = self._frames_group[2] >> CFM.TEST_CHIP_ADDR_LOW7_OFFSET
-        self._param_reg_dict["test_chip_coord"] = test_chip_addr_combine(high3, low7)
-
-    def _decode_direction(self) -> Direction:
-        test_chip_coord: Coord = self._param_reg_dict["test_chip_coord"] # type: ignore
-        offset = test_chip_coord - self._get_chip_coord()
+
+        high3 = frame2 >> CFM.TEST_CHIP_ADDR_HIGH3_OFFSET
+        low7 = frame3 >> CFM.TEST_CHIP_ADDR_LOW7_OFFSET
+
+        return {
+            "weight_width": (frame1 >> CFM.WEIGHT_WIDTH_OFFSET) & CFM.WEIGHT_WIDTH_MASK,
+            "LCN": (frame1 >> CFM.LCN_OFFSET) & CFM.LCN_MASK,
+            "input_width": (frame1 >> CFM.INPUT_WIDTH_OFFSET) & CFM.INPUT_WIDTH_MASK,
+            "spike_width": (frame1 >> CFM.SPIKE_WIDTH_OFFSET) & CFM.SPIKE_WIDTH_MASK,
+            "neuron_num": (frame1 >> CFM.NEURON_NUM_OFFSET) & CFM.NEURON_NUM_MASK,
+            "pool_max": (frame1 >> CFM.POOL_MAX_OFFSET) & CFM.POOL_MAX_MASK,
+            "tick_wait_start": (
+                tick_wait_high8 << CFM.TICK_WAIT_START_COMBINATION_OFFSET
+            )
+            | tick_wait_low7,
+            "tick_wait_end": (frame2 >> CFM.TICK_WAIT_END_OFFSET)
+            & CFM.TICK_WAIT_END_MASK,
+            "SNN_EN": (frame2 >> CFM.SNN_EN_OFFSET) & CFM.SNN_EN_MASK,
+            "target_LCN": (frame2 >> CFM.TARGET_LCN_OFFSET) & CFM.TARGET_LCN_MASK,
+            "test_chip_coord": test_chip_addr_combine(high3, low7),
+        }
+
+    @staticmethod
+    def decode_direction(decoded: Mapping[str, Any]) -> Direction:
+        """Direction of the test chip relative to the chip, from the output of `decode`."""
+        offset = decoded["test_chip_coord"] - decoded["chip_coord"]
 
         try:
             direction = Direction(offset)
@@ -0,0 +1,594 @@
+"""Reading & writing frames files.
+
+- '.bin': 8 bytes per frame, in big or little-endian.
+- '.txt': a frame per line, 64 characters of '0' or '1', MSB first.
+"""
+
+import itertools
+import os
+import queue
+import sys
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .frame import FrameArray
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Default number of frames in a chunk of `iter_frames`, 8MiB of '.bin' file.
+DEFAULT_CHUNK_FRAMES = 1 << 20
+
+_FRAME_BYTES = 8
+_FRAME_BITS = 64
+
+
+def _ensure_suffix(path: Path) -> str:
+    _suffix = path.suffix
+
+    if _suffix != ".bin" and _suffix != ".txt":
+        raise NotImplementedError(f"File with suffix {_suffix} is not supported!")
+
+    return _suffix
+
+
+def _ensure_size(path: Path, size: int) -> None:
+    if size % _FRAME_BYTES != 0:
+        raise ValueError(
+            f"Size of {path} is {size} bytes, not a multiple of {_FRAME_BYTES}"
+        )
+
+
+def _ensure_appendable(path: Path, suffix: str) -> None:
+    """Check the file to append to ends with a complete frame, if it exists."""
+    if not path.exists():
+        return
+
+    size = path.stat().st_size
+
+    if suffix == ".bin":
+        _ensure_size(path, size)
+    elif size > 0:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                raise ValueError(f"{path} does not end with a complete line")
+
+
+def _bin_dtype(byteorder: str) -> str:
+    assert byteorder in ["little", "big"]
+
+    return ">u8" if byteorder == "big" else "<u8"
+
+
+def _from_bytes(data: bytes, byteorder: str) -> array:
+    frames = array("Q", data)
+    if byteorder != sys.byteorder:
+        frames.byteswap()
+
+    return frames
+
+
+def _parse_txt_lines(lines: bytes) -> FrameArray:
+    """Parse the lines of '.txt' file.
+
+    If the lines are in the fixed width of 64 characters plus the line ending, \
+        they are parsed as a 2D array of characters and packed into bytes in one pass.
+    """
+    if np is not None:
+        _lines = lines if lines.endswith(b"\n") else lines + b"\n"
+        width = _lines.find(b"\n") + 1
+        eol = b"\n" if width == _FRAME_BITS + 1 else b"\r\n"
+
+        if width - len(eol) == _FRAME_BITS and len(_lines) % width == 0:
+            chars = np.frombuffer(_lines, dtype=np.uint8).reshape(-1, width)
+            bits = chars[:, :_FRAME_BITS] - np.uint8(ord("0"))
+
+            if (bits <= 1).all() and (
+                chars[:, _FRAME_BITS:] == np.frombuffer(eol, dtype=np.uint8)
+            ).all():
+                packed = np.packbits(bits, axis=1)
+                return packed.view(">u8").ravel().astype(np.uint64)
+
+    frames = [int(line, 2) for line in lines.split()]
+
+    if np is not None:
+        return np.array(frames, dtype=np.uint64)
+
+    return array("Q", frames)
+
+
+def load_frames(load_path: Union[str, Path], byteorder: str = "big") -> FrameArray:
+    """Load frames from a '.bin' or '.txt' file.
+
+    '.bin' files are memory-mapped into a read-only `numpy.memmap` of 'uint64' in \
+        'byteorder', without reading or copying the file. Byte-swapping, if any, is \
+        done by NumPy when the frames are computed with. Without NumPy, the file is \
+        read into an `array.array('Q')`.
+
+    Arguments:
+        - load_path: the path of the file.
+        - byteorder: the byte order of '.bin' file. Ignored for '.txt' file.
+    """
+    _path = Path(load_path)
+    _suffix = _ensure_suffix(_path)
+
+    if _suffix == ".txt":
+        return _parse_txt_lines(_path.read_bytes())
+
+    dtype = _bin_dtype(byteorder)
+    size = _path.stat().st_size
+    _ensure_size(_path, size)
+
+    if np is not None:
+        if size == 0:
+            return np.zeros(0, dtype=dtype)
+
+        return np.memmap(_path, dtype=dtype, mode="r")
+
+    return _from_bytes(_path.read_bytes(), byteorder)
+
+
+def iter_frames(
+    load_path: Union[str, Path],
+    byteorder: str = "big",
+    chunk_size: int = DEFAULT_CHUNK_FRAMES,
+) -> Iterator[FrameArray]:
+    """Load frames from a '.bin' or '.txt' file chunk by chunk, for files bigger \
+        than memory.
+
+    Arguments:
+        - chunk_size: the number of frames in a chunk. The last one may be shorter.
+        - Others are the same as `load_frames`.
+
+    Yields:
+        - chunks of frames, in `uint64` arrays of the native byte order.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+
+    _path = Path(load_path)
+    _suffix = _ensure_suffix(_path)
+
+    if _suffix == ".txt":
+        with open(_path, "rb") as f:
+            while True:
+                lines = b"".join(itertools.islice(f, chunk_size))
+                if not lines:
+                    return
+
+                yield _parse_txt_lines(lines)
+
+    dtype = _bin_dtype(byteorder)
+    _ensure_size(_path, _path.stat().st_size)
+
+    with open(_path, "rb") as f:
+        while True:
+            data = f.read(chunk_size * _FRAME_BYTES)
+            if not data:
+                return
+
+            if np is not None:
+                yield np.frombuffer(data, dtype=dtype).astype(np.uint64)
+            else:
+                yield _from_bytes(data, byteorder)
+
+
+# '0'/'1' characters of every byte value, MSB first.
+_BYTE_BITS = tuple(format(b, "08b").encode() for b in range(256))
+
+
+def frames_to_bytes(frames: Sequence[int], byteorder: str = "big") -> bytes:
+    """Serialize frames into '.bin' format in one buffer."""
+    dtype = _bin_dtype(byteorder)
+
+    if np is not None:
+        return np.asarray(frames, dtype=np.uint64).astype(dtype, copy=False).tobytes()
+
+    _frames = frames if isinstance(frames, array) else array("Q", frames)
+    if byteorder != sys.byteorder:
+        _frames = array("Q", _frames)
+        _frames.byteswap()
+
+    return _frames.tobytes()
+
+
+def frames_to_txt(frames: Sequence[int]) -> bytes:
+    """Serialize frames into '.txt' format in one buffer.
+
+    With NumPy, the bits of all frames are unpacked into a 2D array of characters. \
+        Otherwise, every byte is looked up in a table of its 8 characters.
+    """
+    if np is not None:
+        _frames = np.asarray(frames, dtype=np.uint64).astype(">u8", copy=False)
+        bits = np.unpackbits(_frames.view(np.uint8).reshape(-1, _FRAME_BYTES), axis=1)
+
+        chars = np.empty((len(_frames), _FRAME_BITS + 1), dtype=np.uint8)
+        chars[:, :_FRAME_BITS] = bits + np.uint8(ord("0"))
+        chars[:, _FRAME_BITS] = ord("\n")
+
+        return chars.tobytes()
+
+    data = frames_to_bytes(frames, "big")
+    table = _BYTE_BITS
+
+    return b"".join(
+        b"".join(table[b] for b in data[i : i + _FRAME_BYTES]) + b"\n"
+        for i in range(0, len(data), _FRAME_BYTES)
+    )
+
+
+def _iter_chunks(
+    frames: Union[int, Sequence[int], Iterable[int]], chunk_size: Optional[int]
+) -> Iterator[Sequence[int]]:
+    if isinstance(frames, int):
+        yield [frames]
+        return
+
+    if hasattr(frames, "__len__") and hasattr(frames, "__getitem__"):
+        n = len(frames)  # type: ignore
+        if chunk_size is None or n <= chunk_size:
+            yield frames  # type: ignore
+        else:
+            for i in range(0, n, chunk_size):
+                yield frames[i : i + chunk_size]  # type: ignore
+
+        return
+
+    # Iterator of frames, consumed chunk by chunk.
+    it = iter(frames)
+    while True:
+        chunk = list(itertools.islice(it, chunk_size or DEFAULT_CHUNK_FRAMES))
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def save_frames(
+    save_path: Union[str, Path],
+    frames: Union[int, Sequence[int], Iterable[int]],
+    byteorder: str = "big",
+    chunk_size: Optional[int] = None,
+    append: bool = False,
+) -> None:
+    """Write frames into a '.bin' or '.txt' file, one `write` per chunk.
+
+    Arguments:
+        - frames: a single frame, a sequence or array of frames, or an iterator of \
+            frames consumed chunk by chunk.
+        - byteorder: the byte order of '.bin' file. '.txt' file is always MSB first.
+        - chunk_size: the number of frames serialized at a time. If not specified, \
+            a sequence of frames is serialized at once.
+        - append: append to the file if it exists, otherwise truncate it. See \
+            `FrameWriter` to append incrementally.
+    """
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+
+    _path = Path(save_path)
+    _suffix = _ensure_suffix(_path)
+    _bin_dtype(byteorder)
+
+    if append:
+        _ensure_appendable(_path, _suffix)
+
+    with open(_path, "ab" if append else "wb") as f:
+        for chunk in _iter_chunks(frames, chunk_size):
+            if _suffix == ".bin":
+                f.write(frames_to_bytes(chunk, byteorder))
+            else:
+                f.write(frames_to_txt(chunk))
+
+
+class BackgroundWriter:
+    """Write chunks of frames into files in a background thread.
+
+    Every `put` takes one chunk per file. The chunks wait in a bounded queue, so the \
+        producer is blocked when the writer falls behind. The frames are written into \
+        temporary '.part' files, which are renamed to the final paths by `close` only \
+        if everything is written, and removed otherwise.
+
+    Use it as a context manager, which closes it on success and aborts it on error.
+    """
+
+    # Seconds to wait for the queue before checking the writer thread again.
+    _POLL_INTERVAL = 0.1
+
+    def __init__(
+        self,
+        save_paths: Sequence[Union[str, Path]],
+        byteorder: str = "big",
+        max_pending: int = 4,
+    ) -> None:
+        """
+        Arguments:
+            - save_paths: the '.bin' or '.txt' files.
+            - byteorder: the byte order of '.bin' files.
+            - max_pending: the max number of `put` waiting to be written.
+        """
+        if max_pending < 1:
+            raise ValueError("max_pending must be positive")
+
+        self._paths = [Path(path) for path in save_paths]
+        self._suffixes = [_ensure_suffix(path) for path in self._paths]
+        self._tmp_paths = [path.with_name(path.name + ".part") for path in self._paths]
+        self._byteorder = byteorder
+        _bin_dtype(byteorder)
+
+        self._queue: "queue.Queue[Optional[Tuple[Sequence[int], ...]]]" = queue.Queue(
+            max_pending
+        )
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+        self._thread = threading.Thread(
+            target=self._run, name="paitest-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            files = [open(tmp_path, "wb") for tmp_path in self._tmp_paths]
+            try:
+                while True:
+                    chunks = self._queue.get()
+                    if chunks is None:
+                        return
+
+                    for f, suffix, chunk in zip(files, self._suffixes, chunks):
+                        if suffix == ".bin":
+                            f.write(frames_to_bytes(chunk, self._byteorder))
+                        else:
+                            f.write(frames_to_txt(chunk))
+            finally:
+                for f in files:
+                    f.close()
+
+        except BaseException as e:
+            self._error = e
+
+    def _put(self, item: Optional[Tuple[Sequence[int], ...]]) -> None:
+        while True:
+            if not self._thread.is_alive():
+                raise RuntimeError("Writer is stopped") from self._error
+
+            try:
+                self._queue.put(item, timeout=self._POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def put(self, *chunks: Sequence[int]) -> None:
+        """Queue one chunk of frames per file. Block while the queue is full."""
+        if self._closed:
+            raise RuntimeError("Writer is closed")
+
+        if len(chunks) != len(self._paths):
+            raise ValueError(
+                f"{len(self._paths)} chunks expected, but got {len(chunks)}"
+            )
+
+        self._put(chunks)
+
+    def close(self) -> None:
+        """Wait for all chunks to be written, then rename the files to the final paths."""
+        if self._closed:
+            return
+
+        self._closed = True
+
+        if self._thread.is_alive():
+            self._put(None)
+            self._thread.join()
+
+        if self._error is not None:
+            self._remove_tmp_files()
+            raise RuntimeError("Failed to write frames") from self._error
+
+        for tmp_path, path in zip(self._tmp_paths, self._paths):
+            os.replace(tmp_path, path)
+
+    def abort(self) -> None:
+        """Drop the chunks not written yet and remove the temporary files."""
+        if self._closed:
+            return
+
+        self._closed = True
+
+        # Make room for the stop signal.
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+        if self._thread.is_alive():
+            self._put(None)
+            self._thread.join()
+
+        self._remove_tmp_files()
+
+    def _remove_tmp_files(self) -> None:
+        for tmp_path in self._tmp_paths:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def __enter__(self) -> "BackgroundWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class FrameWriter:
+    """Write frames into a '.bin' or '.txt' file incrementally, e.g. in a capture loop.
+
+    The frames are buffered and written every 'buffer_size' frames. The file is \
+        flushed to the disk by `flush`, by `close`, and by the policy:
+
+    - every 'flush_frames' frames, if specified.
+    - every 'flush_interval' seconds, checked when frames are added, if specified.
+
+    Use it as a context manager, which writes the buffered frames & closes the file \
+        on exit, even on error.
+
+    Examples:
+    >>> with FrameWriter("./capture.bin", append=True, flush_interval=10) as writer:
+    ...     for chunk in capture():
+    ...         writer.extend(chunk)
+    """
+
+    def __init__(
+        self,
+        save_path: Union[str, Path],
+        byteorder: str = "big",
+        *,
+        append: bool = False,
+        buffer_size: int = DEFAULT_CHUNK_FRAMES,
+        flush_frames: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        fsync: bool = True,
+    ) -> None:
+        """
+        Arguments:
+            - save_path: the '.bin' or '.txt' file.
+            - byteorder: the byte order of '.bin' file. '.txt' file is always MSB first.
+            - append: append to the file if it exists, otherwise truncate it.
+            - buffer_size: the max number of frames buffered before written.
+            - flush_frames: flush the file every this many frames.
+            - flush_interval: flush the file every this many seconds.
+            - fsync: whether a flush also syncs the file to the disk by `os.fsync`.
+        """
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be positive")
+
+        if flush_frames is not None and flush_frames < 1:
+            raise ValueError("flush_frames must be positive")
+
+        if flush_interval is not None and flush_interval <= 0:
+            raise ValueError("flush_interval must be positive")
+
+        self._path = Path(save_path)
+        self._suffix = _ensure_suffix(self._path)
+        self._byteorder = byteorder
+        _bin_dtype(byteorder)
+
+        if append:
+            _ensure_appendable(self._path, self._suffix)
+
+        self._buffer_size = buffer_size
+        self._flush_frames = flush_frames
+        self._flush_interval = flush_interval
+        self._fsync = fsync
+
+        # Serialized chunks, and the single frames not serialized yet.
+        self._chunks: List[bytes] = []
+        self._frames: List[int] = []
+        self._n_buffered = 0
+        self._n_unflushed = 0
+        self._n_written = 0
+        self._last_flush = time.monotonic()
+
+        self._file: Optional[BinaryIO] = open(self._path, "ab" if append else "wb")
+
+    @property
+    def n_written(self) -> int:
+        """Number of frames added by this writer, buffered ones included."""
+        return self._n_written
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    def _ensure_open(self) -> None:
+        if self._file is None:
+            raise RuntimeError("Writer is closed")
+
+    def append(self, frame: int) -> None:
+        """Add a frame."""
+        self._ensure_open()
+        self._frames.append(frame)
+        self._added(1)
+
+    def extend(self, frames: Union[Sequence[int], Iterable[int]]) -> None:
+        """Add a sequence or array of frames, or an iterator of frames."""
+        self._ensure_open()
+        for chunk in _iter_chunks(frames, self._buffer_size):
+            self._serialize_frames()
+            # Serialized right now, so the caller can reuse its buffer.
+            self._chunks.append(self._serialize(chunk))
+            self._added(len(chunk))
+
+    def _serialize(self, frames: Sequence[int]) -> bytes:
+        if self._suffix == ".bin":
+            return frames_to_bytes(frames, self._byteorder)
+
+        return frames_to_txt(frames)
+
+    def _serialize_frames(self) -> None:
+        if self._frames:
+            self._chunks.append(self._serialize(self._frames))
+            self._frames = []
+
+    def _added(self, n: int) -> None:
+        self._n_buffered += n
+        self._n_unflushed += n
+        self._n_written += n
+
+        if self._flush_frames is not None and self._n_unflushed >= self._flush_frames:
+            self.flush()
+        elif (
+            self._flush_interval is not None
+            and time.monotonic() - self._last_flush >= self._flush_interval
+        ):
+            self.flush()
+        elif self._n_buffered >= self._buffer_size:
+            self._write()
+
+    def _write(self) -> None:
+        """Write the buffered frames into the file."""
+        self._serialize_frames()
+
+        assert self._file is not None
+        self._file.write(b"".join(self._chunks))
+
+        self._chunks = []
+        self._n_buffered = 0
+
+    def flush(self) -> None:
+        """Write the buffered frames and flush the file, synced to the disk if 'fsync'."""
+        self._ensure_open()
+        self._write()
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+
+        self._n_unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Flush the file and close it."""
+        if self._file is None:
+            return
+
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "FrameWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -158,6 +158,24 @@ class ConfigFrameMask(FrameMask):
     TEST_CHIP_ADDR_LOW7_MASK = (1 << 7) - 1
 
 
+class RandomSeedFrameMask(FrameMask):
+    """Specific for Configuration/Test Frame Type I, a 64-bit random seed in 3 frames"""
+
+    """Frame #1"""
+    SEED_HIGH30_OFFSET = 0
+    SEED_HIGH30_MASK = (1 << 30) - 1
+    SEED_HIGH30_COMBINATION_OFFSET = 34
+
+    """Frame #2"""
+    SEED_MID30_OFFSET = 0
+    SEED_MID30_MASK = (1 << 30) - 1
+    SEED_MID30_COMBINATION_OFFSET = 4
+
+    """Frame #3"""
+    SEED_LOW4_OFFSET = 26
+    SEED_LOW4_MASK = (1 << 4) - 1
+
+
 @unique
 class WeightPrecisionType(IntEnum):
     """Weight precision of crossbar. 2-bit.
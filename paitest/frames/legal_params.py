@@ -0,0 +1,296 @@
+"""Legal parameters reg of Configuration Frame Type II.
+
+The legal combinations of the core modes are enumerated once into a table. \
+    Every row is (weight_width, LCN, input_width, spike_width, SNN_EN, pool_max, \
+    max neuron_num). A legal parameters reg is sampled from 2 random 64-bit words:
+
+- word #1, bits [0, 32): row of the table.
+- word #1, bits [32, 64): neuron_num, 1 <= neuron_num <= max neuron_num of the row.
+- word #2, bits [0, 15): tick_wait_start.
+- word #2, bits [15, 30): tick_wait_end.
+- word #2, bits [30, 46): target_LCN.
+"""
+
+import itertools
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+from .frame_params import ConfigFrameMask as CFM
+from .frame_params import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Max number of dendrites of a core, in SNN/BANN mode(1-bit input) & ANN mode(8-bit
+# input).
+N_DENDRITE_MAX_SNN = 512
+N_DENDRITE_MAX_ANN = 4096
+
+TICK_WAIT_MAX = (1 << 15) - 1
+
+ModeType = Tuple[int, int, int, int, int, int, int]
+
+
+def _IsLegalMode(
+    weight_width: int,
+    lcn: int,
+    input_width: int,
+    spike_width: int,
+    snn_en: int,
+    pool_max: int,
+) -> bool:
+    """Constraints between the modes of a core.
+
+    - SNN mode takes 1-bit spikes as input only.
+    - Max pooling is only valid for 8-bit activations input.
+    """
+    if snn_en and input_width == InputWidthFormatType.WIDTH_8BIT.value:
+        return False
+
+    if pool_max and input_width != InputWidthFormatType.WIDTH_8BIT.value:
+        return False
+
+    return True
+
+
+def _NeuronNumMax(weight_width: int, lcn: int, input_width: int) -> int:
+    """Every neuron takes 2^weight_width * 2^LCN dendrites."""
+    if input_width == InputWidthFormatType.WIDTH_8BIT.value:
+        n_dendrite_max = N_DENDRITE_MAX_ANN
+    else:
+        n_dendrite_max = N_DENDRITE_MAX_SNN
+
+    return n_dendrite_max >> (weight_width + lcn)
+
+
+def _BuildModesTable() -> List[ModeType]:
+    table: List[ModeType] = []
+
+    for ww, lcn, iw, sw, snn_en, pool_max in itertools.product(
+        range(WeightPrecisionType.WEIGHT_WIDTH_MAX),
+        range(LCNExtensionType.LCN_MAX),
+        (t.value for t in InputWidthFormatType),
+        (t.value for t in SpikeWidthFormatType),
+        (0, 1),
+        (0, 1),
+    ):
+        if _IsLegalMode(ww, lcn, iw, sw, snn_en, pool_max):
+            neuron_num_max = _NeuronNumMax(ww, lcn, iw)
+            table.append((ww, lcn, iw, sw, snn_en, pool_max, neuron_num_max))
+
+    return table
+
+
+LEGAL_MODES: Tuple[ModeType, ...] = tuple(_BuildModesTable())
+
+
+@lru_cache(maxsize=None)
+def _FilterModes(
+    weight_width: Optional[int] = None,
+    lcn: Optional[int] = None,
+    input_width: Optional[int] = None,
+    spike_width: Optional[int] = None,
+    snn_en: Optional[int] = None,
+    pool_max: Optional[int] = None,
+    neuron_num: Optional[int] = None,
+) -> Tuple[ModeType, ...]:
+    """Rows of the table matching the fixed fields."""
+    fixed = (weight_width, lcn, input_width, spike_width, snn_en, pool_max)
+
+    modes = tuple(
+        mode
+        for mode in LEGAL_MODES
+        if all(f is None or f == m for f, m in zip(fixed, mode))
+        and (neuron_num is None or 1 <= neuron_num <= mode[6])
+    )
+
+    if not modes:
+        raise ValueError("No legal parameters reg for the fixed fields")
+
+    return modes
+
+
+def _Value(field: Any) -> Optional[int]:
+    if field is None:
+        return None
+
+    return int(getattr(field, "value", field))
+
+
+def FilterModes(
+    *,
+    weight_width_type: Optional[WeightPrecisionType] = None,
+    lcn_type: Optional[LCNExtensionType] = None,
+    input_width_type: Optional[InputWidthFormatType] = None,
+    spike_width_type: Optional[SpikeWidthFormatType] = None,
+    neuron_num: Optional[int] = None,
+    pool_max_en: Optional[bool] = None,
+    snn_en: Optional[bool] = None,
+    **kwargs: Any,
+) -> Tuple[ModeType, ...]:
+    """Rows of the legal modes table matching the fixed fields. Unknown fields are ignored."""
+    return _FilterModes(
+        _Value(weight_width_type),
+        _Value(lcn_type),
+        _Value(input_width_type),
+        _Value(spike_width_type),
+        _Value(snn_en),
+        _Value(pool_max_en),
+        neuron_num,
+    )
+
+
+def PackParamReg(
+    weight_width: int,
+    lcn: int,
+    input_width: int,
+    spike_width: int,
+    neuron_num: int,
+    pool_max: int,
+    tick_wait_start: int,
+    tick_wait_end: int,
+    snn_en: int,
+    target_lcn: int,
+    test_chip_addr: int,
+) -> Tuple[int, ...]:
+    """Pack the fields into the 3 payloads of the parameters reg."""
+    tws_high8 = (
+        tick_wait_start >> CFM.TICK_WAIT_START_COMBINATION_OFFSET
+    ) & CFM.TICK_WAIT_START_HIGH8_MASK
+    tws_low7 = tick_wait_start & CFM.TICK_WAIT_START_LOW7_MASK
+    high3 = (
+        test_chip_addr >> CFM.TEST_CHIP_ADDR_COMBINATION_OFFSET
+    ) & CFM.TEST_CHIP_ADDR_HIGH3_MASK
+    low7 = test_chip_addr & CFM.TEST_CHIP_ADDR_LOW7_MASK
+
+    return (
+        ((weight_width & CFM.WEIGHT_WIDTH_MASK) << CFM.WEIGHT_WIDTH_OFFSET)
+        | ((lcn & CFM.LCN_MASK) << CFM.LCN_OFFSET)
+        | ((input_width & CFM.INPUT_WIDTH_MASK) << CFM.INPUT_WIDTH_OFFSET)
+        | ((spike_width & CFM.SPIKE_WIDTH_MASK) << CFM.SPIKE_WIDTH_OFFSET)
+        | ((neuron_num & CFM.NEURON_NUM_MASK) << CFM.NEURON_NUM_OFFSET)
+        | ((pool_max & CFM.POOL_MAX_MASK) << CFM.POOL_MAX_OFFSET)
+        | (tws_high8 << CFM.TICK_WAIT_START_HIGH8_OFFSET),
+        (tws_low7 << CFM.TICK_WAIT_START_LOW7_OFFSET)
+        | ((tick_wait_end & CFM.TICK_WAIT_END_MASK) << CFM.TICK_WAIT_END_OFFSET)
+        | ((snn_en & CFM.SNN_EN_MASK) << CFM.SNN_EN_OFFSET)
+        | ((target_lcn & CFM.TARGET_LCN_MASK) << CFM.TARGET_LCN_OFFSET)
+        | (high3 << CFM.TEST_CHIP_ADDR_HIGH3_OFFSET),
+        low7 << CFM.TEST_CHIP_ADDR_LOW7_OFFSET,
+    )
+
+
+def GenLegalParamReg(
+    word1: int, word2: int, test_chip_addr: int, **fixed: Any
+) -> Tuple[int, ...]:
+    """Sample a legal parameters reg from 2 random 64-bit words.
+
+    Arguments:
+        - fixed: the fields to fix, same as the keyword arguments of `FrameGen._GenParamReg`.
+    """
+    modes = FilterModes(**fixed)
+    ww, lcn, iw, sw, snn_en, pool_max, neuron_num_max = modes[
+        (word1 & 0xFFFFFFFF) % len(modes)
+    ]
+
+    neuron_num = fixed.get("neuron_num")
+    if neuron_num is None:
+        neuron_num = 1 + (word1 >> 32) % neuron_num_max
+
+    tick_wait_start = fixed.get("tick_wait_start")
+    if tick_wait_start is None:
+        tick_wait_start = word2 & TICK_WAIT_MAX
+
+    tick_wait_end = fixed.get("tick_wait_end")
+    if tick_wait_end is None:
+        tick_wait_end = (word2 >> 15) & TICK_WAIT_MAX
+
+    target_lcn = fixed.get("target_lcn")
+    if target_lcn is None:
+        target_lcn = ((word2 >> 30) & 0xFFFF) % LCNExtensionType.LCN_MAX
+
+    return PackParamReg(
+        ww,
+        lcn,
+        iw,
+        sw,
+        neuron_num,
+        pool_max,
+        tick_wait_start,
+        tick_wait_end,
+        snn_en,
+        target_lcn,
+        test_chip_addr,
+    )
+
+
+def GenLegalParamRegsBatch(
+    words1: "np.ndarray", words2: "np.ndarray", test_chip_addr: int, **fixed: Any
+) -> "np.ndarray":
+    """Batch version of `GenLegalParamReg` on `uint64` arrays. NumPy is required.
+
+    Returns:
+        - the 3 parameters reg of every group in order, as payloads of a `uint64` array.
+    """
+    table = np.array(FilterModes(**fixed), dtype=np.uint64)
+    rows = table[(words1 & np.uint64(0xFFFFFFFF)) % np.uint64(len(table))]
+
+    def _field(name: str, random_field: "np.ndarray") -> "np.ndarray":
+        value = fixed.get(name)
+        if value is None:
+            return random_field
+
+        return np.full_like(random_field, value)
+
+    neuron_num = _field(
+        "neuron_num", np.uint64(1) + (words1 >> np.uint64(32)) % rows[:, 6]
+    )
+    tick_wait_start = _field("tick_wait_start", words2 & np.uint64(TICK_WAIT_MAX))
+    tick_wait_end = _field(
+        "tick_wait_end", (words2 >> np.uint64(15)) & np.uint64(TICK_WAIT_MAX)
+    )
+    target_lcn = _field(
+        "target_lcn",
+        ((words2 >> np.uint64(30)) & np.uint64(0xFFFF))
+        % np.uint64(LCNExtensionType.LCN_MAX),
+    )
+
+    def _shift(field: "np.ndarray", mask: int, offset: int) -> "np.ndarray":
+        return (field & np.uint64(mask)) << np.uint64(offset)
+
+    high3 = (
+        test_chip_addr >> CFM.TEST_CHIP_ADDR_COMBINATION_OFFSET
+    ) & CFM.TEST_CHIP_ADDR_HIGH3_MASK
+    low7 = test_chip_addr & CFM.TEST_CHIP_ADDR_LOW7_MASK
+
+    payloads = np.empty((len(words1), 3), dtype=np.uint64)
+    payloads[:, 0] = (
+        _shift(rows[:, 0], CFM.WEIGHT_WIDTH_MASK, CFM.WEIGHT_WIDTH_OFFSET)
+        | _shift(rows[:, 1], CFM.LCN_MASK, CFM.LCN_OFFSET)
+        | _shift(rows[:, 2], CFM.INPUT_WIDTH_MASK, CFM.INPUT_WIDTH_OFFSET)
+        | _shift(rows[:, 3], CFM.SPIKE_WIDTH_MASK, CFM.SPIKE_WIDTH_OFFSET)
+        | _shift(neuron_num, CFM.NEURON_NUM_MASK, CFM.NEURON_NUM_OFFSET)
+        | _shift(rows[:, 5], CFM.POOL_MAX_MASK, CFM.POOL_MAX_OFFSET)
+        | _shift(
+            tick_wait_start >> np.uint64(CFM.TICK_WAIT_START_COMBINATION_OFFSET),
+            CFM.TICK_WAIT_START_HIGH8_MASK,
+            CFM.TICK_WAIT_START_HIGH8_OFFSET,
+        )
+    )
+    payloads[:, 1] = (
+        _shift(
+            tick_wait_start,
+            CFM.TICK_WAIT_START_LOW7_MASK,
+            CFM.TICK_WAIT_START_LOW7_OFFSET,
+        )
+        | _shift(tick_wait_end, CFM.TICK_WAIT_END_MASK, CFM.TICK_WAIT_END_OFFSET)
+        | _shift(rows[:, 4], CFM.SNN_EN_MASK, CFM.SNN_EN_OFFSET)
+        | _shift(target_lcn, CFM.TARGET_LCN_MASK, CFM.TARGET_LCN_OFFSET)
+        | np.uint64(high3 << CFM.TEST_CHIP_ADDR_HIGH3_OFFSET)
+    )
+    payloads[:, 2] = low7 << CFM.TEST_CHIP_ADDR_LOW7_OFFSET
+
+    return payloads.ravel()
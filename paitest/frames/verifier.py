@@ -0,0 +1,721 @@
+"""Compare the actual test-out frames from the chip with the expected ones.
+
+The frames are matched by core address, so the groups of different cores can arrive \
+    in any order. The frames of a core are matched in order: the k-th frame of a core \
+    in the actual frames is compared with the k-th one in the expected frames, and its \
+    position in the group is k % 3.
+"""
+
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .core_demux import N_CORE_ADDRS, CoreDemux, _RunRanks
+from .expected import CompactTestOut
+from .frame import _GENERAL_COLUMNS, _PARAM_REG_COLUMNS, FrameArray, as_frames
+from .frame_io import DEFAULT_CHUNK_FRAMES
+from .frame_params import FrameMask as FM
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Frames of a group.
+_GROUP_FRAMES = 3
+
+_RANK_BITS = 32
+
+
+def _FieldMasks() -> Tuple[Tuple[Tuple[str, int], ...], ...]:
+    """(field name, 64-bit mask) of the frames at each position of a group.
+
+    The core address is not included, since the frames are matched by it. The payload \
+        bits of no field are in 'reserved'.
+    """
+    general = tuple(
+        (name, mask << offset)
+        for name, offset, mask, _ in _GENERAL_COLUMNS
+        if name not in ("core_addr", "payload")
+    )
+
+    masks = []
+    for i in range(_GROUP_FRAMES):
+        fields: Dict[str, int] = {}
+        for name, parts, _ in _PARAM_REG_COLUMNS:
+            for j, offset, mask, _ in parts:
+                if j == i:
+                    fields[name] = fields.get(name, 0) | (mask << offset)
+
+        reserved = FM.GENERAL_PAYLOAD_MASK & ~sum(fields.values())
+        masks.append(general + tuple(fields.items()) + (("reserved", reserved),))
+
+    return tuple(masks)
+
+
+_FIELD_MASKS = _FieldMasks()
+
+# Names of the fields compared, in the order of the frames.
+FIELD_NAMES: Tuple[str, ...] = tuple(
+    dict.fromkeys(name for fields in _FIELD_MASKS for name, _ in fields)
+)
+
+# Don't-care fields of the groups of random parameters, which are not legal \
+#   parameters reg. See `FrameGen._GenParamReg`.
+DONT_CARE_RANDOM = ("tick_wait_start", "reserved")
+
+
+def _PopCount(x: "np.ndarray") -> "np.ndarray":
+    """Number of set bits of every `uint64`."""
+    bitwise_count = getattr(np, "bitwise_count", None)
+    if bitwise_count is not None:
+        return bitwise_count(x)
+
+    bits = np.unpackbits(np.ascontiguousarray(x).view(np.uint8))
+    return bits.reshape(-1, 64).sum(axis=1)
+
+
+class VerifyReport:
+    """Result of `verify`.
+
+    - n_expected, n_actual: number of the expected & actual frames.
+    - n_matched: number of the actual frames equal to the expected ones.
+    - missing: indices of the expected groups with frames not received.
+    - mismatched: indices of the expected groups with frames received but different.
+    - extra: indices of the actual frames not expected, e.g. of an unexpected core, \
+        or more frames of a core than expected.
+    - bit_errors: number of the wrong bits of every field, in the mismatched frames.
+    - mismatched_fields: for every field, indices of the expected groups with it wrong.
+    """
+
+    __slots__ = (
+        "n_expected",
+        "n_actual",
+        "n_matched",
+        "missing",
+        "mismatched",
+        "extra",
+        "bit_errors",
+        "mismatched_fields",
+    )
+
+    def __init__(
+        self,
+        n_expected: int,
+        n_actual: int,
+        n_matched: int,
+        missing: Sequence[int],
+        mismatched: Sequence[int],
+        extra: Sequence[int],
+        bit_errors: Dict[str, int],
+        mismatched_fields: Dict[str, Sequence[int]],
+    ) -> None:
+        self.n_expected = n_expected
+        self.n_actual = n_actual
+        self.n_matched = n_matched
+        self.missing = missing
+        self.mismatched = mismatched
+        self.extra = extra
+        self.bit_errors = bit_errors
+        self.mismatched_fields = mismatched_fields
+
+    @property
+    def ok(self) -> bool:
+        return self.n_matched == self.n_expected == self.n_actual
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    def format(self) -> str:
+        """Human-readable summary."""
+        lines = [
+            f"Expected frames:   {self.n_expected}",
+            f"Actual frames:     {self.n_actual}",
+            f"Matched frames:    {self.n_matched}",
+            f"Missing groups:    {len(self.missing)}",
+            f"Mismatched groups: {len(self.mismatched)}",
+            f"Extra frames:      {len(self.extra)}",
+        ]
+
+        errors = [
+            (name, len(self.mismatched_fields[name]), n)
+            for name, n in self.bit_errors.items()
+            if n > 0
+        ]
+        if errors:
+            lines.append("Mismatched fields:")
+            lines.extend(
+                f"    {name}: {n_groups} group(s), {n} bit(s)"
+                for name, n_groups, n in errors
+            )
+
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return (
+            f"VerifyReport(ok={self.ok}, matched={self.n_matched}/{self.n_expected}, "
+            f"missing={len(self.missing)}, mismatched={len(self.mismatched)}, "
+            f"extra={len(self.extra)})"
+        )
+
+
+def _RankKeys(frames: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """Sort the frames by core address stably.
+
+    Returns:
+        - the sorted keys, (core address << 32) | rank of the frame in its core.
+        - the indices of the frames in the sorted order.
+    """
+    core_addrs = (frames >> np.uint64(FM.GENERAL_CORE_ADDR_OFFSET)) & np.uint64(
+        FM.GENERAL_CORE_ADDR_MASK
+    )
+    # Radix sort of 16-bit keys.
+    order = np.argsort(core_addrs.astype(np.uint16), kind="stable")
+    sorted_addrs = core_addrs[order]
+
+    ranks = _RunRanks(sorted_addrs).astype(np.uint64)
+
+    return (sorted_addrs << np.uint64(_RANK_BITS)) | ranks, order
+
+
+def _MatchArrays(
+    expected: "np.ndarray", actual: "np.ndarray"
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Match the frames by (core address, rank).
+
+    Returns:
+        - indices of the matched expected frames & the actual ones paired with them.
+        - whether every expected frame is matched.
+    """
+    exp_keys, exp_order = _RankKeys(expected)
+    act_keys, act_order = _RankKeys(actual)
+
+    exp_matched = np.zeros(len(expected), dtype=bool)
+    if len(expected) == 0:
+        return exp_order[:0], act_order[:0], exp_matched
+
+    idx = np.minimum(np.searchsorted(exp_keys, act_keys), len(exp_keys) - 1)
+    found = exp_keys[idx] == act_keys
+
+    exp_idx = exp_order[idx[found]]
+    exp_matched[exp_idx] = True
+
+    return exp_idx, act_order[found], exp_matched
+
+
+def _MatchLists(
+    expected: Sequence[int], actual: Sequence[int]
+) -> Tuple[List[int], List[int], List[bool]]:
+    """`_MatchArrays` without NumPy."""
+    offset, mask = FM.GENERAL_CORE_ADDR_OFFSET, FM.GENERAL_CORE_ADDR_MASK
+
+    positions: Dict[int, List[int]] = {}
+    for i, frame in enumerate(expected):
+        positions.setdefault((frame >> offset) & mask, []).append(i)
+
+    ranks: Dict[int, int] = {}
+    exp_idx, act_idx = [], []
+    exp_matched = [False] * len(expected)
+
+    for i, frame in enumerate(actual):
+        core_addr = (frame >> offset) & mask
+        rank = ranks.get(core_addr, 0)
+        ranks[core_addr] = rank + 1
+
+        _positions = positions.get(core_addr, ())
+        if rank < len(_positions):
+            exp_idx.append(_positions[rank])
+            act_idx.append(i)
+            exp_matched[_positions[rank]] = True
+
+    return exp_idx, act_idx, exp_matched
+
+
+def _FieldErrors(diffs: Any, exp_idx: Any) -> Tuple[Dict[str, int], Dict[str, Any]]:
+    """Wrong bits of every field, and the expected groups with the field wrong.
+
+    Arguments:
+        - diffs: the masked XOR diffs of the mismatched frames.
+        - exp_idx: indices of the expected frames of the diffs.
+    """
+    bit_errors: Dict[str, int] = {name: 0 for name in FIELD_NAMES}
+    groups: Dict[str, List[Any]] = {name: [] for name in FIELD_NAMES}
+
+    for i, fields in enumerate(_FIELD_MASKS):
+        if np is not None:
+            at = exp_idx % _GROUP_FRAMES == i
+            _diffs, _groups = diffs[at], exp_idx[at] // _GROUP_FRAMES
+
+            for name, mask in fields:
+                field_diffs = _diffs & np.uint64(mask)
+                bit_errors[name] += int(_PopCount(field_diffs).sum())
+                groups[name].append(_groups[field_diffs != 0])
+        else:
+            for diff, j in zip(diffs, exp_idx):
+                if j % _GROUP_FRAMES != i:
+                    continue
+
+                for name, mask in fields:
+                    if diff & mask:
+                        bit_errors[name] += bin(diff & mask).count("1")
+                        groups[name].append(j // _GROUP_FRAMES)
+
+    if np is not None:
+        mismatched_fields = {
+            name: np.unique(np.concatenate(_groups)) for name, _groups in groups.items()
+        }
+    else:
+        mismatched_fields = {
+            name: array("Q", sorted(set(_groups))) for name, _groups in groups.items()
+        }
+
+    return bit_errors, mismatched_fields
+
+
+def _FieldFrameErrors(
+    diffs: Any, exp_idx: Any
+) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Wrong bits & wrong frames of every field.
+
+    Arguments:
+        - diffs: the masked XOR diffs of the mismatched frames.
+        - exp_idx: indices of the expected frames of the diffs.
+    """
+    bit_errors: Dict[str, int] = {name: 0 for name in FIELD_NAMES}
+    frame_errors: Dict[str, int] = {name: 0 for name in FIELD_NAMES}
+
+    for i, fields in enumerate(_FIELD_MASKS):
+        if np is not None:
+            _diffs = diffs[exp_idx % _GROUP_FRAMES == i]
+
+            for name, mask in fields:
+                field_diffs = _diffs & np.uint64(mask)
+                bit_errors[name] += int(_PopCount(field_diffs).sum())
+                frame_errors[name] += int((field_diffs != 0).sum())
+        else:
+            for diff, j in zip(diffs, exp_idx):
+                if j % _GROUP_FRAMES != i:
+                    continue
+
+                for name, mask in fields:
+                    if diff & mask:
+                        bit_errors[name] += bin(diff & mask).count("1")
+                        frame_errors[name] += 1
+
+    return bit_errors, frame_errors
+
+
+def care_masks(dont_care: Iterable[str] = ()) -> Tuple[int, ...]:
+    """AND masks of the frames at each position of a group, with the bits of the \
+        don't-care fields cleared.
+
+    Arguments:
+        - dont_care: names of the fields not to compare, in `FIELD_NAMES`.
+    """
+    _dont_care = set(dont_care)
+    unknown = _dont_care.difference(FIELD_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    return tuple(
+        FM.GENERAL_MASK & ~sum(mask for name, mask in fields if name in _dont_care)
+        for fields in _FIELD_MASKS
+    )
+
+
+def verify(
+    expected: Union[Sequence[int], FrameArray, CompactTestOut, Any],
+    actual: Union[Sequence[int], FrameArray, Any],
+    byteorder: str = "big",
+    *,
+    dont_care: Iterable[str] = (),
+) -> VerifyReport:
+    """Compare the actual test-out frames with the expected ones.
+
+    The expected frames are indexed by core address & rank of the frame in its core, \
+        and the actual frames are looked up in the index, so the cost is O(n log n).
+
+    Arguments:
+        - expected: the expected test-out frames in the generated order, 3 frames per \
+            group, or a `CompactTestOut`.
+        - actual: the captured test-out frames. Both can be arrays of frames or raw \
+            bytes, e.g. a `mmap` of a '.bin' file or the array of `LoadFrames`.
+        - byteorder: the byte order of raw bytes.
+        - dont_care: names of the fields not to compare, e.g. `DONT_CARE_RANDOM` for \
+            the groups of random parameters. See `care_masks`.
+
+    Returns:
+        - the `VerifyReport`.
+    """
+    masks = care_masks(dont_care)
+
+    if isinstance(expected, CompactTestOut):
+        _expected = expected.to_frames()
+    else:
+        _expected = as_frames(expected, byteorder)
+
+    _actual = as_frames(actual, byteorder)
+
+    if np is not None:
+        exp_idx, act_idx, exp_matched = _MatchArrays(_expected, _actual)
+
+        diffs = _expected[exp_idx] ^ _actual[act_idx]
+        if dont_care:
+            diffs &= np.array(masks, dtype=np.uint64)[exp_idx % _GROUP_FRAMES]
+
+        wrong = diffs != 0
+
+        act_matched = np.zeros(len(_actual), dtype=bool)
+        act_matched[act_idx] = True
+
+        missing = np.unique(np.flatnonzero(~exp_matched) // _GROUP_FRAMES)
+        mismatched = np.unique(exp_idx[wrong] // _GROUP_FRAMES)
+        extra = np.flatnonzero(~act_matched)
+        n_matched = len(exp_idx) - int(wrong.sum())
+        bit_errors, mismatched_fields = _FieldErrors(diffs[wrong], exp_idx[wrong])
+    else:
+        exp_idx, act_idx, exp_matched = _MatchLists(_expected, _actual)
+
+        wrong_idx, diffs = [], []
+        for i, j in zip(exp_idx, act_idx):
+            diff = (_expected[i] ^ _actual[j]) & masks[i % _GROUP_FRAMES]
+            if diff:
+                wrong_idx.append(i)
+                diffs.append(diff)
+
+        _act_matched = set(act_idx)
+
+        missing = array(
+            "Q",
+            sorted({i // _GROUP_FRAMES for i, m in enumerate(exp_matched) if not m}),
+        )
+        mismatched = array("Q", sorted({i // _GROUP_FRAMES for i in wrong_idx}))
+        extra = array("Q", [i for i in range(len(_actual)) if i not in _act_matched])
+        n_matched = len(exp_idx) - len(wrong_idx)
+        bit_errors, mismatched_fields = _FieldErrors(diffs, wrong_idx)
+
+    return VerifyReport(
+        len(_expected),
+        len(_actual),
+        n_matched,
+        missing,
+        mismatched,
+        extra,
+        bit_errors,
+        mismatched_fields,
+    )
+
+
+class StreamVerifier:
+    """Verify the actual test-out frames chunk by chunk, as they arrive.
+
+    The frames are matched like `verify`. Only the counters are kept, not the \
+        actual frames, so the memory is bounded by the expected frames, which are \
+        kept in a `CompactTestOut`.
+
+    The callback 'on_mismatch' is called at the first mismatched or extra frame, \
+        with a dict of:
+
+    - offset: index of the frame in the stream.
+    - group: index of the expected group, `None` for an extra frame.
+    - expected: the expected frame, `None` for an extra frame.
+    - actual: the actual frame.
+    - fields: names of the wrong fields.
+
+    Raise in the callback to abort the run.
+
+    Examples:
+    >>> verifier = StreamVerifier(testout, on_mismatch=abort_run)
+    >>> for data in iter(lambda: pipe.read(1 << 16), b""):
+    ...     verifier.feed(data)
+    >>> verifier.ok, verifier.coverage
+    (True, 1.0)
+    """
+
+    def __init__(
+        self,
+        expected: Union[Sequence[int], FrameArray, CompactTestOut, Any],
+        byteorder: str = "big",
+        *,
+        dont_care: Iterable[str] = (),
+        on_mismatch: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> None:
+        """
+        Arguments:
+            - expected: the expected test-out frames, or a `CompactTestOut`.
+            - byteorder: the byte order of the raw bytes fed.
+            - dont_care: names of the fields not to compare, see `verify`.
+            - on_mismatch: the callback at the first mismatch.
+        """
+        if isinstance(expected, CompactTestOut):
+            self._expected = expected
+        else:
+            self._expected = CompactTestOut.from_frames(expected, byteorder)
+
+        self._byteorder = byteorder
+        self._masks = care_masks(dont_care)
+        self._on_mismatch = on_mismatch
+        self._remainder = b""
+
+        core_addrs = self._expected.core_addrs
+
+        # The k-th frame of a core is matched with its k-th expected frame.
+        self._demux = CoreDemux(core_addrs, 3)
+
+        if np is not None:
+            self._group_addrs = np.asarray(core_addrs, dtype=np.intp)
+            self._last_bad = np.full(N_CORE_ADDRS, -1, dtype=np.int64)
+        else:
+            self._last_bad_list = [-1] * N_CORE_ADDRS
+
+        self.n_received = 0
+        self.n_matched = 0
+        self.n_mismatched = 0
+        self.n_extra = 0
+        # Number of the expected groups with any frame wrong.
+        self.n_mismatched_groups = 0
+        # Wrong bits & wrong frames of every field.
+        self.bit_errors: Dict[str, int] = {name: 0 for name in FIELD_NAMES}
+        self.field_errors: Dict[str, int] = {name: 0 for name in FIELD_NAMES}
+        self.first_mismatch: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_groups(
+        cls,
+        groups: Iterable[Tuple[Any, Any, Any]],
+        byteorder: str = "big",
+        **kwargs: Any,
+    ) -> "StreamVerifier":
+        """Build the expected frames from the (config, testin, testout) groups or \
+            chunks of them, e.g. yielded by the 'Iter*' methods, without keeping the \
+            full frames.
+
+        To check a seeded suite, pass the 'Iter*' method with the same seed & \
+            arguments as the 'Get*' one, which yields the same groups.
+
+        Arguments:
+            - groups: the groups or chunks.
+            - Others are the same as `StreamVerifier`.
+        """
+        stores: List[CompactTestOut] = []
+        # Test-out frames of the single groups, compacted once a chunk is full.
+        pending = array("Q")
+
+        for _, _, testout in groups:
+            if isinstance(testout, tuple):
+                pending.extend(testout)
+                if len(pending) < DEFAULT_CHUNK_FRAMES:
+                    continue
+            elif len(pending) == 0:
+                stores.append(CompactTestOut.from_frames(testout))
+                continue
+            else:
+                pending.extend(as_frames(testout).tolist())
+
+            stores.append(CompactTestOut.from_frames(pending))
+            pending = array("Q")
+
+        if pending:
+            stores.append(CompactTestOut.from_frames(pending))
+
+        if not stores:
+            raise ValueError("No groups")
+
+        return cls(CompactTestOut.concat(stores), byteorder, **kwargs)
+
+    @property
+    def n_expected(self) -> int:
+        return self._expected.n_frames
+
+    @property
+    def n_covered(self) -> int:
+        """Number of the expected frames received."""
+        return self._demux.n_mapped
+
+    @property
+    def coverage(self) -> float:
+        """Ratio of the expected frames received."""
+        return self.n_covered / self.n_expected if self.n_expected else 1.0
+
+    @property
+    def ok(self) -> bool:
+        """No mismatched or extra frames so far."""
+        return self.n_mismatched == 0 and self.n_extra == 0
+
+    @property
+    def done(self) -> bool:
+        """All the expected frames are received."""
+        return self.n_covered == self.n_expected
+
+    def feed(self, frames: Union[Sequence[int], FrameArray, Any]) -> bool:
+        """Verify the next chunk of frames.
+
+        Arguments:
+            - frames: an array of frames, or raw bytes, which can end with a partial \
+                frame, kept until the next chunk.
+
+        Returns:
+            - `ok`.
+        """
+        if isinstance(frames, (bytes, bytearray, memoryview)):
+            data = self._remainder + bytes(frames)
+            n = len(data) - len(data) % 8
+            self._remainder = data[n:]
+            _frames = as_frames(data[:n], self._byteorder)
+        else:
+            _frames = as_frames(frames, self._byteorder)
+
+        if np is not None:
+            self._feed_array(_frames)
+        else:
+            self._feed_list(_frames)
+
+        self.n_received += len(_frames)
+
+        return self.ok
+
+    def feed_stream(self, stream: Any, chunk_size: int = DEFAULT_CHUNK_FRAMES) -> bool:
+        """Feed the raw bytes read from a binary file object, a pipe or a socket \
+            file, until EOF.
+        """
+        while True:
+            data = stream.read(8 * chunk_size)
+            if not data:
+                return self.ok
+
+            self.feed(data)
+
+    def _feed_array(self, frames: "np.ndarray") -> None:
+        core_addrs = (
+            (frames >> np.uint64(FM.GENERAL_CORE_ADDR_OFFSET))
+            & np.uint64(FM.GENERAL_CORE_ADDR_MASK)
+        ).astype(np.intp)
+
+        slots = self._demux.map(core_addrs)
+        expected = slots >= 0
+        offsets = np.flatnonzero(expected)
+        positions = slots[offsets]
+
+        diffs = self._expected.take(positions) ^ frames[offsets]
+        diffs &= np.array(self._masks, dtype=np.uint64)[positions % 3]
+        wrong = diffs != 0
+
+        n_extra = len(frames) - len(offsets)
+        n_wrong = int(wrong.sum())
+        self.n_extra += n_extra
+        self.n_mismatched += n_wrong
+        self.n_matched += len(offsets) - n_wrong
+
+        if n_wrong > 0:
+            self._count_fields(diffs[wrong], positions[wrong])
+
+            # A group may be split over chunks, so count it once per core.
+            groups = np.unique(positions[wrong] // 3)
+            group_addrs = self._group_addrs[groups]
+            new = groups != self._last_bad[group_addrs]
+            self.n_mismatched_groups += int(new.sum())
+            np.maximum.at(self._last_bad, group_addrs, groups)
+
+        if self.first_mismatch is None and (n_wrong > 0 or n_extra > 0):
+            first_wrong = offsets[wrong][0] if n_wrong else len(frames)
+            first_extra = np.flatnonzero(~expected)[0] if n_extra else len(frames)
+
+            if first_wrong < first_extra:
+                i = int(np.searchsorted(offsets, first_wrong))
+                self._mismatch(
+                    int(first_wrong),
+                    int(positions[i]),
+                    int(frames[first_wrong]),
+                    int(diffs[i]),
+                )
+            else:
+                self._mismatch(int(first_extra), None, int(frames[first_extra]), 0)
+
+    def _feed_list(self, frames: Sequence[int]) -> None:
+        offset, mask = FM.GENERAL_CORE_ADDR_OFFSET, FM.GENERAL_CORE_ADDR_MASK
+
+        for i, frame in enumerate(frames):
+            core_addr = (frame >> offset) & mask
+            position = self._demux.map_one(core_addr)
+            if position < 0:
+                self.n_extra += 1
+                if self.first_mismatch is None:
+                    self._mismatch(i, None, frame, 0)
+
+                continue
+
+            diff = (self._expected.take([position])[0] ^ frame) & self._masks[
+                position % 3
+            ]
+            if not diff:
+                self.n_matched += 1
+                continue
+
+            self.n_mismatched += 1
+            self._count_fields([diff], [position])
+
+            group = position // 3
+            if self._last_bad_list[core_addr] != group:
+                self._last_bad_list[core_addr] = group
+                self.n_mismatched_groups += 1
+
+            if self.first_mismatch is None:
+                self._mismatch(i, position, frame, diff)
+
+    def _count_fields(self, diffs: Any, positions: Any) -> None:
+        bit_errors, frame_errors = _FieldFrameErrors(diffs, positions)
+        for name in FIELD_NAMES:
+            self.bit_errors[name] += bit_errors[name]
+            self.field_errors[name] += frame_errors[name]
+
+    def _mismatch(
+        self, offset: int, position: Optional[int], frame: int, diff: int
+    ) -> None:
+        if position is None:
+            group, expected, fields = None, None, ()
+        else:
+            group = position // 3
+            expected = int(self._expected.take([position])[0])
+            fields = tuple(
+                name for name, mask in _FIELD_MASKS[position % 3] if diff & mask
+            )
+
+        self.first_mismatch = {
+            "offset": self.n_received + offset,
+            "group": group,
+            "expected": expected,
+            "actual": frame,
+            "fields": fields,
+        }
+
+        if self._on_mismatch is not None:
+            self._on_mismatch(self.first_mismatch)
+
+    def format(self) -> str:
+        """Human-readable summary of the counters."""
+        lines = [
+            f"Expected frames:   {self.n_expected}",
+            f"Received frames:   {self.n_received}",
+            f"Matched frames:    {self.n_matched}",
+            f"Mismatched frames: {self.n_mismatched}",
+            f"Mismatched groups: {self.n_mismatched_groups}",
+            f"Extra frames:      {self.n_extra}",
+            f"Coverage:          {self.coverage:.2%}",
+        ]
+
+        errors = [(name, n) for name, n in self.field_errors.items() if n > 0]
+        if errors:
+            lines.append("Mismatched fields:")
+            lines.extend(
+                f"    {name}: {n} frame(s), {self.bit_errors[name]} bit(s)"
+                for name, n in errors
+            )
+
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return (
+            f"StreamVerifier(ok={self.ok}, received={self.n_received}, "
+            f"matched={self.n_matched}/{self.n_expected}, "
+            f"mismatched={self.n_mismatched}, extra={self.n_extra})"
+        )
@@ -0,0 +1,311 @@
+"""Routing model of the frames over a mesh of chips.
+
+The chips sit at (x, y), 0 <= x < width & 0 <= y < height, and every chip links to \
+    its neighbors in the 4 `Direction`. A frame goes from its source chip to the chip \
+    address in its header by dimension-order routing: along X then Y ('xy'), or \
+    along Y then X ('yx'). A link is a chip & the direction it sends to.
+
+The model gives the hop counts & the load of every link of a stream of frames, a send \
+    order spreading the frames of the chips over time, and an estimate of the cycles \
+    to deliver a stream.
+"""
+
+from array import array
+from typing import Dict, List, Sequence, Tuple, Union
+
+from .frames.coord import Coord
+from .frames.frame import FrameArray, as_frames
+from .frames.frame_params import Direction
+from .frames.frame_params import FrameMask as FM
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Number of chip addresses, 10 bits.
+_N_CHIP_ADDRS = FM.GENERAL_CHIP_ADDR_MASK + 1
+
+_DIRECTIONS = tuple(Direction)
+
+LinkType = Tuple[Coord, Direction]
+
+
+def _chip_addrs(frames: FrameArray) -> Sequence[int]:
+    """Chip address in the header of every frame."""
+    if np is not None:
+        return (
+            (frames >> np.uint64(FM.GENERAL_CHIP_ADDR_OFFSET))
+            & np.uint64(FM.GENERAL_CHIP_ADDR_MASK)
+        ).astype(np.intp)
+
+    return [
+        (frame >> FM.GENERAL_CHIP_ADDR_OFFSET) & FM.GENERAL_CHIP_ADDR_MASK
+        for frame in frames
+    ]
+
+
+def _as_coord(chip: Union[Coord, Tuple[int, int]]) -> Coord:
+    return chip if isinstance(chip, Coord) else Coord(chip)
+
+
+def _counts(addrs: Sequence[int]) -> List[int]:
+    """Number of the frames to every chip address."""
+    if np is not None:
+        return np.bincount(addrs, minlength=_N_CHIP_ADDRS).tolist()
+
+    counts = [0] * _N_CHIP_ADDRS
+    for addr in addrs:
+        counts[addr] += 1
+
+    return counts
+
+
+class RouteReport:
+    """Result of `ChipMesh.analyze`.
+
+    - n_frames: number of the frames.
+    - total_hops: sum of the hop counts of all frames.
+    - max_hops: the max hop count of a frame.
+    - link_loads: number of the frames over every link used.
+    """
+
+    __slots__ = ("n_frames", "total_hops", "max_hops", "link_loads")
+
+    def __init__(
+        self,
+        n_frames: int,
+        total_hops: int,
+        max_hops: int,
+        link_loads: Dict[LinkType, int],
+    ) -> None:
+        self.n_frames = n_frames
+        self.total_hops = total_hops
+        self.max_hops = max_hops
+        self.link_loads = link_loads
+
+    @property
+    def mean_hops(self) -> float:
+        return self.total_hops / self.n_frames if self.n_frames else 0.0
+
+    @property
+    def max_load(self) -> int:
+        """Load of the busiest link, the lower bound of the cycles of a stream."""
+        return max(self.link_loads.values(), default=0)
+
+    def hot_links(self, n: int = 5) -> List[Tuple[LinkType, int]]:
+        """The 'n' busiest links & their loads."""
+        return sorted(self.link_loads.items(), key=lambda kv: -kv[1])[:n]
+
+    def format(self) -> str:
+        """Human-readable summary."""
+        lines = [
+            f"Frames:     {self.n_frames}",
+            f"Hops:       {self.total_hops} in total, {self.mean_hops:.2f} on average, "
+            f"{self.max_hops} at most",
+            f"Links used: {len(self.link_loads)}",
+            f"Max load:   {self.max_load}",
+        ]
+        lines.extend(
+            f"    {chip} -> {direction.name}: {load}"
+            for (chip, direction), load in self.hot_links()
+        )
+
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return (
+            f"RouteReport(n_frames={self.n_frames}, total_hops={self.total_hops}, "
+            f"max_hops={self.max_hops}, max_load={self.max_load})"
+        )
+
+
+class ChipMesh:
+    """A mesh of chips with dimension-order routing.
+
+    Examples:
+    >>> mesh = ChipMesh(4, 4)
+    >>> mesh.hops(Coord(0, 0), Coord(2, 3))
+    5
+    >>> report = mesh.analyze(config, src=Coord(0, 0))
+    >>> order = mesh.spread_order(config)
+    """
+
+    def __init__(self, width: int, height: int, routing: str = "xy") -> None:
+        """
+        Arguments:
+            - width, height: the size of the mesh, up to 32 chips each side.
+            - routing: 'xy' for X first then Y, or 'yx' for Y first then X.
+        """
+        limit = Coord._COORD_MAX_LIMIT + 1
+        if not (0 < width <= limit and 0 < height <= limit):
+            raise ValueError(f"0 < width, height <= {limit}: ({width}, {height})")
+
+        if routing not in ("xy", "yx"):
+            raise ValueError(f"Routing {routing} is not supported!")
+
+        self.width = width
+        self.height = height
+        self.routing = routing
+
+    def __contains__(self, chip: Coord) -> bool:
+        return chip.x < self.width and chip.y < self.height
+
+    def _ensure_chip(self, chip: Coord) -> None:
+        if chip not in self:
+            raise ValueError(
+                f"Chip {chip} is out of the mesh of {self.width} x {self.height}"
+            )
+
+    def hops(self, src: Coord, dst: Coord) -> int:
+        """Number of the links from 'src' to 'dst'."""
+        return abs(dst.x - src.x) + abs(dst.y - src.y)
+
+    def path(self, src: Coord, dst: Coord) -> List[LinkType]:
+        """The links from 'src' to 'dst' in order."""
+        self._ensure_chip(src)
+        self._ensure_chip(dst)
+
+        x, y = src.x, src.y
+        step_x = Direction.EAST if dst.x > x else Direction.WEST
+        step_y = Direction.SOUTH if dst.y > y else Direction.NORTH
+
+        links: List[LinkType] = []
+
+        def _walk(direction: Direction, n: int) -> None:
+            nonlocal x, y
+            for _ in range(n):
+                links.append((Coord(x, y), direction))
+                x += direction.value.delta_x
+                y += direction.value.delta_y
+
+        if self.routing == "xy":
+            _walk(step_x, abs(dst.x - x))
+            _walk(step_y, abs(dst.y - y))
+        else:
+            _walk(step_y, abs(dst.y - y))
+            _walk(step_x, abs(dst.x - x))
+
+        return links
+
+    def analyze(
+        self, frames: Sequence[int], src: Union[Coord, Tuple[int, int]]
+    ) -> RouteReport:
+        """Hop counts & link loads of the frames sent from 'src' to the chips in \
+            their headers.
+        """
+        _src = _as_coord(src)
+        addrs = _chip_addrs(as_frames(frames))
+
+        total_hops, max_hops = 0, 0
+        link_loads: Dict[LinkType, int] = {}
+
+        # Every path is walked once for all the frames to the chip.
+        for addr, n in enumerate(_counts(addrs)):
+            if n == 0:
+                continue
+
+            links = self.path(_src, Coord.from_address(addr))
+            total_hops += n * len(links)
+            max_hops = max(max_hops, len(links))
+
+            for link in links:
+                link_loads[link] = link_loads.get(link, 0) + n
+
+        return RouteReport(len(addrs), total_hops, max_hops, link_loads)
+
+    def spread_order(self, frames: Sequence[int]) -> Sequence[int]:
+        """A send order of the frames spreading the frames to every chip evenly over \
+            the stream, so the links of the paths are loaded in parallel instead of \
+            one after another. The order of the frames to the same chip is kept.
+
+        The i-th of the n frames to a chip is sent at the virtual time (i + 0.5) / n.
+
+        Returns:
+            - indices of the frames in the order to send.
+        """
+        addrs = _chip_addrs(as_frames(frames))
+        counts = _counts(addrs)
+
+        if np is not None:
+            order = np.argsort(addrs, kind="stable")
+            sorted_addrs = addrs[order]
+            starts = np.concatenate(([0], np.cumsum(counts)))[:-1]
+
+            ranks = np.empty(len(addrs), dtype=np.float64)
+            ranks[order] = np.arange(len(addrs)) - starts[sorted_addrs]
+            times = (ranks + 0.5) / np.asarray(counts, dtype=np.float64)[addrs]
+
+            return np.argsort(times, kind="stable")
+
+        seen = [0] * _N_CHIP_ADDRS
+        times = []
+        for addr in addrs:
+            times.append((seen[addr] + 0.5) / counts[addr])
+            seen[addr] += 1
+
+        return sorted(range(len(times)), key=times.__getitem__)
+
+    def spread(self, frames: Sequence[int]) -> FrameArray:
+        """The frames in the order of `spread_order`."""
+        _frames = as_frames(frames)
+        order = self.spread_order(_frames)
+
+        if np is not None:
+            return _frames[order]
+
+        return array("Q", [_frames[i] for i in order])
+
+    def simulate(
+        self,
+        frames: Sequence[int],
+        src: Union[Coord, Tuple[int, int]],
+        *,
+        inject_rate: float = 1.0,
+        hop_latency: float = 1.0,
+    ) -> float:
+        """Estimate the cycles to deliver the frames, sent from 'src' in order.
+
+        The frames are injected at 'inject_rate' frames per cycle, e.g. more than 1 \
+            if the source sends on several links. Every link sends 1 frame per cycle \
+            in the FIFO order, and a hop takes 'hop_latency' cycles more.
+
+        Returns:
+            - the cycle when the last frame arrives.
+        """
+        if inject_rate <= 0:
+            raise ValueError("inject_rate must be positive")
+
+        _src = _as_coord(src)
+        addrs = _chip_addrs(as_frames(frames))
+        addrs = addrs.tolist() if np is not None else addrs
+
+        # Link indices of the path to every chip, built at the first use.
+        paths: Dict[int, Tuple[int, ...]] = {}
+        link_free: Dict[int, float] = {}
+        n_dirs = len(_DIRECTIONS)
+        interval = 1.0 / inject_rate
+        end = 0.0
+
+        for i, addr in enumerate(addrs):
+            path = paths.get(addr)
+            if path is None:
+                path = tuple(
+                    chip.address * n_dirs + _DIRECTIONS.index(direction)
+                    for chip, direction in self.path(_src, Coord.from_address(addr))
+                )
+                paths[addr] = path
+
+            t = i * interval
+            for link in path:
+                t = max(t, link_free.get(link, 0.0)) + 1.0
+                link_free[link] = t
+                t += hop_latency
+
+            end = max(end, t)
+
+        return end
+
+    def __repr__(self) -> str:
+        return f"ChipMesh({self.width}, {self.height}, routing={self.routing!r})"
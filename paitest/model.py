@@ -0,0 +1,306 @@
+"""Software model of a PAICORE answering the config & test frames of type II.
+
+The model keeps the 3 parameters reg payloads of every core in a (1024, 3) array \
+    indexed by core address. A config frame of type II writes the next payload of its \
+    core, and a test-in frame of type II is answered by the 3 test-out frames of the \
+    payloads, to the test chip address in the parameters reg.
+
+It processes the frames in bulk, and plugs into a `Transport` as the responder of a \
+    `LoopbackBackend`. Faults can be injected into the answers to benchmark the \
+    verifiers.
+"""
+
+import random
+from array import array
+from typing import Optional, Sequence, Tuple, Union
+
+from .frames.coord import Coord
+from .frames.core_demux import FRAME_BYTES, N_CORE_ADDRS
+from .frames.frame import Coord2Addr, FrameArray, FrameGen, as_frames
+from .frames.frame_io import frames_to_bytes
+from .frames.frame_params import ConfigFrameMask as CFM
+from .frames.frame_params import FrameMask as FM
+from .frames.frame_params import FrameSubType as FST
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _TestChipAddr(payload2: int, payload3: int) -> int:
+    """The test chip address in the frame #2 & #3 of the parameters reg."""
+    high3 = payload2 & CFM.TEST_CHIP_ADDR_HIGH3_MASK
+    low7 = (payload3 >> CFM.TEST_CHIP_ADDR_LOW7_OFFSET) & CFM.TEST_CHIP_ADDR_LOW7_MASK
+
+    return (high3 << CFM.TEST_CHIP_ADDR_COMBINATION_OFFSET) | low7
+
+
+class PAICoreModel:
+    """Responder of a PAICORE to the config & test frames of type II.
+
+    Faults injected into the answers:
+
+    - stuck_at_1, stuck_at_0: 64-bit masks of the bits stuck at 1 or 0 in every \
+        test-out frame.
+    - bit_error_rate: the probability of a random payload bit flipped in a frame.
+    - drop_rate: the probability of a test-out frame dropped.
+    - reorder_rate: the probability of a group of test-out frames swapped with the \
+        next one of the same answer.
+
+    Examples:
+    >>> model = PAICoreModel(drop_rate=1e-4, seed=42)
+    >>> transport = Transport(LoopbackBackend(model.respond))
+    """
+
+    def __init__(
+        self,
+        chip_coord: Union[Coord, Tuple[int, int]] = (0, 0),
+        byteorder: str = "big",
+        *,
+        stuck_at_1: int = 0,
+        stuck_at_0: int = 0,
+        bit_error_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        reorder_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Arguments:
+            - chip_coord: the chip address of the model. Frames to other chips are \
+                ignored.
+            - byteorder: the byte order of the raw bytes of `respond`.
+            - seed: the seed of the faults.
+            - Others are the faults, see `PAICoreModel`.
+        """
+        for name, rate in (
+            ("bit_error_rate", bit_error_rate),
+            ("drop_rate", drop_rate),
+            ("reorder_rate", reorder_rate),
+        ):
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError(f"{name} must be in [0, 1]")
+
+        assert byteorder in ["little", "big"]
+
+        self.chip_addr = Coord2Addr(Coord(chip_coord))
+        self.byteorder = byteorder
+        self.stuck_at_1 = stuck_at_1 & FM.GENERAL_MASK
+        self.stuck_at_0 = stuck_at_0 & FM.GENERAL_MASK
+        self.bit_error_rate = bit_error_rate
+        self.drop_rate = drop_rate
+        self.reorder_rate = reorder_rate
+
+        self._remainder = b""
+
+        if np is not None:
+            self._rng = np.random.default_rng(seed)
+            # Parameters reg payloads & number of config frames of every core.
+            self.regs = np.zeros((N_CORE_ADDRS, 3), dtype=np.uint32)
+            self._n_configs = np.zeros(N_CORE_ADDRS, dtype=np.int64)
+        else:
+            self._random = random.Random(seed)
+            self.regs = [array("L", [0, 0, 0]) for _ in range(N_CORE_ADDRS)]
+            self._n_configs_list = [0] * N_CORE_ADDRS
+
+    @property
+    def _faulty(self) -> bool:
+        return bool(
+            self.stuck_at_1
+            or self.stuck_at_0
+            or self.bit_error_rate
+            or self.drop_rate
+            or self.reorder_rate
+        )
+
+    def respond(self, data: bytes) -> bytes:
+        """Answer the raw bytes of frames. A partial frame at the end is kept until \
+            the next call.
+        """
+        data = self._remainder + data
+        size = len(data) - len(data) % FRAME_BYTES
+        self._remainder = data[size:]
+
+        out = self.process(as_frames(data[:size], self.byteorder))
+
+        return frames_to_bytes(out, self.byteorder)
+
+    def process(self, frames: Sequence[int]) -> FrameArray:
+        """Process the frames in order, and return the test-out frames answered."""
+        _frames = as_frames(frames)
+
+        if np is not None:
+            out = self._process_array(_frames)
+        else:
+            out = self._process_list(_frames)
+
+        if self._faulty:
+            out = self._inject(out)
+
+        return out
+
+    def _process_array(self, frames: "np.ndarray") -> "np.ndarray":
+        headers = frames >> np.uint64(FM.GENERAL_HEADER_OFFSET)
+        chip_addrs = (frames >> np.uint64(FM.GENERAL_CHIP_ADDR_OFFSET)) & np.uint64(
+            FM.GENERAL_CHIP_ADDR_MASK
+        )
+        core_addrs = (
+            (frames >> np.uint64(FM.GENERAL_CORE_ADDR_OFFSET))
+            & np.uint64(FM.GENERAL_CORE_ADDR_MASK)
+        ).astype(np.int64)
+
+        to_me = chip_addrs == np.uint64(self.chip_addr)
+        is_config = to_me & (headers == np.uint64(FST.CONFIG_TYPE2.value))
+        is_testin = to_me & (headers == np.uint64(FST.TEST_TYPE2.value))
+
+        # Config frames sorted by (core address, position in the stream).
+        cfg_idx = np.flatnonzero(is_config)
+        cfg_keys = (core_addrs[cfg_idx] << 32) | cfg_idx
+        order = np.argsort(cfg_keys, kind="stable")
+        cfg_keys, cfg_idx = cfg_keys[order], cfg_idx[order]
+        cfg_payloads = (frames[cfg_idx] & np.uint64(FM.GENERAL_PAYLOAD_MASK)).astype(
+            np.uint32
+        )
+
+        cfg_counts = np.bincount(core_addrs[cfg_idx], minlength=N_CORE_ADDRS)
+        cfg_starts = np.concatenate(([0], np.cumsum(cfg_counts)))[:-1]
+
+        # The payloads of the cores at every test-in frame.
+        tin_idx = np.flatnonzero(is_testin)
+        tin_addrs = core_addrs[tin_idx]
+        n_before = (
+            np.searchsorted(cfg_keys, (tin_addrs << 32) | tin_idx)
+            - cfg_starts[tin_addrs]
+        )
+        n_prev = self._n_configs[tin_addrs]
+        n_total = n_prev + n_before
+
+        payloads = np.empty((len(tin_idx), 3), dtype=np.uint64)
+        for i in range(3):
+            # Rank of the last config frame of the core at position i.
+            last = n_total - 1 - (n_total - 1 - i) % 3
+            in_chunk = last >= n_prev
+
+            payload = self.regs[tin_addrs, i].astype(np.uint64)
+            payload[in_chunk] = cfg_payloads[
+                cfg_starts[tin_addrs[in_chunk]] + (last - n_prev)[in_chunk]
+            ]
+            payloads[:, i] = payload
+
+        # Update the parameters reg to the last config frame at every position.
+        cfg_addrs = core_addrs[cfg_idx]
+        positions = (
+            self._n_configs[cfg_addrs] + np.arange(len(cfg_idx)) - cfg_starts[cfg_addrs]
+        ) % 3
+        slots = cfg_addrs * 3 + positions
+        _, last = np.unique(slots[::-1], return_index=True)
+        last = len(slots) - 1 - last
+        self.regs.reshape(-1)[slots[last]] = cfg_payloads[last]
+        self._n_configs += cfg_counts
+
+        test_chip_addrs = (
+            (payloads[:, 1] & np.uint64(CFM.TEST_CHIP_ADDR_HIGH3_MASK))
+            << np.uint64(CFM.TEST_CHIP_ADDR_COMBINATION_OFFSET)
+        ) | (
+            (payloads[:, 2] >> np.uint64(CFM.TEST_CHIP_ADDR_LOW7_OFFSET))
+            & np.uint64(CFM.TEST_CHIP_ADDR_LOW7_MASK)
+        )
+        core_star_mask = np.uint64(
+            FM.GENERAL_CORE_STAR_ADDR_MASK << FM.GENERAL_CORE_STAR_ADDR_OFFSET
+        )
+        headers = (
+            np.uint64(FST.TEST_TYPE2.value << FM.GENERAL_HEADER_OFFSET)
+            | (test_chip_addrs << np.uint64(FM.GENERAL_CHIP_ADDR_OFFSET))
+            | (tin_addrs.astype(np.uint64) << np.uint64(FM.GENERAL_CORE_ADDR_OFFSET))
+            | (frames[tin_idx] & core_star_mask)
+        )
+
+        return (headers[:, None] | payloads).ravel()
+
+    def _process_list(self, frames: Sequence[int]) -> FrameArray:
+        out = array("Q")
+
+        for frame in frames:
+            header = frame >> FM.GENERAL_HEADER_OFFSET
+            chip_addr = (
+                frame >> FM.GENERAL_CHIP_ADDR_OFFSET
+            ) & FM.GENERAL_CHIP_ADDR_MASK
+            core_addr = (
+                frame >> FM.GENERAL_CORE_ADDR_OFFSET
+            ) & FM.GENERAL_CORE_ADDR_MASK
+
+            if chip_addr != self.chip_addr:
+                continue
+
+            regs = self.regs[core_addr]
+
+            if header == FST.CONFIG_TYPE2.value:
+                n = self._n_configs_list[core_addr]
+                regs[n % 3] = frame & FM.GENERAL_PAYLOAD_MASK
+                self._n_configs_list[core_addr] = n + 1
+
+            elif header == FST.TEST_TYPE2.value:
+                core_star_addr = (
+                    frame >> FM.GENERAL_CORE_STAR_ADDR_OFFSET
+                ) & FM.GENERAL_CORE_STAR_ADDR_MASK
+                test_chip_addr = _TestChipAddr(regs[1], regs[2])
+
+                out.extend(
+                    FrameGen._GenFrame(
+                        FST.TEST_TYPE2.value,
+                        test_chip_addr,
+                        core_addr,
+                        core_star_addr,
+                        payload,
+                    )
+                    for payload in regs
+                )
+
+        return out
+
+    def _inject(self, frames: FrameArray) -> FrameArray:
+        """Inject the faults into the test-out frames."""
+        if np is not None:
+            _frames = frames | np.uint64(self.stuck_at_1)
+            _frames &= ~np.uint64(self.stuck_at_0)
+
+            if self.bit_error_rate:
+                flipped = self._rng.random(len(_frames)) < self.bit_error_rate
+                bits = self._rng.integers(0, 30, int(flipped.sum()), dtype=np.uint64)
+                _frames[flipped] ^= np.uint64(1) << bits
+
+            if self.reorder_rate and len(_frames) >= 6:
+                groups = _frames.reshape(-1, 3)
+                swapped = np.flatnonzero(
+                    self._rng.random(len(groups) - 1) < self.reorder_rate
+                )
+                # Not next to another one, so a group is swapped at most once.
+                swapped = swapped[np.diff(swapped, prepend=-2) > 1]
+                groups[[*swapped, *(swapped + 1)]] = groups[[*(swapped + 1), *swapped]]
+
+            if self.drop_rate:
+                _frames = _frames[self._rng.random(len(_frames)) >= self.drop_rate]
+
+            return _frames
+
+        _random = self._random
+        _frames = [(f | self.stuck_at_1) & ~self.stuck_at_0 for f in frames]
+
+        if self.bit_error_rate:
+            for i in range(len(_frames)):
+                if _random.random() < self.bit_error_rate:
+                    _frames[i] ^= 1 << _random.randrange(30)
+
+        if self.reorder_rate:
+            i = 0
+            while i + 6 <= len(_frames):
+                if _random.random() < self.reorder_rate:
+                    _frames[i : i + 6] = _frames[i + 3 : i + 6] + _frames[i : i + 3]
+                    i += 6
+                else:
+                    i += 3
+
+        if self.drop_rate:
+            _frames = [f for f in _frames if _random.random() >= self.drop_rate]
+
+        return array("Q", _frames)
@@ -1,10 +1,40 @@
+import itertools
 import random
 import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple, Union
-from .frames import Addr2Coord, Coord, Coord2Addr, Direction, FrameGen
+from typing import (
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from .frames import (
+    Addr2Coord,
+    Coord,
+    Coord2Addr,
+    CoordArray,
+    CoreMask,
+    Direction,
+    FrameGen,
+)
 from .frames import FrameMask as FM
 from .frames import FrameSubType as FST
+from .frames.core_mask import CoreMaskType
+from .frames.frame import FrameArray, concat_frames, repeat_fields
+from .frames.frame_io import (
+    DEFAULT_CHUNK_FRAMES,
+    BackgroundWriter,
+    iter_frames,
+    load_frames,
+    save_frames,
+)
 from .log import logger
 import warnings
 
@@ -12,6 +42,56 @@ if sys.version_info >= (3, 8):
     from typing import Literal
 
 
+# (config[3], testin, testout[3]) frames of one test group
+GroupType = Tuple[Tuple[int, ...], int, Tuple[int, ...]]
+
+# Frames of the config, testin & testout returned by the 'Get*' methods: tuples of int,
+# `uint64` arrays, or the paths of the files if only saved.
+GenGroupsType = Union[
+    Tuple[Tuple[int, ...], ...], Tuple[FrameArray, ...], Tuple[Path, ...]
+]
+
+# Number of groups in a shard of the seeded generation. Fixed, so the output of a seed
+# doesn't depend on the number of workers.
+_SHARD_GROUPS = 1 << 14
+
+# Names of the frames files in 'save_dir'.
+_SAVE_NAMES = ("config", "testin", "testout")
+
+
+def _CoreAddrs(core_coords: Union[List[Coord], CoordArray]) -> Sequence[int]:
+    if isinstance(core_coords, CoordArray):
+        return core_coords.addresses
+
+    return [Coord2Addr(core_coord) for core_coord in core_coords]
+
+
+def _Shards(core_coords: CoordArray) -> Iterator[CoordArray]:
+    """Slice the core coordinates into the shards of the seeded generation lazily."""
+    for i in range(0, len(core_coords), _SHARD_GROUPS):
+        yield core_coords[i : i + _SHARD_GROUPS]
+
+
+def _MapAhead(
+    executor: ProcessPoolExecutor,
+    fn: Callable[..., Tuple[FrameArray, ...]],
+    args: Tuple[Iterable, ...],
+    n_ahead: int,
+) -> Iterator[Tuple[FrameArray, ...]]:
+    """Like `executor.map`, but submit at most 'n_ahead' calls before the results \
+        are taken.
+    """
+    pending: Deque[Future] = deque()
+
+    for _args in zip(*args):
+        pending.append(executor.submit(fn, *_args))
+        if len(pending) >= n_ahead:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
 class paitest:
     def __init__(
         self,
@@ -50,263 +130,426 @@ class paitest:
         N: int,
         *,
         save_dir: Optional[Union[str, Path]] = None,
-        masked_core_coord: Optional[Tuple[int, int]] = None,
+        gen_txt: bool = False,
+        save_only: bool = False,
+        masked_core_coord: Optional[CoreMaskType] = None,
+        sweep: bool = False,
+        is_legal: bool = False,
+        as_array: bool = False,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None,
         verbose: bool = False,
-    ) -> Tuple[Tuple[int, ...], ...]:
+    ) -> GenGroupsType:
         """Generate 1 group(case) for 'N' random cores coordinates with 'N' different parameters.
 
         Arguments:
             - N: How many cores coordinates under test.
-            - save_dir: Where to save the frames files.
-            - masked_core_coord: to avoid generating the specific core coordinate.
+            - save_dir: Where to save the frames files, 'config', 'testin' & 'testout'. \
+                The frames are written in a background thread while generating.
+            - masked_core_coord: the cores to avoid: a core coordinate, an iterable of \
+                coordinates or addresses, a 1024-bit bitmap, a `CoreMask` or the path \
+                of a defect map file.
+            - sweep: to pick the cores in address order instead of randomly. \
+                With 'N' = 1008 minus the masked cores, all cores are swept.
             - gen_txt: to save frames into text files instead of default binary files.
+            - save_only: to only save the frames into 'save_dir' without keeping them, \
+                so the memory doesn't grow with 'N'.
+            - is_legal: whether to generate legal parameters reg instead of random payloads.
+            - as_array: whether to return `uint64` arrays instead of tuples of int.
+            - seed: the master seed. If specified, the groups are generated in fixed-size \
+                shards with their own seeds, and the output only depends on the seed.
+            - workers: the number of processes to generate the shards. The output of \
+                a given seed is the same for any number of workers.
             - verbose: whether to display the log.
 
         Returns:
             - 3 tuples including config, testin & testout tuples. 3*N frames in config & testout tuple and N frames in testin tuple.
+            If `as_array` is true, 3 `uint64` arrays in the same layout.
+            If `save_only` is true, the paths of the config, testin & testout files.
         """
-        self._ensure_cores(N)
+        # 1. Get N core coordinates list.
+        core_mask = self._to_core_mask(masked_core_coord)
+        self._ensure_cores(N, core_mask)
 
         if save_dir:
             work_dir = self._ensure_dir(save_dir)
+        elif save_only:
+            raise ValueError("save_dir must be specified if save_only")
         else:
             work_dir = None
 
-        # 1. Get N core coordinates list.
-        if isinstance(masked_core_coord, Tuple):
-            _masked_core_coord = Coord(masked_core_coord)
-        else:
-            _masked_core_coord = None
-
-        core_coords = self._GetNCoresCoord(N, _masked_core_coord)
+        seed, rng = self._ensure_seed(seed, workers)
+        core_coords = self._GetNCoresCoord(N, core_mask, sweep, rng)
+
+        if seed is not None:
+            return self._GenGroupsSharded(
+                core_coords,
+                None,
+                seed,
+                workers,
+                as_array,
+                verbose,
+                is_legal=is_legal,
+                save_paths=self._SavePaths(work_dir, gen_txt),
+                save_only=save_only,
+            )
 
         # 2. Get N parameters reg.
-        params = self._GetNParams(N, core_coords, False)
-
-        cf_list: List[int] = []
-        ti_list: List[int] = []
-        to_list: List[int] = []
-
-        for i in range(N):
-            if verbose:
-                logger.info(f"Generating test group #{i+1}/{N}...")
-            
-            core_coord = core_coords[i]
-            param = params[i]
-
-            for j in range(3):
-                config_frame = FrameGen.GenConfigFrame(
-                    FST.CONFIG_TYPE2,
-                    self._fixed_chip_coord,
-                    core_coord,
-                    self._fixed_core_star_coord,
-                    param[j],
-                )
-                testout_frame = FrameGen.GenTest2OutFrame(
-                    self._test_chip_coord,
-                    core_coord,
-                    self._fixed_core_star_coord,
-                    param[j],
-                )
-                cf_list.append(config_frame)
-                to_list.append(testout_frame)
-
-                if verbose:
-                    logger.info(
-                        "Config frame   #%d/3:  0x%x in group #%d/%d"
-                        % (j + 1, config_frame, i + 1, N)
-                    )
-                    logger.info(
-                        "Test out frame #%d/3:  0x%x in group #%d/%d"
-                        % (j + 1, testout_frame, i + 1, N)
-                    )
-
-            testin_frame = FrameGen.GenTest2InFrame(
-                self._fixed_chip_coord, core_coord, self._fixed_core_star_coord
+        if work_dir is not None:
+            return self._GenGroupsStreamed(
+                core_coords,
+                lambda n: self._GetNParams(n, core_coords, is_legal),
+                self._SavePaths(work_dir, gen_txt),
+                as_array,
+                verbose,
+                save_only=save_only,
             )
-            ti_list.append(testin_frame)
 
-            if verbose:
-                logger.info(
-                    "Test in frame  #1/1:  0x%x in group #%d/%d"
-                    % (testin_frame, i + 1, N)
-                )
+        params = self._GetNParams(N, core_coords, is_legal)
 
-        return tuple(cf_list), tuple(ti_list), tuple(to_list)
+        return self._GenGroupsFrames(core_coords, params, as_array, verbose)
 
     def Get1GroupForNCoresWith1Param(
         self,
         N: int,
         *,
         save_dir: Optional[Union[str, Path]] = None,
-        masked_core_coord: Optional[Tuple[int, int]] = None,
+        gen_txt: bool = False,
+        save_only: bool = False,
+        masked_core_coord: Optional[CoreMaskType] = None,
+        sweep: bool = False,
+        is_legal: bool = False,
+        as_array: bool = False,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None,
         verbose: bool = False,
-    ) -> Tuple[Tuple[int, ...], ...]:
+    ) -> GenGroupsType:
         """Generate 1 group(case) for 'N' random cores coordinates with the same parameters.
 
         Arguments:
             - N: How many cores coordinates under test.
-            - save_dir: Where to save the frames files.
-            - masked_core_coord: to avoid generating the specific core coordinate.
+            - save_dir: Where to save the frames files, 'config', 'testin' & 'testout'. \
+                The frames are written in a background thread while generating.
+            - masked_core_coord: the cores to avoid: a core coordinate, an iterable of \
+                coordinates or addresses, a 1024-bit bitmap, a `CoreMask` or the path \
+                of a defect map file.
+            - sweep: to pick the cores in address order instead of randomly. \
+                With 'N' = 1008 minus the masked cores, all cores are swept.
             - gen_txt: to save frames into text files instead of default binary files.
+            - save_only: to only save the frames into 'save_dir' without keeping them, \
+                so the memory doesn't grow with 'N'.
+            - is_legal: whether to generate legal parameters reg instead of random payloads.
+            - as_array: whether to return `uint64` arrays instead of tuples of int.
+            - seed: the master seed. If specified, the groups are generated in fixed-size \
+                shards with their own seeds, and the output only depends on the seed.
+            - workers: the number of processes to generate the shards. The output of \
+                a given seed is the same for any number of workers.
             - verbose: whether to display the log.
 
         Returns:
             - 3 tuples including config, testin & testout tuples. 3*N frames in config & testout tuple and N frames in testin tuple.
+            If `as_array` is true, 3 `uint64` arrays in the same layout.
+            If `save_only` is true, the paths of the config, testin & testout files.
         """
-        self._ensure_cores(N)
+        # 1. Get N core coordinates list.
+        core_mask = self._to_core_mask(masked_core_coord)
+        self._ensure_cores(N, core_mask)
 
         if save_dir:
             work_dir = self._ensure_dir(save_dir)
+        elif save_only:
+            raise ValueError("save_dir must be specified if save_only")
         else:
             work_dir = None
 
-        # 1. Get N core coordinates list.
-        if isinstance(masked_core_coord, Tuple):
-            _masked_core_coord = Coord(masked_core_coord)
-        else:
-            _masked_core_coord = None
-
-        core_coords = self._GetNCoresCoord(N, _masked_core_coord)
+        seed, rng = self._ensure_seed(seed, workers)
+        core_coords = self._GetNCoresCoord(N, core_mask, sweep, rng)
 
         # 2. Get the parameters reg.
-        param: Tuple[int, ...] = self._Get1Param(core_coords, False)
-
-        cf_list: List[int] = []
-        ti_list: List[int] = []
-        to_list: List[int] = []
-
-        for i in range(N):
-            if verbose:
-                logger.info(f"Generating test group #{i+1}/{N}...")
-            core_coord = core_coords[i]
-
-            for j in range(3):
-                config_frame = FrameGen.GenConfigFrame(
-                    FST.CONFIG_TYPE2,
-                    self._fixed_chip_coord,
-                    core_coord,
-                    self._fixed_core_star_coord,
-                    param[j],
-                )
-                testout_frame = FrameGen.GenTest2OutFrame(
-                    self._test_chip_coord,
-                    core_coord,
-                    self._fixed_core_star_coord,
-                    param[j],
-                )
-                cf_list.append(config_frame)
-                to_list.append(testout_frame)
-
-                if verbose:
-                    logger.info(
-                        "Config frame   #%d/3:  0x%x in group #%d/%d"
-                        % (j + 1, config_frame, i + 1, N)
-                    )
-                    logger.info(
-                        "Test out frame #%d/3:  0x%x in group #%d/%d"
-                        % (j + 1, testout_frame, i + 1, N)
-                    )
-
-            testin_frame = FrameGen.GenTest2InFrame(
-                self._fixed_chip_coord, core_coord, self._fixed_core_star_coord
+        param: Tuple[int, ...] = self._Get1Param(core_coords, is_legal, rng)
+
+        if seed is not None:
+            return self._GenGroupsSharded(
+                core_coords,
+                param,
+                seed,
+                workers,
+                as_array,
+                verbose,
+                save_paths=self._SavePaths(work_dir, gen_txt),
+                save_only=save_only,
             )
-            ti_list.append(testin_frame)
 
-            if verbose:
-                logger.info(
-                    "Test in frame  #1/1:  0x%x in group #%d/%d"
-                    % (testin_frame, i + 1, N)
-                )
+        if work_dir is not None:
+            return self._GenGroupsStreamed(
+                core_coords,
+                lambda n: [param] * n,
+                self._SavePaths(work_dir, gen_txt),
+                as_array,
+                verbose,
+                save_only=save_only,
+            )
 
-        return tuple(cf_list), tuple(ti_list), tuple(to_list)
+        return self._GenGroupsFrames(core_coords, [param] * N, as_array, verbose)
 
     def GetNGroupsFor1CoreWithNParams(
         self,
         N: int,
         *,
         save_dir: Optional[Union[str, Path]] = None,
-        masked_core_coord: Optional[Tuple[int, int]] = None,
+        gen_txt: bool = False,
+        save_only: bool = False,
+        masked_core_coord: Optional[CoreMaskType] = None,
+        is_legal: bool = False,
+        as_array: bool = False,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None,
         verbose: bool = False,
-    ) -> Tuple[Tuple[int, ...], ...]:
+    ) -> GenGroupsType:
         """Generate 'N' groups(cases) for 1 random core coordinate with 'N' different parameters.
 
         Arguments:
-            - N: How many test groups(cases) of 1 core will be generated.
-            - save_dir: Where to save the frames files.
-            - masked_core_coord: to avoid generating the specific core coordinate.
+            - N: How many test groups(cases) of 1 core will be generated. \
+                No upper bound if 'seed' or 'workers' is specified.
+            - save_dir: Where to save the frames files, 'config', 'testin' & 'testout'. \
+                The frames are written in a background thread while generating.
+            - masked_core_coord: the cores to avoid, same as `Get1GroupForNCoresWithNParams`.
             - gen_txt: to save frames into text files instead of default binary files.
+            - save_only: to only save the frames into 'save_dir' without keeping them, \
+                so the memory doesn't grow with 'N'.
+            - is_legal: whether to generate legal parameters reg instead of random payloads.
+            - as_array: whether to return `uint64` arrays instead of tuples of int.
+            - seed: the master seed. If specified, the groups are generated in fixed-size \
+                shards with their own seeds, and the output only depends on the seed.
+            - workers: the number of processes to generate the shards. The output of \
+                a given seed is the same for any number of workers.
             - verbose: whether to display the log.
 
         Returns:
             - 3 tuples including config, testin & testout tuples. 3*N frames in config & testout tuple and N frames in testin tuple.
+            If `as_array` is true, 3 `uint64` arrays in the same layout.
+            If `save_only` is true, the paths of the config, testin & testout files.
         """
-        self._ensure_cores(N)
+        if seed is None and workers is None:
+            self._ensure_cores(N)
+        else:
+            # No upper bound in the seeded generation
+            self._ensure_groups(N)
 
         if save_dir:
             work_dir = self._ensure_dir(save_dir)
+        elif save_only:
+            raise ValueError("save_dir must be specified if save_only")
         else:
             work_dir = None
 
         # 1. Get the core coordinates list.
-        if isinstance(masked_core_coord, Tuple):
-            _masked_core_coord = Coord(masked_core_coord)
-        else:
-            _masked_core_coord = None
-
-        core_coord = self._Get1CoreCoord(_masked_core_coord)
+        core_mask = self._to_core_mask(masked_core_coord)
+
+        seed, rng = self._ensure_seed(seed, workers)
+        core_coord = self._Get1CoreCoord(core_mask, rng)
+
+        if seed is not None:
+            return self._GenGroupsSharded(
+                CoordArray.full(N, core_coord),
+                None,
+                seed,
+                workers,
+                as_array,
+                verbose,
+                indexed=True,
+                is_legal=is_legal,
+                save_paths=self._SavePaths(work_dir, gen_txt),
+                save_only=save_only,
+            )
 
         # 2. Get the parameters reg.
-        params = self._GetNParams(N, core_coord, False)
+        if work_dir is not None:
+            return self._GenGroupsStreamed(
+                CoordArray.full(N, core_coord),
+                lambda n: self._GetNParams(n, core_coord, is_legal),
+                self._SavePaths(work_dir, gen_txt),
+                as_array,
+                verbose,
+                save_only=save_only,
+            )
 
-        cf_list: List[int] = []
-        ti_list: List[int] = []
-        to_list: List[int] = []
+        params = self._GetNParams(N, core_coord, is_legal)
 
-        for i in range(N):
-            if verbose:
-                logger.info(f"Generating test group #{i+1}/{N}...")
-            param = params[i]
-
-            for j in range(3):
-                config_frame = FrameGen.GenConfigFrame(
-                    FST.CONFIG_TYPE2,
-                    self._fixed_chip_coord,
-                    core_coord,
-                    self._fixed_core_star_coord,
-                    param[j],
-                )
-                testout_frame = FrameGen.GenTest2OutFrame(
-                    self._test_chip_coord,
-                    core_coord,
-                    self._fixed_core_star_coord,
-                    param[j],
-                )
-                cf_list.append(config_frame)
-                to_list.append(testout_frame)
+        return self._GenGroupsFrames([core_coord] * N, params, as_array, verbose)
 
-                if verbose:
-                    logger.info(
-                        "Config frame   #%d/3:  0x%x in group #%d/%d"
-                        % (j + 1, config_frame, i + 1, N)
-                    )
-                    logger.info(
-                        "Test out frame #%d/3:  0x%x in group #%d/%d"
-                        % (j + 1, testout_frame, i + 1, N)
-                    )
+    def Iter1GroupForNCoresWithNParams(
+        self,
+        N: int,
+        *,
+        masked_core_coord: Optional[CoreMaskType] = None,
+        sweep: bool = False,
+        is_legal: bool = False,
+        chunk_size: Optional[int] = None,
+        seed: Optional[int] = None,
+        verbose: bool = False,
+    ) -> Iterator[Union[GroupType, Tuple[FrameArray, ...]]]:
+        """Streaming version of `Get1GroupForNCoresWithNParams`.
+
+        Arguments:
+            - chunk_size: if specified, yield config, testin & testout `uint64` arrays \
+                of 'chunk_size' groups at a time instead of 1 group.
+            - seed: the master seed. If specified, yield the same groups as \
+                `Get1GroupForNCoresWithNParams` with the same seed.
+            - Others are the same as `Get1GroupForNCoresWithNParams`.
+
+        Yields:
+            - (config[3], testin, testout[3]) of every group in order, or chunks of them.
+        """
+        core_mask = self._to_core_mask(masked_core_coord)
+        self._ensure_cores(N, core_mask)
+        self._ensure_chunk_size(chunk_size)
+
+        if seed is not None:
+            seed, rng = self._ensure_seed(seed, None)
+            core_coords = self._GetNCoresCoord(N, core_mask, sweep, rng)
 
-            testin_frame = FrameGen.GenTest2InFrame(
-                self._fixed_chip_coord, core_coord, self._fixed_core_star_coord
+            return self._IterGroupsSharded(
+                _Shards(core_coords), None, seed, chunk_size, verbose, is_legal=is_legal
             )
-            ti_list.append(testin_frame)
 
-            if verbose:
-                logger.info(
-                    "Test in frame  #1/1:  0x%x in group #%d/%d"
-                    % (testin_frame, i + 1, N)
-                )
+        core_coords = self._GetNCoresCoord(N, core_mask, sweep)
+        params = self._IterParams(N, is_legal)
+
+        return self._IterGroupsFrames(core_coords, params, chunk_size, verbose)
+
+    def Iter1GroupForNCoresWith1Param(
+        self,
+        N: int,
+        *,
+        masked_core_coord: Optional[CoreMaskType] = None,
+        sweep: bool = False,
+        is_legal: bool = False,
+        chunk_size: Optional[int] = None,
+        seed: Optional[int] = None,
+        verbose: bool = False,
+    ) -> Iterator[Union[GroupType, Tuple[FrameArray, ...]]]:
+        """Streaming version of `Get1GroupForNCoresWith1Param`.
+
+        Arguments:
+            - chunk_size: if specified, yield config, testin & testout `uint64` arrays \
+                of 'chunk_size' groups at a time instead of 1 group.
+            - seed: the master seed. If specified, yield the same groups as \
+                `Get1GroupForNCoresWith1Param` with the same seed.
+            - Others are the same as `Get1GroupForNCoresWith1Param`.
+
+        Yields:
+            - (config[3], testin, testout[3]) of every group in order, or chunks of them.
+        """
+        core_mask = self._to_core_mask(masked_core_coord)
+        self._ensure_cores(N, core_mask)
+        self._ensure_chunk_size(chunk_size)
+
+        if seed is not None:
+            seed, rng = self._ensure_seed(seed, None)
+            core_coords = self._GetNCoresCoord(N, core_mask, sweep, rng)
+            param = self._Get1Param(core_coords, is_legal, rng)
+
+            return self._IterGroupsSharded(
+                _Shards(core_coords), param, seed, chunk_size, verbose
+            )
+
+        core_coords = self._GetNCoresCoord(N, core_mask, sweep)
+        param = self._Get1Param(core_coords, is_legal)
+
+        return self._IterGroupsFrames(
+            core_coords, itertools.repeat(param, N), chunk_size, verbose
+        )
+
+    def IterNGroupsFor1CoreWithNParams(
+        self,
+        N: Optional[int] = None,
+        *,
+        masked_core_coord: Optional[CoreMaskType] = None,
+        is_legal: bool = False,
+        chunk_size: Optional[int] = None,
+        seed: Optional[int] = None,
+        verbose: bool = False,
+    ) -> Iterator[Union[GroupType, Tuple[FrameArray, ...]]]:
+        """Streaming version of `GetNGroupsFor1CoreWithNParams`.
+
+        Arguments:
+            - N: How many test groups(cases) of 1 core will be generated. \
+                No upper bound. If not specified, generate groups endlessly.
+            - chunk_size: if specified, yield config, testin & testout `uint64` arrays \
+                of 'chunk_size' groups at a time instead of 1 group.
+            - seed: the master seed. If specified, yield the same groups as \
+                `GetNGroupsFor1CoreWithNParams` with the same seed.
+            - Others are the same as `GetNGroupsFor1CoreWithNParams`.
+
+        Yields:
+            - (config[3], testin, testout[3]) of every group in order, or chunks of them.
+        """
+        if N is not None:
+            self._ensure_groups(N)
+
+        self._ensure_chunk_size(chunk_size)
+
+        if seed is not None:
+            seed, rng = self._ensure_seed(seed, None)
+            core_coord = self._Get1CoreCoord(self._to_core_mask(masked_core_coord), rng)
+
+            if N is None:
+                shards = itertools.repeat(CoordArray.full(_SHARD_GROUPS, core_coord))
+            else:
+                shards = _Shards(CoordArray.full(N, core_coord))
+
+            return self._IterGroupsSharded(
+                shards, None, seed, chunk_size, verbose, indexed=True, is_legal=is_legal
+            )
+
+        core_coord = self._Get1CoreCoord(self._to_core_mask(masked_core_coord))
+
+        if N is None:
+            core_coords = itertools.repeat(core_coord)
+        else:
+            core_coords = itertools.repeat(core_coord, N)
+
+        params = self._IterParams(N, is_legal)
 
-        return tuple(cf_list), tuple(ti_list), tuple(to_list)
+        return self._IterGroupsFrames(core_coords, params, chunk_size, verbose)
+
+    def GetGroupAt(
+        self,
+        seed: int,
+        core_coord: Union[Tuple[int, int], Coord],
+        index: int = 0,
+        is_legal: bool = False,
+    ) -> GroupType:
+        """Regenerate one group of a suite generated with 'seed', without generating \
+            anything before it.
+
+        Valid for the suites of `Get1GroupForNCoresWithNParams` & \
+            `GetNGroupsFor1CoreWithNParams` generated with 'seed'.
+
+        Arguments:
+            - seed: the master seed of the suite.
+            - core_coord: the core coordinate of the group.
+            - index: the index of the group of the core, 0 for the suites of N cores.
+            - is_legal: whether the suite is generated with legal parameters reg.
+
+        Returns:
+            - (config[3], testin, testout[3]) of the group.
+        """
+        _core_coord = core_coord if isinstance(core_coord, Coord) else Coord(core_coord)
+        self._ensure_coord(_core_coord)
+
+        core_addr = Coord2Addr(_core_coord)
+        param = FrameGen._GenParamRegAt(
+            seed,
+            Coord2Addr(self._fixed_chip_coord),
+            core_addr,
+            index,
+            self._test_chip_coord,
+            is_legal,
+        )
+
+        return self._Gen1GroupFrames(core_addr, param)
 
     def ReplaceCoreCoord(
         self,
@@ -338,8 +581,7 @@ class paitest:
             old_core_addr = (
                 _frame >> FM.GENERAL_CORE_ADDR_OFFSET
             ) & FM.GENERAL_CORE_ADDR_MASK
-            old_core_coord = Addr2Coord(old_core_addr)
-            _new_core_coord = self._Get1CoreCoord(old_core_coord)
+            _new_core_coord = self._Get1CoreCoord(CoreMask(1 << old_core_addr))
 
         if isinstance(frames, int):
             return self._ReplaceCoreCoordIn1Frame(_frame, _new_core_coord)
@@ -350,137 +592,560 @@ class paitest:
     @staticmethod
     def SaveFrames(
         save_path: Union[str, Path],
-        frames: Union[int, List[int], Tuple[int, ...]],
+        frames: Union[int, List[int], Tuple[int, ...], FrameArray, Iterable[int]],
         byteorder="big",
+        chunk_size: Optional[int] = None,
+        append: bool = False,
     ) -> None:
         """Write frames into specific text or binary file. Files with '.bin' suffix is recommended.
 
+        The frames are serialized into one buffer and written at once, or chunk by chunk \
+            if 'chunk_size' is specified.
+
         Arguments:
             - save_path: The path of files.
-            - frames: A single frame or list or tuple of frames.
+            - frames: A single frame or list, tuple, `uint64` array or iterator of frames.
             - byteorder: Big or little-edian format.
+            - chunk_size: How many frames to serialize & write at a time, for frames \
+                larger than memory.
+            - append: Append to the file instead of overwriting it. Use `FrameWriter` \
+                to append incrementally, e.g. in a capture loop.
         """
-
         _path = Path(save_path)
-        _suffix: str = _path.suffix
-
-        if _suffix != ".bin" and _suffix != ".txt":
-            raise NotImplementedError(f"File with suffix {_suffix} is not supported!")
 
         assert byteorder in ["little", "big"]
 
-        if _suffix == ".bin":
-            with open(_path, "wb") as f:
-                if isinstance(frames, int):
-                    f.write(frames.to_bytes(8, byteorder))  # type: ignore
-                else:
-                    for frame in frames:
-                        f.write(frame.to_bytes(8, byteorder))  # type: ignore
-
-        else:
-            if byteorder == "little":
-                logger.warning(
-                    "Saving into txt file in little-edian format is not supported!"
-                )
+        if _path.suffix == ".txt" and byteorder == "little":
+            logger.warning(
+                "Saving into txt file in little-edian format is not supported!"
+            )
 
-            with open(_path, "w") as f:  # Open with "w"
-                if isinstance(frames, int):
-                    _str64 = bin(frames).split("0b")[1]
-                    _str64 = _str64.zfill(64)
-                    f.write(_str64 + "\n")
-                else:
-                    for frame in frames:
-                        _str64 = bin(frame).split("0b")[1]
-                        _str64 = _str64.zfill(64)
-                        f.write(_str64 + "\n")
+        save_frames(_path, frames, byteorder, chunk_size, append)
 
         logger.info(f"Saved frame(s) into {_path} OK")
 
-    def _Get1CoreCoord(self, masked_coord: Optional[Coord] = None) -> Coord:
-        """Generate a random core coordinate.
+    @staticmethod
+    def LoadFrames(
+        load_path: Union[str, Path],
+        byteorder="big",
+    ) -> FrameArray:
+        """Read frames from specific text or binary file, the counterpart of `SaveFrames`.
+
+        Binary files are memory-mapped as a read-only `uint64` array without copying. \
+            Text files are parsed in one pass.
+
+        Arguments:
+            - load_path: The path of files.
+            - byteorder: Big or little-edian format of binary files.
 
-        Indicate the masked one to avoid generating the same one
+        Returns:
+            - the frames, `numpy.memmap` for binary files if NumPy is installed, \
+                otherwise `uint64` array.
         """
-        return self._GetNCoresCoord(N=1, masked_coord=masked_coord)[0]
+        frames = load_frames(load_path, byteorder)
+        logger.info(f"Loaded {len(frames)} frame(s) from {load_path} OK")
 
-    def _GetNCoresCoord(
-        self, N: int, masked_coord: Optional[Coord] = None
-    ) -> List[Coord]:
-        """Generate 'N' unique cores coordinates.
+        return frames
 
-        Optional for excluding one masked core address
+    @staticmethod
+    def IterFrames(
+        load_path: Union[str, Path],
+        byteorder="big",
+        chunk_size: int = DEFAULT_CHUNK_FRAMES,
+    ) -> Iterator[FrameArray]:
+        """Read frames from specific text or binary file chunk by chunk, for files \
+            bigger than memory.
+
+        Arguments:
+            - chunk_size: How many frames in a chunk.
+            - Others are the same as `LoadFrames`.
+
+        Yields:
+            - chunks of frames in `uint64` arrays.
         """
+        return iter_frames(load_path, byteorder, chunk_size)
 
-        def _CoordGenerator():
-            coordinates = set()
+    def _to_core_mask(
+        self, masked_core_coord: Optional[CoreMaskType]
+    ) -> Optional[CoreMask]:
+        if masked_core_coord is None:
+            return None
 
-            if isinstance(masked_coord, Coord):
-                coordinates.add((masked_coord.x, masked_coord.y))
+        core_mask = CoreMask.of(masked_core_coord)
 
-            while True:
-                x = random.randint(0, FM.GENERAL_CHIP_ADDR_X_MASK)
-                y = random.randint(0, FM.GENERAL_CHIP_ADDR_Y_MASK)
+        if isinstance(masked_core_coord, Coord) or (
+            isinstance(masked_core_coord, Tuple)
+            and all(isinstance(v, int) for v in masked_core_coord)
+        ):
+            # A single masked core must be valid.
+            self._ensure_coord(next(iter(core_mask)))
 
-                if (x, y) not in coordinates and Coord(x, y) < Coord(0b11100, 0b11100):
-                    coordinates.add((x, y))
-                    yield Coord(x, y)
+        return core_mask
 
-        if isinstance(masked_coord, Coord):
-            self._ensure_coord(masked_coord)
-            if N > 1007:
-                raise ValueError(
-                    "When choose to mask a core, the max value of cores to be generated is 1007"
-                )
+    def _Get1CoreCoord(
+        self,
+        core_mask: Optional[CoreMask] = None,
+        rng: Optional[random.Random] = None,
+    ) -> Coord:
+        """Generate a random core coordinate.
+
+        Indicate the masked cores to avoid generating the same one
+        """
+        return self._GetNCoresCoord(N=1, core_mask=core_mask, rng=rng)[0]
+
+    def _GetNCoresCoord(
+        self,
+        N: int,
+        core_mask: Optional[CoreMask] = None,
+        sweep: bool = False,
+        rng: Optional[random.Random] = None,
+    ) -> CoordArray:
+        """Generate 'N' unique cores coordinates.
+
+        Optional for excluding the masked cores. Sample from the available cores \
+            addresses of the mask bitmap directly, so the cost is O(N) however \
+            close 'N' is to the limit.
 
-        generator = _CoordGenerator()
-        core_coord_list = [next(generator) for _ in range(N)]
+        Arguments:
+            - sweep: pick the cores in address order instead of randomly.
+            - rng: the random generator. Default is the global one.
+        """
+        core_addrs = (CoreMask() if core_mask is None else core_mask).available_addrs
 
-        return core_coord_list
+        if N > len(core_addrs):
+            raise ValueError(
+                f"Only {len(core_addrs)} cores are available, but {N} cores are required"
+            )
+
+        if sweep:
+            chosen = core_addrs[:N]
+        else:
+            chosen = (random if rng is None else rng).sample(core_addrs, N)
+
+        return CoordArray.from_addresses(chosen)
 
     def _Get1Param(
-        self, core_coords: Union[List[Coord], Coord], is_legal: bool = False
+        self,
+        core_coords: Union[List[Coord], Coord],
+        is_legal: bool = False,
+        rng: Optional[random.Random] = None,
     ) -> Tuple[int, ...]:
         """Generate one group parameter for parameter register"""
-        return self._GetNParams(1, core_coords, is_legal)[0]
+        return next(self._IterParams(1, is_legal, rng))
 
     def _GetNParams(
         self,
         N: int,
         core_coords: Union[List[Coord], Coord],
         is_legal: bool = False,
+        rng: Optional[random.Random] = None,
     ) -> List[Tuple[int, ...]]:
         """Generate 'N' random parameters register.
 
         Arguments:
             - is_legal: whether to generate legal parameters for every core
         """
+        if is_legal:
+            # Sample from the legal parameters tables in bulk
+            payloads = FrameGen._GenLegalParamRegs(N, self._test_chip_coord, rng)
+
+            return list(zip(*[iter(payloads.tolist())] * 3))
+
+        return list(self._IterParams(N, is_legal, rng))
+
+    def _IterParams(
+        self,
+        N: Optional[int] = None,
+        is_legal: bool = False,
+        rng: Optional[random.Random] = None,
+    ) -> Iterator[Tuple[int, ...]]:
+        """Generate 'N' random parameters register lazily. Endless if 'N' is not specified."""
+        counter = itertools.count() if N is None else range(N)
+
+        for _ in counter:
+            yield FrameGen._GenParamReg(
+                self._test_chip_coord, is_legal=is_legal, rng=rng
+            )
+
+    def _GenGroupsSharded(
+        self,
+        core_coords: Union[List[Coord], CoordArray],
+        param: Optional[Tuple[int, ...]],
+        seed: int,
+        workers: Optional[int] = None,
+        as_array: bool = False,
+        verbose: bool = False,
+        indexed: bool = False,
+        is_legal: bool = False,
+        save_paths: Optional[List[Path]] = None,
+        save_only: bool = False,
+    ) -> GenGroupsType:
+        """Generate the groups in shards of fixed size, on a process pool if 'workers' > 1.
+
+        The parameters reg of a group only depend on (seed, chip, core, group index), \
+            so the output is the same for any number of workers.
+
+        Arguments:
+            - param: the same parameters reg for every core, or `None` for different ones.
+            - indexed: whether the groups are indexed by their position, for the groups \
+                of the same core. Otherwise, the index of every group is 0.
+            - is_legal: whether to generate legal parameters reg.
+            - save_paths: if specified, write every shard into the files once generated.
+            - save_only: to return 'save_paths' instead of keeping the shards.
+        """
+        n_shards = (len(core_coords) + _SHARD_GROUPS - 1) // _SHARD_GROUPS
+        # Sliced lazily, one shard at a time.
+        shard_coords = (
+            core_coords[i * _SHARD_GROUPS : (i + 1) * _SHARD_GROUPS]
+            for i in range(n_shards)
+        )
+        shard_indices = [
+            i * _SHARD_GROUPS if indexed else None for i in range(n_shards)
+        ]
 
-        def _ParamGenerator():
-            while True:
-                for core_coord in _core_coords:
-                    if is_legal:
-                        # TODO Do legal generation here, including direction config
-                        raise NotImplementedError
-                    else:
-                        param = FrameGen.GenConfigGroup(
-                            FST.CONFIG_TYPE2,
-                            self._fixed_chip_coord,
-                            core_coord,
-                            self._fixed_core_star_coord,
-                            self._test_chip_coord,
-                        )
-
-                    yield param
-
-        if isinstance(core_coords, Coord):
-            _core_coords = [core_coords]
+        if verbose:
+            logger.info(
+                f"Generating {len(core_coords)} groups in {n_shards} shards with seed {seed}..."
+            )
+
+        args = (
+            itertools.repeat(seed, n_shards),
+            shard_coords,
+            shard_indices,
+            itertools.repeat(param, n_shards),
+            itertools.repeat(is_legal, n_shards),
+        )
+
+        if workers is None or workers <= 1:
+            results = self._WriteChunks(
+                map(self._GenShardFrames, *args), save_paths, save_only
+            )
         else:
-            _core_coords = core_coords
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Bounded, so the shards done ahead of the writer don't pile up.
+                results = self._WriteChunks(
+                    _MapAhead(executor, self._GenShardFrames, args, 2 * workers),
+                    save_paths,
+                    save_only,
+                )
+
+        if save_only:
+            return tuple(save_paths)
+
+        return self._ConcatGroups(results, as_array)
+
+    def _IterGroupsSharded(
+        self,
+        shard_coords: Iterable[CoordArray],
+        param: Optional[Tuple[int, ...]],
+        seed: int,
+        chunk_size: Optional[int] = None,
+        verbose: bool = False,
+        indexed: bool = False,
+        is_legal: bool = False,
+    ) -> Iterator[Union[GroupType, Tuple[FrameArray, ...]]]:
+        """Generate the seeded shards one by one, the same as `_GenGroupsSharded`, \
+            and yield their groups group by group, or chunk by chunk.
+
+        Arguments:
+            - shard_coords: the core coordinates of each shard, of '_SHARD_GROUPS' \
+                groups except the last one.
+            - Others are the same as `_GenGroupsSharded`.
+        """
+        first_index = 0
+        pending: List[Tuple[FrameArray, ...]] = []
+        n_pending = 0
 
-        generator = _ParamGenerator()
-        parameters = [next(generator) for _ in range(N)]
+        for i, core_coords in enumerate(shard_coords):
+            if verbose:
+                logger.info(f"Generating shard #{i+1} with seed {seed}...")
 
-        return parameters
+            config, testin, testout = self._GenShardFrames(
+                seed, core_coords, first_index if indexed else None, param, is_legal
+            )
+            n = len(testin)
+            first_index += n
+
+            if chunk_size is None:
+                config, testout = config.tolist(), testout.tolist()
+                for j, testin_frame in enumerate(testin.tolist()):
+                    yield (
+                        tuple(config[3 * j : 3 * j + 3]),
+                        testin_frame,
+                        tuple(testout[3 * j : 3 * j + 3]),
+                    )
+
+                continue
+
+            start = 0
+            while start < n:
+                stop = min(start + chunk_size - n_pending, n)
+                pending.append(
+                    (
+                        config[3 * start : 3 * stop],
+                        testin[start:stop],
+                        testout[3 * start : 3 * stop],
+                    )
+                )
+                n_pending += stop - start
+                start = stop
+
+                if n_pending == chunk_size:
+                    yield self._ConcatGroups(pending, True)  # type: ignore
+                    pending, n_pending = [], 0
+
+        if pending:
+            yield self._ConcatGroups(pending, True)  # type: ignore
+
+    def _GenGroupsStreamed(
+        self,
+        core_coords: Union[List[Coord], CoordArray],
+        get_params: Callable[[int], List[Tuple[int, ...]]],
+        save_paths: List[Path],
+        as_array: bool = False,
+        verbose: bool = False,
+        save_only: bool = False,
+    ) -> GenGroupsType:
+        """Generate the groups chunk by chunk, while the writer writes the previous chunks.
+
+        Arguments:
+            - get_params: returns the parameters reg of the next 'n' groups.
+            - save_paths: the files to write the chunks into.
+            - save_only: to return 'save_paths' instead of keeping the chunks.
+        """
+        chunks = (
+            self._GenGroupsFrames(
+                core_coords[i : i + _SHARD_GROUPS],
+                get_params(len(core_coords[i : i + _SHARD_GROUPS])),
+                True,
+                verbose,
+            )
+            for i in range(0, len(core_coords), _SHARD_GROUPS)
+        )
+
+        results = self._WriteChunks(chunks, save_paths, save_only)
+
+        if save_only:
+            return tuple(save_paths)
+
+        return self._ConcatGroups(results, as_array)
+
+    def _SavePaths(
+        self, work_dir: Optional[Path], gen_txt: bool = False
+    ) -> Optional[List[Path]]:
+        """Paths of the config, testin & testout frames files in 'work_dir'."""
+        if work_dir is None:
+            return None
+
+        suffix = ".txt" if gen_txt else ".bin"
+
+        return [work_dir / (name + suffix) for name in _SAVE_NAMES]
+
+    @staticmethod
+    def _WriteChunks(
+        chunks: Iterable[Tuple[FrameArray, ...]],
+        save_paths: Optional[List[Path]],
+        save_only: bool = False,
+    ) -> List[Tuple[FrameArray, ...]]:
+        """Collect the chunks of config, testin & testout frames, writing each one \
+            in a background thread once generated if 'save_paths' is specified.
+
+        Arguments:
+            - save_only: to drop every chunk once written instead of collecting it.
+        """
+        if save_paths is None:
+            return list(chunks)
+
+        results = []
+
+        # Opened here, so the writer is aborted if the chunks fail.
+        with BackgroundWriter(save_paths) as writer:
+            for chunk in chunks:
+                writer.put(*chunk)
+                if not save_only:
+                    results.append(chunk)
+
+        return results
+
+    @staticmethod
+    def _ConcatGroups(
+        results: List[Tuple[FrameArray, ...]], as_array: bool = False
+    ) -> Union[Tuple[Tuple[int, ...], ...], Tuple[FrameArray, ...]]:
+        config_frames, testin_frames, testout_frames = (
+            concat_frames([result[i] for result in results]) for i in range(3)
+        )
+
+        if as_array:
+            return config_frames, testin_frames, testout_frames
+
+        return (
+            tuple(config_frames.tolist()),
+            tuple(testin_frames.tolist()),
+            tuple(testout_frames.tolist()),
+        )
+
+    def _GenShardFrames(
+        self,
+        seed: int,
+        core_coords: Union[List[Coord], CoordArray],
+        first_index: Optional[int] = None,
+        param: Optional[Tuple[int, ...]] = None,
+        is_legal: bool = False,
+    ) -> Tuple[FrameArray, ...]:
+        """Generate the frames of one shard. Run in the worker processes.
+
+        Arguments:
+            - first_index: the index of the first group in the shard, or `None` for all 0.
+        """
+        core_addrs = _CoreAddrs(core_coords)
+
+        if param is None:
+            if first_index is None:
+                indices = 0
+            else:
+                indices = range(first_index, first_index + len(core_addrs))
+
+            payloads = FrameGen._GenParamRegsBatch(
+                seed,
+                Coord2Addr(self._fixed_chip_coord),
+                core_addrs,
+                indices,
+                self._test_chip_coord,
+                is_legal,
+            )
+        else:
+            payloads = list(param) * len(core_addrs)
+
+        return self._EncodeGroups(core_addrs, payloads, True)  # type: ignore
+
+    def _GenGroupsFrames(
+        self,
+        core_coords: Union[List[Coord], CoordArray],
+        params: List[Tuple[int, ...]],
+        as_array: bool = False,
+        verbose: bool = False,
+    ) -> Union[Tuple[Tuple[int, ...], ...], Tuple[FrameArray, ...]]:
+        """Generate config, testin & testout frames of groups with the batch encoder.
+
+        Arguments:
+            - core_coords: the core coordinate of each group.
+            - params: the 3 parameters reg of each group.
+        """
+        core_addrs = _CoreAddrs(core_coords)
+        payloads = [p for param in params for p in param]
+
+        return self._EncodeGroups(core_addrs, payloads, as_array, verbose)
+
+    def _EncodeGroups(
+        self,
+        core_addrs: Sequence[int],
+        payloads: Sequence[int],
+        as_array: bool = False,
+        verbose: bool = False,
+    ) -> Union[Tuple[Tuple[int, ...], ...], Tuple[FrameArray, ...]]:
+        """Encode config, testin & testout frames of groups from the header templates.
+
+        Arguments:
+            - core_addrs: the core address of each group.
+            - payloads: the 3 parameters reg of each group, flattened.
+        """
+        core_addrs3 = repeat_fields(core_addrs, 3)
+
+        chip_addr = Coord2Addr(self._fixed_chip_coord)
+        test_chip_addr = Coord2Addr(self._test_chip_coord)
+        core_star_addr = Coord2Addr(self._fixed_core_star_coord)
+
+        config_frames = FrameGen.GenFramesFromTemplates(
+            FST.CONFIG_TYPE2, chip_addr, core_addrs3, core_star_addr, payloads
+        )
+        testin_frames = FrameGen.GenFramesFromTemplates(
+            FST.TEST_TYPE2, chip_addr, core_addrs, core_star_addr, 0
+        )
+        testout_frames = FrameGen.GenFramesFromTemplates(
+            FST.TEST_TYPE2, test_chip_addr, core_addrs3, core_star_addr, payloads
+        )
+
+        if verbose:
+            N = len(core_addrs)
+            for i in range(N):
+                logger.info(f"Generating test group #{i+1}/{N}...")
+
+                for j in range(3):
+                    logger.info(
+                        "Config frame   #%d/3:  0x%x in group #%d/%d"
+                        % (j + 1, config_frames[3 * i + j], i + 1, N)
+                    )
+                    logger.info(
+                        "Test out frame #%d/3:  0x%x in group #%d/%d"
+                        % (j + 1, testout_frames[3 * i + j], i + 1, N)
+                    )
+
+                logger.info(
+                    "Test in frame  #1/1:  0x%x in group #%d/%d"
+                    % (testin_frames[i], i + 1, N)
+                )
+
+        if as_array:
+            return config_frames, testin_frames, testout_frames
+
+        return (
+            tuple(config_frames.tolist()),
+            tuple(testin_frames.tolist()),
+            tuple(testout_frames.tolist()),
+        )
+
+    def _IterGroupsFrames(
+        self,
+        core_coords: Iterable[Coord],
+        params: Iterable[Tuple[int, ...]],
+        chunk_size: Optional[int] = None,
+        verbose: bool = False,
+    ) -> Iterator[Union[GroupType, Tuple[FrameArray, ...]]]:
+        """Generate config, testin & testout frames group by group, or chunk by chunk."""
+        groups = zip(core_coords, params)
+
+        if chunk_size is not None:
+            for i in itertools.count():
+                chunk = list(itertools.islice(groups, chunk_size))
+                if not chunk:
+                    return
+
+                if verbose:
+                    logger.info(f"Generating chunk #{i+1} of {len(chunk)} groups...")
+
+                _core_coords, _params = zip(*chunk)
+                yield self._GenGroupsFrames(list(_core_coords), list(_params), True)
+
+        for i, (core_coord, param) in enumerate(groups):
+            group = self._Gen1GroupFrames(Coord2Addr(core_coord), param)
+
+            if verbose:
+                logger.info(f"Generated test group #{i+1} for core {core_coord}")
+
+            yield group
+
+    def _Gen1GroupFrames(self, core_addr: int, param: Tuple[int, ...]) -> GroupType:
+        """Generate config, testin & testout frames of 1 group from the header templates."""
+        chip_addr = Coord2Addr(self._fixed_chip_coord)
+        test_chip_addr = Coord2Addr(self._test_chip_coord)
+        core_star_addr = Coord2Addr(self._fixed_core_star_coord)
+        mask = FM.GENERAL_PAYLOAD_MASK
+
+        config_header = FrameGen._GetTemplates(
+            FST.CONFIG_TYPE2, chip_addr, core_star_addr
+        )[core_addr]
+        testin_frame = FrameGen._GetTemplates(
+            FST.TEST_TYPE2, chip_addr, core_star_addr
+        )[core_addr]
+        testout_header = FrameGen._GetTemplates(
+            FST.TEST_TYPE2, test_chip_addr, core_star_addr
+        )[core_addr]
+
+        return (
+            tuple(config_header | (p & mask) for p in param),
+            testin_frame,
+            tuple(testout_header | (p & mask) for p in param),
+        )
 
     def _ReplaceCoreCoordIn1Frame(self, frame: int, new_core_coord: Coord) -> int:
         """Replace the original core coordinate of a frame with a new one."""
@@ -527,10 +1192,42 @@ class paitest:
 
         return _user_dir
 
-    def _ensure_cores(self, Ncores: int) -> None:
-        """Parameter check: Ncores"""
-        if Ncores > 1024 - 16 or Ncores < 1:
-            raise ValueError("Range of Ncores is 0 < N < 1008")
+    def _ensure_cores(self, Ncores: int, core_mask: Optional[CoreMask] = None) -> None:
+        """Parameter check: Ncores, no more than the available cores of the mask"""
+        n_available = (CoreMask() if core_mask is None else core_mask).n_available
+
+        if Ncores > n_available or Ncores < 1:
+            raise ValueError(f"Range of Ncores is 0 < N <= {n_available}")
+
+    def _ensure_groups(self, Ngroups: int) -> None:
+        """Parameter check: Ngroups"""
+        if Ngroups < 1:
+            raise ValueError("Ngroups must be positive")
+
+    def _ensure_seed(
+        self, seed: Optional[int], workers: Optional[int]
+    ) -> Tuple[Optional[int], Optional[random.Random]]:
+        """Parameter check: seed & workers
+
+        Returns:
+            - the master seed, drawn from the global generator if only 'workers' is specified.
+            - the generator seeded by the master seed, or `None` for the global one.
+        """
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be positive")
+
+        if seed is None:
+            if workers is None:
+                return None, None
+
+            seed = random.getrandbits(64)
+
+        return seed, random.Random(seed)
+
+    def _ensure_chunk_size(self, chunk_size: Optional[int]) -> None:
+        """Parameter check: chunk_size"""
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
 
     def _ensure_direction(self, direction: str) -> None:
         """Parameter check: direction"""
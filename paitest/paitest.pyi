@@ -1,10 +1,19 @@
 import sys
 from pathlib import Path
-from typing import List, Optional, Tuple, Union
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from .frames.coord import Coord
+from .frames.core_mask import CoreMaskType
+from .frames.frame import FrameArray
 
 if sys.version_info >= (3, 8):
     from typing import Literal
 
+GroupType = Tuple[Tuple[int, ...], int, Tuple[int, ...]]
+GenGroupsType = Union[
+    Tuple[Tuple[int, ...], ...], Tuple[FrameArray, ...], Tuple[Path, ...]
+]
+
 class paitest:
     if sys.version_info >= (3, 8):
         def __init__(
@@ -28,25 +37,84 @@ class paitest:
         N: int,
         *,
         save_dir: Optional[Union[str, Path]] = None,
-        masked_core_coord: Optional[Tuple[int, int]] = None,
+        gen_txt: bool = False,
+        save_only: bool = False,
+        masked_core_coord: Optional[CoreMaskType] = None,
+        sweep: bool = False,
+        is_legal: bool = False,
+        as_array: bool = False,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None,
         verbose: bool = False
-    ) -> Tuple[Tuple[int, ...], ...]: ...
+    ) -> GenGroupsType: ...
     def Get1GroupForNCoresWith1Param(
         self,
         N: int,
         *,
         save_dir: Optional[Union[str, Path]] = None,
-        masked_core_coord: Optional[Tuple[int, int]] = None,
+        gen_txt: bool = False,
+        save_only: bool = False,
+        masked_core_coord: Optional[CoreMaskType] = None,
+        sweep: bool = False,
+        is_legal: bool = False,
+        as_array: bool = False,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None,
         verbose: bool = False
-    ) -> Tuple[Tuple[int, ...], ...]: ...
+    ) -> GenGroupsType: ...
     def GetNGroupsFor1CoreWithNParams(
         self,
         N: int,
         *,
         save_dir: Optional[Union[str, Path]] = None,
-        masked_core_coord: Optional[Tuple[int, int]] = None,
+        gen_txt: bool = False,
+        save_only: bool = False,
+        masked_core_coord: Optional[CoreMaskType] = None,
+        is_legal: bool = False,
+        as_array: bool = False,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None,
+        verbose: bool = False
+    ) -> GenGroupsType: ...
+    def Iter1GroupForNCoresWithNParams(
+        self,
+        N: int,
+        *,
+        masked_core_coord: Optional[CoreMaskType] = None,
+        sweep: bool = False,
+        is_legal: bool = False,
+        chunk_size: Optional[int] = None,
+        seed: Optional[int] = None,
+        verbose: bool = False
+    ) -> Iterator[Union[GroupType, Tuple[FrameArray, ...]]]: ...
+    def Iter1GroupForNCoresWith1Param(
+        self,
+        N: int,
+        *,
+        masked_core_coord: Optional[CoreMaskType] = None,
+        sweep: bool = False,
+        is_legal: bool = False,
+        chunk_size: Optional[int] = None,
+        seed: Optional[int] = None,
+        verbose: bool = False
+    ) -> Iterator[Union[GroupType, Tuple[FrameArray, ...]]]: ...
+    def IterNGroupsFor1CoreWithNParams(
+        self,
+        N: Optional[int] = None,
+        *,
+        masked_core_coord: Optional[CoreMaskType] = None,
+        is_legal: bool = False,
+        chunk_size: Optional[int] = None,
+        seed: Optional[int] = None,
         verbose: bool = False
-    ) -> Tuple[Tuple[int, ...], ...]: ...
+    ) -> Iterator[Union[GroupType, Tuple[FrameArray, ...]]]: ...
+    def GetGroupAt(
+        self,
+        seed: int,
+        core_coord: Union[Tuple[int, int], Coord],
+        index: int = 0,
+        is_legal: bool = False,
+    ) -> GroupType: ...
     def ReplaceCoreCoord(
         self,
         frames: Union[int, List[int], Tuple[int, ...]],
@@ -57,13 +125,39 @@ class paitest:
         @staticmethod
         def SaveFrames(
             save_path: Union[str, Path],
-            frames: Union[int, List[int], Tuple[int, ...]],
+            frames: Union[int, List[int], Tuple[int, ...], FrameArray, Iterable[int]],
             byteorder: Literal["little", "big"] = "big",
+            chunk_size: Optional[int] = None,
+            append: bool = False,
         ) -> None: ...
+        @staticmethod
+        def LoadFrames(
+            load_path: Union[str, Path],
+            byteorder: Literal["little", "big"] = "big",
+        ) -> FrameArray: ...
+        @staticmethod
+        def IterFrames(
+            load_path: Union[str, Path],
+            byteorder: Literal["little", "big"] = "big",
+            chunk_size: int = ...,
+        ) -> Iterator[FrameArray]: ...
     else:
         @staticmethod
         def SaveFrames(
             save_path: Union[str, Path],
-            frames: Union[int, List[int], Tuple[int, ...]],
+            frames: Union[int, List[int], Tuple[int, ...], FrameArray, Iterable[int]],
             byteorder: str = "big",
+            chunk_size: Optional[int] = None,
+            append: bool = False,
         ) -> None: ...
+        @staticmethod
+        def LoadFrames(
+            load_path: Union[str, Path],
+            byteorder: str = "big",
+        ) -> FrameArray: ...
+        @staticmethod
+        def IterFrames(
+            load_path: Union[str, Path],
+            byteorder: str = "big",
+            chunk_size: int = ...,
+        ) -> Iterator[FrameArray]: ...
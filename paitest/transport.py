@@ -0,0 +1,479 @@
+"""Asyncio transport of frames between the host & the chip.
+
+A `Transport` sends the config & test-in frames of the test groups over a `Backend`, \
+    and collects the test-out frames. The frames are pipelined: up to 'window' groups \
+    are in flight, and the frames of many groups are sent in one write. The test-out \
+    frames are demultiplexed to their groups by core address, so the groups of \
+    different cores can be answered in any order.
+
+Backends:
+
+- `LoopbackBackend`: in-process, answering the frames by a function, e.g. a chip model.
+- `StreamBackend`: asyncio streams, e.g. a TCP connection.
+- `FdBackend`: file descriptors, e.g. pipes of a subprocess or a serial port.
+- `PtyBackend`: a pseudo terminal, for a device emulator on the other end.
+"""
+
+import asyncio
+import errno
+import os
+from array import array
+from typing import Any, Callable, Optional, Sequence
+
+from .frames.core_demux import FRAME_BYTES, CoreDemux
+from .frames.frame import FrameArray, as_frames
+from .frames.frame_io import frames_to_bytes
+from .frames.frame_params import FrameMask as FM
+from .frames.frame_params import FrameSubType as FST
+from .log import logger
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Backend:
+    """Byte stream between the host & the chip."""
+
+    async def write(self, data: bytes) -> None:
+        raise NotImplementedError
+
+    async def read(self) -> bytes:
+        """Read the bytes available, at least 1. Return `b""` at EOF."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class LoopbackBackend(Backend):
+    """In-process backend. The bytes written are answered by 'responder', or echoed \
+        back if not specified.
+    """
+
+    def __init__(self, responder: Optional[Callable[[bytes], bytes]] = None) -> None:
+        self._responder = responder
+        self._queue: Optional["asyncio.Queue[bytes]"] = None
+
+    @property
+    def _received(self) -> "asyncio.Queue[bytes]":
+        # Created in the running loop.
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+
+        return self._queue
+
+    async def write(self, data: bytes) -> None:
+        out = data if self._responder is None else self._responder(data)
+        if out:
+            self._received.put_nowait(out)
+
+        # Let the reader run, like a real link.
+        await asyncio.sleep(0)
+
+    async def read(self) -> bytes:
+        return await self._received.get()
+
+    async def close(self) -> None:
+        self._received.put_nowait(b"")
+
+
+class StreamBackend(Backend):
+    """Backend of asyncio streams."""
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        read_size: int = 1 << 16,
+    ) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._read_size = read_size
+
+    @classmethod
+    async def connect(cls, host: str, port: int) -> "StreamBackend":
+        """Open a TCP connection."""
+        reader, writer = await asyncio.open_connection(host, port)
+
+        return cls(reader, writer)
+
+    async def write(self, data: bytes) -> None:
+        self._writer.write(data)
+        await self._writer.drain()
+
+    async def read(self) -> bytes:
+        return await self._reader.read(self._read_size)
+
+    async def close(self) -> None:
+        self._writer.close()
+
+
+class FdBackend(Backend):
+    """Backend of non-blocking file descriptors, on Unix."""
+
+    def __init__(
+        self, read_fd: int, write_fd: Optional[int] = None, read_size: int = 1 << 16
+    ) -> None:
+        self._read_fd = read_fd
+        self._write_fd = read_fd if write_fd is None else write_fd
+        self._read_size = read_size
+
+        os.set_blocking(self._read_fd, False)
+        os.set_blocking(self._write_fd, False)
+
+    @staticmethod
+    async def _wait(fd: int, writable: bool) -> None:
+        loop = asyncio.get_event_loop()
+        ready = loop.create_future()
+
+        def _ready() -> None:
+            if not ready.done():
+                ready.set_result(None)
+
+        if writable:
+            loop.add_writer(fd, _ready)
+        else:
+            loop.add_reader(fd, _ready)
+
+        try:
+            await ready
+        finally:
+            if writable:
+                loop.remove_writer(fd)
+            else:
+                loop.remove_reader(fd)
+
+    async def write(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            try:
+                n = os.write(self._write_fd, view)
+                view = view[n:]
+            except BlockingIOError:
+                await self._wait(self._write_fd, True)
+
+    async def read(self) -> bytes:
+        while True:
+            try:
+                return os.read(self._read_fd, self._read_size)
+            except BlockingIOError:
+                await self._wait(self._read_fd, False)
+            except OSError as e:
+                # The other end of a pty is closed.
+                if e.errno == errno.EIO:
+                    return b""
+
+                raise
+
+    async def close(self) -> None:
+        os.close(self._read_fd)
+        if self._write_fd != self._read_fd:
+            os.close(self._write_fd)
+
+
+class PtyBackend(FdBackend):
+    """Backend of the master end of a new pseudo terminal in raw mode. A device \
+        emulator opens the slave end, 'slave_path', like a serial port.
+    """
+
+    def __init__(self, read_size: int = 1 << 16) -> None:
+        import tty
+
+        master_fd, self.slave_fd = os.openpty()
+        tty.setraw(self.slave_fd)
+        self.slave_path: str = os.ttyname(self.slave_fd)
+
+        super().__init__(master_fd, read_size=read_size)
+
+    async def close(self) -> None:
+        await super().close()
+        os.close(self.slave_fd)
+
+
+class _Demux:
+    """Demultiplex the test-out frames to the groups by core address.
+
+    The k-th test-out frame of a core belongs to the (k // 3)-th group of the core in \
+        the sending order, at position k % 3.
+    """
+
+    def __init__(self, core_addrs: Sequence[int], n_out: int) -> None:
+        self.n_groups = len(core_addrs)
+        self.n_out = n_out
+        self.n_completed = 0
+        self.n_unexpected = 0
+
+        # The frame #k % n_out of the (k // n_out)-th group of a core.
+        self._demux = CoreDemux(core_addrs, n_out)
+
+        if np is not None:
+            self.frames = np.zeros(n_out * self.n_groups, dtype=np.uint64)
+            self.received = np.zeros(n_out * self.n_groups, dtype=np.bool_)
+        else:
+            self.frames = array("Q", bytes(FRAME_BYTES * n_out * self.n_groups))
+            self.received = bytearray(n_out * self.n_groups)
+
+    @property
+    def done(self) -> bool:
+        return self.n_completed == self.n_groups
+
+    def received_frames(self) -> FrameArray:
+        """The frames received, in the order of the groups."""
+        if np is not None:
+            return self.frames[self.received]
+
+        return array("Q", (f for f, r in zip(self.frames, self.received) if r))
+
+    def feed(self, frames: FrameArray) -> None:
+        if np is not None:
+            self._feed_array(frames)
+        else:
+            self._feed_list(frames)
+
+    def _feed_array(self, frames: "np.ndarray") -> None:
+        headers = frames >> np.uint64(FM.GENERAL_HEADER_OFFSET)
+        testout = headers == np.uint64(FST.TEST_TYPE2.value)
+        _frames = frames[testout]
+
+        core_addrs = (
+            (_frames >> np.uint64(FM.GENERAL_CORE_ADDR_OFFSET))
+            & np.uint64(FM.GENERAL_CORE_ADDR_MASK)
+        ).astype(np.intp)
+
+        slots = self._demux.map(core_addrs)
+        expected = slots >= 0
+        indices = slots[expected]
+
+        self.frames[indices] = _frames[expected]
+        self.received[indices] = True
+        self.n_completed += int((indices % self.n_out == self.n_out - 1).sum())
+        self.n_unexpected += len(frames) - len(indices)
+
+    def _feed_list(self, frames: Sequence[int]) -> None:
+        for frame in frames:
+            if (frame >> FM.GENERAL_HEADER_OFFSET) != FST.TEST_TYPE2.value:
+                self.n_unexpected += 1
+                continue
+
+            core_addr = (
+                frame >> FM.GENERAL_CORE_ADDR_OFFSET
+            ) & FM.GENERAL_CORE_ADDR_MASK
+            index = self._demux.map_one(core_addr)
+            if index < 0:
+                self.n_unexpected += 1
+                continue
+
+            self.frames[index] = frame
+            self.received[index] = 1
+            if index % self.n_out == self.n_out - 1:
+                self.n_completed += 1
+
+
+class Transport:
+    """Pipelined exchange of test groups with the chip over a `Backend`.
+
+    Examples:
+    >>> config, testin, testout = manager.Get1GroupForNCoresWithNParams(1000)
+    >>> async with Transport(PtyBackend(), window=64) as transport:
+    ...     received = await transport.run_groups(config, testin)
+    """
+
+    def __init__(
+        self,
+        backend: Backend,
+        *,
+        window: int = 256,
+        batch_groups: int = 1024,
+        byteorder: str = "big",
+        timeout: Optional[float] = 1.0,
+    ) -> None:
+        """
+        Arguments:
+            - backend: the byte stream to the chip.
+            - window: the max number of groups sent but not answered yet.
+            - batch_groups: the max number of groups sent in one write.
+            - byteorder: the byte order of the frames on the link.
+            - timeout: the groups sent are given up as missing if no frames are \
+                received in this many seconds, so lost frames do not stall the \
+                sending. None to wait forever, which blocks if any frame is lost.
+        """
+        if window < 1:
+            raise ValueError("window must be positive")
+
+        if batch_groups < 1:
+            raise ValueError("batch_groups must be positive")
+
+        assert byteorder in ["little", "big"]
+
+        self.backend = backend
+        self.window = window
+        self.batch_groups = batch_groups
+        self.byteorder = byteorder
+        self.timeout = timeout
+
+        # Of the last `run_groups`.
+        self.n_unexpected = 0
+        self.n_missing = 0
+        # Whether every test-out frame of the groups is received.
+        self.received: Sequence[int] = array("B")
+
+    async def send_frames(
+        self, frames: Sequence[int], batch_frames: int = 1 << 16
+    ) -> None:
+        """Send frames, 'batch_frames' frames per write, without waiting for answers."""
+        _frames = as_frames(frames)
+        for i in range(0, len(_frames), batch_frames):
+            await self.backend.write(
+                frames_to_bytes(_frames[i : i + batch_frames], self.byteorder)
+            )
+
+    def _pack_groups(
+        self, config: FrameArray, testin: FrameArray, start: int, stop: int
+    ) -> bytes:
+        """The 3 config frames & the test-in frame of every group, in order."""
+        if np is not None:
+            frames = np.concatenate(
+                (
+                    config[3 * start : 3 * stop].reshape(-1, 3),
+                    testin[start:stop, None],
+                ),
+                axis=1,
+            ).ravel()
+        else:
+            frames = array("Q")
+            for i in range(start, stop):
+                frames.extend(config[3 * i : 3 * i + 3])
+                frames.append(testin[i])
+
+        return frames_to_bytes(frames, self.byteorder)
+
+    async def run_groups(
+        self,
+        config: Sequence[int],
+        testin: Sequence[int],
+        *,
+        n_out: int = 3,
+        on_frames: Optional[Callable[[FrameArray], Any]] = None,
+    ) -> FrameArray:
+        """Send the config & test-in frames of the groups, and collect the test-out \
+            frames.
+
+        Arguments:
+            - config: 3 config frames per group.
+            - testin: 1 test-in frame per group.
+            - n_out: the number of test-out frames per group.
+            - on_frames: called with every chunk of the frames received, in the \
+                order they arrive, e.g. `StreamVerifier.feed`.
+
+        Returns:
+            - the test-out frames received, in the order of the groups. The groups \
+                not answered in time are counted in `n_missing`, and the frames \
+                received are marked in `received`.
+        """
+        _config = as_frames(config)
+        _testin = as_frames(testin)
+        n = len(_testin)
+
+        if len(_config) != 3 * n:
+            raise ValueError(f"{3 * n} config frames expected, but got {len(_config)}")
+
+        core_addrs = [
+            (int(frame) >> FM.GENERAL_CORE_ADDR_OFFSET) & FM.GENERAL_CORE_ADDR_MASK
+            for frame in _testin
+        ]
+        demux = _Demux(core_addrs, n_out)
+        progress = asyncio.Event()
+
+        async def _receive() -> None:
+            remainder = b""
+
+            try:
+                while not demux.done:
+                    data = await self.backend.read()
+                    if not data:
+                        return
+
+                    data = remainder + data
+                    size = len(data) - len(data) % FRAME_BYTES
+                    remainder = data[size:]
+
+                    frames = as_frames(data[:size], self.byteorder)
+                    demux.feed(frames)
+                    if on_frames is not None:
+                        on_frames(frames)
+
+                    progress.set()
+            finally:
+                # Wake up the sender at EOF or error.
+                progress.set()
+
+        async def _wait_progress() -> bool:
+            """Wait for frames received. False if timed out or the receiver stops."""
+            if receiver.done():
+                return False
+
+            progress.clear()
+            try:
+                await asyncio.wait_for(progress.wait(), self.timeout)
+            except asyncio.TimeoutError:
+                return False
+
+            return not receiver.done()
+
+        receiver = asyncio.ensure_future(_receive())
+
+        try:
+            # Number of the groups given up as missing.
+            sent, n_retired = 0, 0
+            while sent < n:
+                in_flight = max(0, sent - demux.n_completed - n_retired)
+                if in_flight >= self.window:
+                    if not await _wait_progress():
+                        if receiver.done():
+                            break
+
+                        # Nothing received in time, the groups in flight are lost.
+                        n_retired = sent - demux.n_completed
+                        logger.debug(f"{in_flight} group(s) in flight timed out")
+
+                    continue
+
+                stop = min(n, sent + self.batch_groups, sent + self.window - in_flight)
+                await self.backend.write(
+                    self._pack_groups(_config, _testin, sent, stop)
+                )
+                sent = stop
+
+            while not demux.done:
+                if not await _wait_progress():
+                    break
+        finally:
+            receiver.cancel()
+            try:
+                # Raise the error of the receiver, e.g. of 'on_frames', if any.
+                await receiver
+            except asyncio.CancelledError:
+                pass
+
+        self.n_unexpected = demux.n_unexpected
+        self.n_missing = n - demux.n_completed
+        self.received = demux.received
+
+        if self.n_missing > 0:
+            logger.warning(
+                f"{self.n_missing} of {n} group(s) not answered, "
+                f"{n - sent} group(s) not sent"
+            )
+
+        return demux.received_frames()
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    async def __aenter__(self) -> "Transport":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()